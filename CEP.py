@@ -5,6 +5,7 @@ by invoking the rest of the system components.
 from base.DataFormatter import DataFormatter
 from parallel.EvaluationManagerFactory import EvaluationManagerFactory
 from parallel.ParallelExecutionParameters import ParallelExecutionParameters
+from stream.AsyncStream import AsyncStream
 from stream.Stream import InputStream, OutputStream
 from base.Pattern import Pattern
 from evaluation.EvaluationMechanismFactory import EvaluationMechanismParameters
@@ -40,6 +41,17 @@ class CEP:
         self.__evaluation_manager.eval(events, matches, data_formatter)
         return (datetime.now() - start).total_seconds()
 
+    async def run_async(self, events: AsyncStream, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        An asynchronous version of run() to be awaited from within an asyncio event loop. The events are awaited
+        without blocking the event loop, such that the producers of the events (and the consumers of the matches) can
+        run as coroutines in the same loop. Not supported in the data parallel mode.
+        Returns the total time elapsed during evaluation.
+        """
+        start = datetime.now()
+        await self.__evaluation_manager.eval_async(events, matches, data_formatter)
+        return (datetime.now() - start).total_seconds()
+
     def get_pattern_match(self):
         """
         Returns one match from the output stream.
@@ -60,3 +72,10 @@ class CEP:
         Returns an object summarizing the structure of the underlying evaluation mechanism.
         """
         return self.__evaluation_manager.get_structure_summary()
+
+    def get_skipped_events_count(self):
+        """
+        Returns the number of input events discarded during the last run as irrelevant to the patterns without being
+        parsed. This only happens if the data formatter supports the extraction of the event type from a raw event.
+        """
+        return self.__evaluation_manager.get_skipped_events_count()
@@ -1,6 +1,8 @@
 from typing import List
 from datetime import timedelta
+from base.EpochTimestampDataFormatter import convert_time_window
 from base.Pattern import Pattern
+from base.TimestampTypes import TimestampTypes
 from misc import DefaultConfig
 from adaptive.statistics.StatisticsTypes import StatisticsTypes
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
@@ -25,20 +27,24 @@ class StatisticsCollectorFactory:
     """
 
     @staticmethod
-    def build_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters, patterns: List[Pattern]):
+    def build_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters, patterns: List[Pattern],
+                                   timestamp_type: TimestampTypes = DefaultConfig.DEFAULT_TIMESTAMP_TYPE):
         if statistics_collector_parameters is None:
             statistics_collector_parameters = StatisticsCollectorFactory.__create_default_statistics_collector_parameters()
-        return StatisticsCollectorFactory.__create_statistics_collector(statistics_collector_parameters, patterns)
+        return StatisticsCollectorFactory.__create_statistics_collector(statistics_collector_parameters, patterns,
+                                                                        timestamp_type)
 
     @staticmethod
     def __create_statistics_collector(statistics_collector_parameters: StatisticsCollectorParameters,
-                                      patterns: List[Pattern]):
+                                      patterns: List[Pattern], timestamp_type: TimestampTypes):
         """
         Currently, multi-pattern is not supported.
         TODO: To support multi-pattern mode it will need to go through a loop and create statistics for each pattern.
+        The statistics time window is converted into the representation of the event timestamps of the given type.
         """
         pattern = patterns[0]
-        statistics_time_window = statistics_collector_parameters.statistics_time_window
+        statistics_time_window = convert_time_window(statistics_collector_parameters.statistics_time_window,
+                                                     timestamp_type)
         statistics_dict = {}
         for stat_type in statistics_collector_parameters.statistics_types:
             stat = StatisticsFactory.create_statistics(pattern, stat_type, statistics_time_window)
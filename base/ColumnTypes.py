@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class ColumnTypes(Enum):
+    """
+    The types of the columns of a delimited data format (see DataSchema).
+    """
+    STRING = 0
+    INT = 1
+    FLOAT = 2
+    # an integer if the value is written as one and a float otherwise
+    NUMBER = 3
@@ -1,4 +1,5 @@
 from abc import ABC
+from typing import Dict, Set
 
 
 class EventTypeClassifier(ABC):
@@ -14,6 +15,20 @@ class EventTypeClassifier(ABC):
         """
         raise NotImplementedError()
 
+    def get_event_type_attribute(self):
+        """
+        Returns the name of the attribute whose value is the event type, or None if the event type is deduced otherwise.
+        Knowing this attribute enables a data formatter to extract the event type without parsing the entire event.
+        """
+        return None
+
+    def get_event_type_attributes(self):
+        """
+        Returns the names of all attributes the event type is deduced from, or None if they are unknown.
+        """
+        event_type_attribute = self.get_event_type_attribute()
+        return None if event_type_attribute is None else {event_type_attribute}
+
 
 class DataFormatter(ABC):
     """
@@ -49,3 +64,48 @@ class DataFormatter(ABC):
         This method is optional for a DataFormatter subclass. By default, all event occurrences are non-probabilistic.
         """
         return None
+
+    def can_extract_raw_event_type(self):
+        """
+        Returns True if this data formatter supports get_raw_event_type() and False otherwise.
+        """
+        return False
+
+    def get_raw_event_type(self, raw_data: str):
+        """
+        Extracts the type of the event represented by the given raw data without parsing the entire event. Used to
+        discard the events irrelevant to the evaluated patterns before they are parsed.
+        This method is optional for a DataFormatter subclass and is only invoked if can_extract_raw_event_type() returns
+        True.
+        """
+        raise NotImplementedError()
+
+    def get_raw_event_timestamp(self, raw_data: str):
+        """
+        Extracts the timestamp of the event represented by the given raw data. Used to order the raw events (e.g., when
+        merging or reordering input streams) before they are parsed.
+        This method is optional for a DataFormatter subclass. By default, the entire event is parsed. Subclasses able to
+        locate the timestamp in the raw data should override it.
+        """
+        return self.get_event_timestamp(self.parse_event(raw_data))
+
+    def get_projected_formatter(self, attributes_by_event_type: Dict[str, Set[str]]):
+        """
+        Returns a data formatter for the same data format creating payloads restricted to the given attributes of each
+        event type (a None value stands for all attributes) and the attributes required for deducing the event type,
+        the timestamp and the probability. The payloads may contain additional attributes, e.g., if the formatter does
+        not distinguish between the event types before parsing an event. The events of the types missing from the
+        given dict are irrelevant and only their types must be deducible.
+        This method is optional for a DataFormatter subclass. By default, all attributes are parsed.
+        """
+        return self
+
+    def _get_projected_attribute_names(self, attributes_by_event_type: Dict[str, Set[str]]):
+        """
+        Returns the union of the given attributes of all event types along with the attributes required for deducing the
+        event type, or None if all attributes must be parsed.
+        """
+        event_type_attributes = self.__event_type_classifier.get_event_type_attributes()
+        if event_type_attributes is None or any(names is None for names in attributes_by_event_type.values()):
+            return None
+        return set(event_type_attributes).union(*attributes_by_event_type.values())
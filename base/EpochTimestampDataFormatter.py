@@ -0,0 +1,111 @@
+"""
+This file contains the conversions between datetime timestamps and integer epoch timestamps.
+In the epoch timestamp modes (see TimestampTypes), the evaluation mechanism represents the event timestamps as integers
+and converts the pattern time windows once upon construction, such that the time window checks performed for every
+partial match are plain integer operations rather than datetime arithmetic creating timedelta objects.
+The data formatters provided by the user keep returning datetime objects and the payloads of the events keep their
+original attribute values. Naive datetime objects are treated as UTC.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Set
+
+from base.DataFormatter import DataFormatter
+from base.TimestampTypes import TimestampTypes
+from misc import DefaultConfig
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_AWARE_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def convert_time_window(window: timedelta, timestamp_type: TimestampTypes):
+    """
+    Converts the given time interval into the representation of the given timestamp type. In the millisecond mode,
+    the sub-millisecond part of the interval is truncated.
+    """
+    if window is None or timestamp_type == TimestampTypes.DATETIME:
+        return window
+    microseconds = window // _MICROSECOND
+    if timestamp_type == TimestampTypes.EPOCH_MILLISECONDS:
+        return microseconds // 1000
+    if timestamp_type == TimestampTypes.EPOCH_NANOSECONDS:
+        return microseconds * 1000
+    raise Exception("Unknown timestamp type: %s" % (timestamp_type,))
+
+
+def convert_timestamp(timestamp: datetime, timestamp_type: TimestampTypes):
+    """
+    Converts the given timestamp into the representation of the given timestamp type. Integer timestamps are assumed
+    to be already converted.
+    """
+    if timestamp_type == TimestampTypes.DATETIME or type(timestamp) is int:
+        return timestamp
+    epoch = _NAIVE_EPOCH if timestamp.tzinfo is None else _AWARE_EPOCH
+    return convert_time_window(timestamp - epoch, timestamp_type)
+
+
+def convert_to_datetime(timestamp: int, timestamp_type: TimestampTypes):
+    """
+    Converts a timestamp created by the evaluation mechanism (e.g., PatternMatch.first_timestamp) into a naive datetime
+    object in UTC.
+    """
+    if timestamp_type == TimestampTypes.DATETIME:
+        return timestamp
+    if timestamp_type == TimestampTypes.EPOCH_MILLISECONDS:
+        return _NAIVE_EPOCH + timedelta(milliseconds=timestamp)
+    if timestamp_type == TimestampTypes.EPOCH_NANOSECONDS:
+        return _NAIVE_EPOCH + timedelta(microseconds=timestamp // 1000)
+    raise Exception("Unknown timestamp type: %s" % (timestamp_type,))
+
+
+class EpochTimestampDataFormatter(DataFormatter):
+    """
+    Wraps a data formatter such that the timestamps it returns are converted into integer epoch timestamps. All other
+    functionality is delegated to the wrapped formatter.
+    Since the events typically arrive in long runs sharing the same timestamp, the converted timestamps are memoized.
+    """
+    def __init__(self, source_data_formatter: DataFormatter, timestamp_type: TimestampTypes,
+                 cache_size: int = DefaultConfig.DEFAULT_TIMESTAMP_CACHE_SIZE):
+        super().__init__(None)
+        self.__source_data_formatter = source_data_formatter
+        self.__timestamp_type = timestamp_type
+        self.__cache_size = cache_size
+        self.__cache = {}
+
+    def parse_event(self, raw_data: str):
+        return self.__source_data_formatter.parse_event(raw_data)
+
+    def get_event_timestamp(self, event_payload: dict):
+        return self.__convert_timestamp(self.__source_data_formatter.get_event_timestamp(event_payload))
+
+    def get_raw_event_timestamp(self, raw_data: str):
+        return self.__convert_timestamp(self.__source_data_formatter.get_raw_event_timestamp(raw_data))
+
+    def get_event_type(self, event_payload: dict):
+        return self.__source_data_formatter.get_event_type(event_payload)
+
+    def get_probability(self, event_payload: dict):
+        return self.__source_data_formatter.get_probability(event_payload)
+
+    def can_extract_raw_event_type(self):
+        return self.__source_data_formatter.can_extract_raw_event_type()
+
+    def get_raw_event_type(self, raw_data: str):
+        return self.__source_data_formatter.get_raw_event_type(raw_data)
+
+    def get_projected_formatter(self, attributes_by_event_type: Dict[str, Set[str]]):
+        projected_data_formatter = self.__source_data_formatter.get_projected_formatter(attributes_by_event_type)
+        if projected_data_formatter is self.__source_data_formatter:
+            return self
+        return EpochTimestampDataFormatter(projected_data_formatter, self.__timestamp_type, self.__cache_size)
+
+    def __convert_timestamp(self, timestamp: datetime):
+        """
+        Converts the given timestamp returned by the wrapped formatter into an epoch timestamp, memoizing the result.
+        """
+        epoch_timestamp = self.__cache.get(timestamp)
+        if epoch_timestamp is None:
+            if len(self.__cache) >= self.__cache_size:
+                self.__cache.clear()
+            epoch_timestamp = self.__cache[timestamp] = convert_timestamp(timestamp, self.__timestamp_type)
+        return epoch_timestamp
@@ -1,6 +1,25 @@
+import sys
 from typing import List
 
 from base.DataFormatter import DataFormatter
+from base.EventSchema import INDEX_ATTRIBUTE_NAME, SchemaPayload
+
+
+class EventAttributeValues(dict):
+    """
+    Memoizes the values extracted from the payload of an event by the getattr functions of the condition variables,
+    such that each value is computed once while the event is alive rather than once per candidate partial match.
+    The values are keyed by the getattr functions, which are assumed to have no side effects.
+    """
+    __slots__ = ("__payload",)
+
+    def __init__(self, payload):
+        super().__init__()
+        self.__payload = payload
+
+    def __missing__(self, getattr_func: callable):
+        value = self[getattr_func] = getattr_func(self.__payload)
+        return value
 
 
 class Event:
@@ -8,40 +27,67 @@ class Event:
     This class represents a single primitive event received from an input stream. It may contain arbitrary attributes
     of arbitrary types. The only requirement is that event type and timestamp of occurrence must be derivable from these
     attributes using an appropriate data formatter.
+    The attributes are stored in the payload, which is either a dict or a compact schema-backed payload (see
+    EventSchema). In both cases, the serial number of the event is also accessible in the payload under
+    INDEX_ATTRIBUTE_NAME, e.g., for the contiguity conditions.
+    The serial number is the position of the event in its input stream and is normally assigned by the creator of the
+    event. This way, the serial numbers are deterministic even if the events are parsed in parallel. If no serial number
+    is given, the next value of a class-level counter is used instead.
+    Since the evaluation mechanisms may hold very large numbers of events, the events are slotted (i.e., have no
+    per-instance __dict__) and string event types are interned, such that all events of a type share the same object.
+    The attribute values read by the conditions are memoized in attribute_values, which is created once the event is
+    inserted into an evaluation structure (see init_attribute_values()).
     """
+    __slots__ = ("payload", "type", "timestamp", "min_timestamp", "max_timestamp", "probability", "index",
+                 "attribute_values")
 
-    # used in order to assign a serial number to each event that enters the system
+    # used in order to assign a serial number to the events created without an explicit one
     counter = 0
 
-    INDEX_ATTRIBUTE_NAME = "InternalIndexAttributeName"
+    INDEX_ATTRIBUTE_NAME = INDEX_ATTRIBUTE_NAME
     HIDDEN_ATTRIBUTE_NAMES = [INDEX_ATTRIBUTE_NAME]
 
-    def __init__(self, raw_data: str, data_formatter: DataFormatter):
-        self.payload = data_formatter.parse_event(raw_data)
-        self.type = data_formatter.get_event_type(self.payload)
-        self.min_timestamp = self.max_timestamp = self.timestamp = data_formatter.get_event_timestamp(self.payload)
-        self.payload[Event.INDEX_ATTRIBUTE_NAME] = Event.counter
-        self.probability = data_formatter.get_probability(self.payload)
+    def __init__(self, raw_data: str, data_formatter: DataFormatter, index: int = None):
+        payload = data_formatter.parse_event(raw_data)
+        if index is None:
+            index = Event.counter
+            Event.counter += 1
+        self.index = index
+        if isinstance(payload, SchemaPayload):
+            # schema-backed payloads are immutable
+            payload = payload.with_index(self.index)
+        else:
+            payload[INDEX_ATTRIBUTE_NAME] = self.index
+        self.payload = payload
+        event_type = data_formatter.get_event_type(payload)
+        self.type = sys.intern(event_type) if type(event_type) is str else event_type
+        self.min_timestamp = self.max_timestamp = self.timestamp = data_formatter.get_event_timestamp(payload)
+        self.probability = data_formatter.get_probability(payload)
         if self.probability is not None and (self.probability < 0.0 or self.probability > 1.0):
             raise Exception("Invalid value for probability:%s" % (self.probability,))
-        Event.counter += 1
+        self.attribute_values = None
+
+    def init_attribute_values(self):
+        """
+        Creates the memoized attribute values of this event unless they already exist.
+        """
+        if self.attribute_values is None:
+            self.attribute_values = EventAttributeValues(self.payload)
 
     def __eq__(self, other):
-        return self.payload[Event.INDEX_ATTRIBUTE_NAME] == other.payload[Event.INDEX_ATTRIBUTE_NAME]
+        return self.index == other.index
 
     def __hash__(self):
-        return hash(self.payload[Event.INDEX_ATTRIBUTE_NAME])
+        return hash(self.index)
 
     def __repr__(self):
-        result = ""
+        attributes = []
         for key, value in self.payload.items():
             if key in self.HIDDEN_ATTRIBUTE_NAMES:
                 continue
             actual_value = "'%s'" % (value,) if isinstance(value, str) else value
-            curr_str = "'%s': %s" % (key, actual_value)
-            result = curr_str if result == "" else ", ".join([result, curr_str])
-        result = "{%s}" % (result,)
-        return result
+            attributes.append("'%s': %s" % (key, actual_value))
+        return "{%s}" % (", ".join(attributes),)
 
 
 class AggregatedEvent(Event):
@@ -49,12 +95,17 @@ class AggregatedEvent(Event):
     Represents a set of events produced by a Kleene closure operator.
     TODO: as of now, can only be used for a flat (non-nested) Kleene closure.
     """
+    __slots__ = ("primitive_events",)
+
     def __init__(self, events: List[Event], probability: float):
         self.type = None if len(events) == 0 else events[0].type  # will not be set correctly for nested Kleene closures
         self.probability = probability
-        self.payload = {Event.INDEX_ATTRIBUTE_NAME: Event.counter}
+        # the serial number following the one of the latest primitive event
+        self.index = max((event.index for event in events), default=-1) + 1
+        self.payload = {INDEX_ATTRIBUTE_NAME: self.index}
 
         self.primitive_events = events
+        self.attribute_values = EventAttributeValues(self.payload)
 
         # we assume the events to be sorted in ascending order of arrival
         self.min_timestamp = self.timestamp = None if len(events) == 0 else events[0].timestamp
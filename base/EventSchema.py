@@ -0,0 +1,157 @@
+"""
+This file contains the implementation of schema-backed event payloads.
+A schema-backed payload stores the attribute values of an event in a tuple, while the attribute names are stored once
+per schema. Such a payload consumes considerably less memory than a dict, yet it supports the read-only subset of the
+dict interface, such that the existing attribute getters (e.g., lambda x: x["Peak Price"]) work unchanged.
+"""
+from typing import Dict, List, Tuple
+
+# the attribute under which the serial number of an event is accessible in its payload (see Event)
+INDEX_ATTRIBUTE_NAME = "InternalIndexAttributeName"
+
+_tuple_getitem = tuple.__getitem__
+_tuple_iter = tuple.__iter__
+
+# the schemas created so far, by their attribute names
+_schemas = {}
+
+
+class SchemaPayload(tuple):
+    """
+    An immutable event payload holding the attribute values in the order defined by its schema, followed by the serial
+    number of the event. A dedicated subclass of this class is created for each schema, such that the instances hold no
+    reference to the schema and are as compact as plain tuples.
+    As opposed to a tuple, a payload is indexed by attribute names and iterated over its attribute names like a dict.
+    The serial number is accessible under INDEX_ATTRIBUTE_NAME once assigned (see with_index()).
+    """
+    __slots__ = ()
+
+    # set by the schema-specific subclasses
+    _schema = None
+    _positions = {}
+    _keys = ()
+
+    def __getitem__(self, key: str):
+        value = _tuple_getitem(self, self._positions[key])
+        if value is None and key == INDEX_ATTRIBUTE_NAME:
+            # the serial number was not assigned yet
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default: object = None):
+        position = self._positions.get(key)
+        if position is None:
+            return default
+        value = _tuple_getitem(self, position)
+        return default if value is None and key == INDEX_ATTRIBUTE_NAME else value
+
+    def __contains__(self, key: str):
+        return key in self._positions and (key != INDEX_ATTRIBUTE_NAME or self.__has_index())
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def keys(self):
+        # similarly to a dict payload, the serial number is only present after an event is created from the payload
+        return self._keys if self.__has_index() else self._keys[:-1]
+
+    def values(self):
+        values = tuple(_tuple_iter(self))
+        return values if self.__has_index() else values[:-1]
+
+    def items(self):
+        return zip(self.keys(), _tuple_iter(self))
+
+    def to_dict(self):
+        """
+        Returns a dict containing the attributes of this payload.
+        """
+        return dict(self.items())
+
+    def with_index(self, index: int):
+        """
+        Returns a copy of this payload with the given event serial number.
+        """
+        values = list(_tuple_iter(self))
+        values[-1] = index
+        return tuple.__new__(type(self), values)
+
+    def __eq__(self, other: object):
+        if isinstance(other, SchemaPayload):
+            return self._keys == other._keys and tuple.__eq__(self, other)
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __ne__(self, other: object):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def __has_index(self):
+        """
+        Returns True if the serial number of the event was assigned to this payload and False otherwise.
+        """
+        return _tuple_getitem(self, -1) is not None
+
+    def __reduce__(self):
+        # the schema-specific subclasses cannot be located by name, hence the payload is rebuilt from the schema
+        return _restore_schema_payload, (self._schema.get_attribute_names(), tuple(_tuple_iter(self)))
+
+
+class EventSchema:
+    """
+    Describes the attributes of the events of some type (or of a data format) in a fixed order and creates compact
+    payloads for these events.
+    """
+    def __init__(self, attribute_names: List[str]):
+        if INDEX_ATTRIBUTE_NAME in attribute_names:
+            raise Exception("%s is a reserved attribute name" % (INDEX_ATTRIBUTE_NAME,))
+        if len(set(attribute_names)) != len(attribute_names):
+            raise Exception("Duplicate attribute names in the event schema: %s" % (attribute_names,))
+        self.__attribute_names = tuple(attribute_names)
+        keys = self.__attribute_names + (INDEX_ATTRIBUTE_NAME,)
+        positions: Dict[str, int] = {key: i for i, key in enumerate(keys)}
+        self.__payload_type = type("SchemaPayload", (SchemaPayload,),
+                                   {"__slots__": (), "_schema": self, "_positions": positions, "_keys": keys})
+
+    def get_attribute_names(self):
+        """
+        Returns the names of the attributes described by this schema.
+        """
+        return self.__attribute_names
+
+    def create_payload(self, values: Tuple, index: int = None):
+        """
+        Creates a payload holding the given attribute values, which are expected to follow the order of the schema.
+        The serial number of the event is normally assigned later, when an event is created from the payload.
+        """
+        if len(values) != len(self.__attribute_names):
+            raise Exception("Expected %d attribute values, got %d" % (len(self.__attribute_names), len(values)))
+        return tuple.__new__(self.__payload_type, tuple(values) + (index,))
+
+    @staticmethod
+    def get(attribute_names: List[str]):
+        """
+        Returns the schema with the given attribute names, creating it upon the first request. Sharing the schemas
+        keeps the payloads of equally structured events comparable.
+        """
+        attribute_names = tuple(attribute_names)
+        schema = _schemas.get(attribute_names)
+        if schema is None:
+            schema = _schemas[attribute_names] = EventSchema(list(attribute_names))
+        return schema
+
+
+def _restore_schema_payload(attribute_names: Tuple[str], values: Tuple):
+    """
+    Recreates a pickled schema-backed payload.
+    """
+    return EventSchema.get(attribute_names).create_payload(values[:-1], values[-1])
@@ -3,7 +3,7 @@ from typing import List, Dict
 
 from adaptive.statistics.StatisticsTypes import StatisticsTypes
 from base.Event import Event
-from condition.Condition import Condition, Variable, BinaryCondition, TrueCondition
+from condition.Condition import Condition, Variable, BinaryCondition, TrueCondition, merge_referenced_attributes
 from condition.CompositeCondition import CompositeCondition, AndCondition
 from base.PatternStructure import PatternStructure, CompositeStructure, PrimitiveEventStructure, \
     SeqOperator, NegationOperator, UnaryStructure
@@ -128,6 +128,19 @@ class Pattern:
         # a hack to remove unhashable duplicates from a list.
         return list({str(x): x for x in primitive_events}.values())
 
+    def get_referenced_attributes(self):
+        """
+        Returns a dict mapping each event type in the pattern to the set of the payload attributes read by the pattern
+        condition from the events of this type. A None value stands for an event type whose attributes are unknown.
+        """
+        referenced_attributes_by_name = self.condition.get_referenced_attributes()
+        referenced_attributes = {}
+        for primitive_event in self.get_primitive_events():
+            attribute_names = None if referenced_attributes_by_name is None else \
+                referenced_attributes_by_name.get(primitive_event.name, set())
+            merge_referenced_attributes(referenced_attributes, {primitive_event.type: attribute_names})
+        return referenced_attributes
+
     def __get_primitive_events_aux(self, pattern_args) -> List[PrimitiveEventStructure]:
         """
         An auxiliary method for returning a list of primitive events composing the pattern structure.
@@ -21,19 +21,10 @@ class PatternMatch:
                self.pattern_ids == other.pattern_ids
 
     def __str__(self):
-        result = ""
-        match = ""
-        for event in self.events:
-            match += "%s\n" % event
+        match = "".join(["%s\n" % (event,) for event in self.events])
         if len(self.pattern_ids) == 0:
-            result += match
-            result += "\n"
-        else:
-            for idx in self.pattern_ids:
-                result += "%s: " % idx
-                result += match
-                result += "\n"
-        return result
+            return match + "\n"
+        return "".join(["%s: %s\n" % (idx, match) for idx in self.pattern_ids])
 
     def add_pattern_id(self, pattern_id: int):
         """
@@ -0,0 +1,309 @@
+"""
+This file contains a declarative alternative to implementing DataFormatter.parse_event by hand for delimited text
+formats. The layout of the records is described by a DataSchema, which is compiled once into a specialized parser that
+converts each column according to its declared type, with no per-value type guessing.
+"""
+import copy
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from base.ColumnTypes import ColumnTypes
+from base.DataFormatter import DataFormatter, EventTypeClassifier
+from base.EventSchema import EventSchema
+from misc import DefaultConfig
+from misc.Utils import str_to_number
+
+
+def parse_number(value: str):
+    """
+    Converts the given string into a number exactly as misc.Utils.str_to_number does, i.e., into an int if possible,
+    into a float otherwise, and leaves it unchanged if it is not a number. Plain decimal integers take a fast path.
+    """
+    if value.isdecimal():
+        return int(value)
+    return str_to_number(value)
+
+
+_COLUMN_CONVERTERS = {
+    ColumnTypes.STRING: None,
+    ColumnTypes.INT: int,
+    ColumnTypes.FLOAT: float,
+    ColumnTypes.NUMBER: parse_number,
+}
+
+# the fixed-width numeric directives supported by the compiled timestamp parsers, along with their widths
+_FIXED_WIDTH_TIMESTAMP_DIRECTIVES = {"Y": 4, "m": 2, "d": 2, "H": 2, "M": 2, "S": 2}
+_DATETIME_ARGUMENTS_ORDER = "YmdHMS"
+
+
+class DataSchema:
+    """
+    Declares the layout of the records of a delimited text format: the names and the types of the columns, the
+    (trailing) columns which may be missing, the column containing the event timestamp and its format (as accepted by
+    datetime.strptime).
+    """
+    def __init__(self, columns: List[Tuple[str, ColumnTypes]], timestamp_column: str, timestamp_format: str,
+                 optional_columns: List[Tuple[str, ColumnTypes]] = None, delimiter: str = ","):
+        if optional_columns is None:
+            optional_columns = []
+        names = [name for name, _ in columns + optional_columns]
+        if len(set(names)) != len(names):
+            raise Exception("Duplicate column names in the data schema: %s" % (names,))
+        if timestamp_column not in names:
+            raise Exception("Unknown timestamp column: %s" % (timestamp_column,))
+        self.columns = columns
+        self.optional_columns = optional_columns
+        self.timestamp_column = timestamp_column
+        self.timestamp_format = timestamp_format
+        self.delimiter = delimiter
+
+    def get_layouts(self):
+        """
+        Returns the lists of columns the records of this schema may consist of, i.e., the mandatory columns followed by
+        each prefix of the optional columns.
+        """
+        return [self.columns + self.optional_columns[:i] for i in range(len(self.optional_columns) + 1)]
+
+
+class SchemaDataFormatter(DataFormatter):
+    """
+    A data formatter for delimited text records described by a data schema.
+    If the records of different event types have different layouts, a dict of schemas can be given instead of a single
+    schema, in which case the schema of each record is selected by the value in its first column. All schemas must
+    agree on the timestamp column and format.
+    The schema is compiled upon the creation of the formatter into one parsing function per record layout. If
+    use_schema_payload is set, the events are parsed into compact schema-backed payloads instead of dicts.
+    If the event type classifier specifies the attribute containing the event type, the event type can be extracted
+    from a raw record without parsing it (see get_raw_event_type()). In this case, the formatter also supports
+    projection: a projected formatter skips the conversion of the columns absent from the projection, regardless of
+    the event type. Similarly, if the timestamp column is at the same position in all schemas, the timestamp can be
+    extracted from a raw record without parsing it (see get_raw_event_timestamp()).
+    Records whose number of fields matches none of the layouts of their schema are not rejected. Instead, as with a
+    hand-written zip of the column names and the fields, the surplus fields are dropped or the missing trailing columns
+    are omitted, and every field is converted by str_to_number regardless of the declared column types. Only the records
+    selected by an unknown first column value are rejected.
+    """
+    def __init__(self, schema: Union[DataSchema, Dict[str, DataSchema]], event_type_classifier: EventTypeClassifier,
+                 probability_column: str = None, use_schema_payload: bool = False):
+        super().__init__(event_type_classifier)
+        schemas = schema if isinstance(schema, dict) else {None: schema}
+        first_schema = next(iter(schemas.values()))
+        for s in schemas.values():
+            if s.timestamp_column != first_schema.timestamp_column or \
+                    s.timestamp_format != first_schema.timestamp_format or s.delimiter != first_schema.delimiter:
+                raise Exception("All schemas of a data formatter must share the timestamp and delimiter settings")
+        self.__schemas = schemas
+        self.__use_schema_payload = use_schema_payload
+        self.__is_selected_by_first_column = isinstance(schema, dict)
+        self.__delimiter = first_schema.delimiter
+        self.__timestamp_column = first_schema.timestamp_column
+        self.__probability_column = probability_column
+        self.__timestamp_format = first_schema.timestamp_format
+        self.__projected_attribute_names = None
+        self.__parsers = self.__compile_parsers()
+        self.__parse_timestamp = compile_timestamp_parser(self.__timestamp_format)
+        self.__event_type_column_index = self.__get_common_column_index(
+            schemas.values(), event_type_classifier.get_event_type_attribute(), ColumnTypes.STRING)
+        self.__timestamp_column_index = self.__get_common_column_index(schemas.values(), self.__timestamp_column)
+
+    def parse_event(self, raw_data: str):
+        fields = raw_data.rstrip("\r\n").split(self.__delimiter)
+        key = (fields[0], len(fields)) if self.__is_selected_by_first_column else len(fields)
+        parser = self.__parsers.get(key)
+        if parser is None:
+            return self.__parse_nonconforming_record(fields, raw_data)
+        return parser(fields)
+
+    def get_event_timestamp(self, event_payload: dict):
+        return self.__parse_timestamp(event_payload[self.__timestamp_column])
+
+    def get_probability(self, event_payload: dict):
+        if self.__probability_column is None:
+            return None
+        return event_payload.get(self.__probability_column, None)
+
+    def can_extract_raw_event_type(self):
+        return self.__event_type_column_index is not None
+
+    def get_raw_event_type(self, raw_data: str):
+        if self.__event_type_column_index == 0:
+            end = raw_data.find(self.__delimiter)
+            return raw_data.rstrip("\r\n") if end < 0 else raw_data[:end]
+        index = self.__event_type_column_index
+        return raw_data.rstrip("\r\n").split(self.__delimiter, index + 1)[index]
+
+    def get_raw_event_timestamp(self, raw_data: str):
+        index = self.__timestamp_column_index
+        if index is None:
+            return super().get_raw_event_timestamp(raw_data)
+        return self.__parse_timestamp(raw_data.rstrip("\r\n").split(self.__delimiter, index + 1)[index])
+
+    def get_projected_formatter(self, attributes_by_event_type: Dict[str, Set[str]]):
+        attribute_names = self._get_projected_attribute_names(attributes_by_event_type)
+        if attribute_names is None:
+            return self
+        attribute_names.add(self.__timestamp_column)
+        if self.__probability_column is not None:
+            attribute_names.add(self.__probability_column)
+        projected_formatter = copy.copy(self)
+        projected_formatter.__projected_attribute_names = attribute_names
+        projected_formatter.__parsers = self.__compile_parsers(attribute_names)
+        return projected_formatter
+
+    def __getstate__(self):
+        # the compiled functions cannot be pickled and are recompiled instead (e.g., in a parsing worker process)
+        state = self.__dict__.copy()
+        del state["_SchemaDataFormatter__parsers"]
+        del state["_SchemaDataFormatter__parse_timestamp"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__parsers = self.__compile_parsers(self.__projected_attribute_names)
+        self.__parse_timestamp = compile_timestamp_parser(self.__timestamp_format)
+
+    def __parse_nonconforming_record(self, fields: List[str], raw_data: str):
+        """
+        Parses a record matching none of the compiled layouts by pairing its fields with the columns of the longest
+        layout of its schema.
+        """
+        schema = self.__schemas.get(fields[0] if self.__is_selected_by_first_column else None)
+        if schema is None:
+            raise Exception("The record does not match the data schema: %s" % (raw_data,))
+        attributes = [(name, str_to_number(field))
+                      for (name, _), field in zip(schema.columns + schema.optional_columns, fields)
+                      if self.__projected_attribute_names is None or name in self.__projected_attribute_names]
+        if self.__use_schema_payload:
+            return EventSchema.get([name for name, _ in attributes]).create_payload([value for _, value in attributes])
+        return dict(attributes)
+
+    def __compile_parsers(self, attribute_names: Set[str] = None):
+        """
+        Returns the parsing functions of the record layouts by the number of columns (and the first column, if
+        applicable). If attribute_names is given, the parsed payloads only contain the columns listed there.
+        """
+        parsers = {}
+        for first_column_value, schema in self.__schemas.items():
+            for layout in schema.get_layouts():
+                key = len(layout) if first_column_value is None else (first_column_value, len(layout))
+                parsers[key] = _compile_record_parser(layout, self.__use_schema_payload, attribute_names)
+        return parsers
+
+    @staticmethod
+    def __get_common_column_index(schemas: Iterable[DataSchema], column_name: str, column_type: ColumnTypes = None):
+        """
+        Returns the index of the given column if it is the same in all the given schemas, and None otherwise. If
+        column_type is given, the column must also be of this type.
+        """
+        if column_name is None:
+            return None
+        indices = set()
+        for schema in schemas:
+            columns = schema.columns + schema.optional_columns
+            matching_indices = [i for i, (name, curr_type) in enumerate(columns)
+                                if name == column_name and (column_type is None or curr_type == column_type)]
+            # the column must be mandatory, such that it exists in every record
+            if len(matching_indices) == 0 or matching_indices[0] >= len(schema.columns):
+                return None
+            indices.add(matching_indices[0])
+        return indices.pop() if len(indices) == 1 else None
+
+
+def _compile_record_parser(columns: List[Tuple[str, ColumnTypes]], use_schema_payload: bool,
+                           attribute_names: Set[str] = None):
+    """
+    Generates a function converting the list of the fields of a record with the given columns into an event payload.
+    If attribute_names is given, the remaining columns are omitted from the payload without being converted.
+    """
+    columns = [(i, name, column_type) for i, (name, column_type) in enumerate(columns)
+               if attribute_names is None or name in attribute_names]
+    namespace = {}
+    values = []
+    for i, name, column_type in columns:
+        converter = _COLUMN_CONVERTERS[column_type]
+        if converter is None:
+            values.append("fields[%d]" % (i,))
+            continue
+        converter_name = "_convert_%d" % (i,)
+        namespace[converter_name] = converter
+        values.append("%s(fields[%d])" % (converter_name, i))
+    if use_schema_payload:
+        namespace["_create_payload"] = EventSchema.get([name for _, name, _ in columns]).create_payload
+        body = "_create_payload((%s,))" % (", ".join(values),)
+    else:
+        body = "{%s}" % (", ".join("%r: %s" % (name, value) for (_, name, _), value in zip(columns, values)),)
+    exec("def parse(fields):\n    return %s\n" % (body,), namespace)
+    return namespace["parse"]
+
+
+def memoize_timestamp_parser(parse_timestamp: callable,
+                             cache_size: int = DefaultConfig.DEFAULT_TIMESTAMP_CACHE_SIZE):
+    """
+    Returns a function memoizing the results of the given timestamp parsing function by the raw timestamp. Since the
+    events typically arrive in long runs sharing the same timestamp, most timestamps are then parsed by a single
+    lookup. At most cache_size timestamps are memoized; the cache is emptied once it is full.
+    """
+    if cache_size <= 0:
+        return parse_timestamp
+    cache = {}
+    get_cached_timestamp = cache.get
+
+    def parse(timestamp):
+        result = get_cached_timestamp(timestamp)
+        if result is None:
+            if len(cache) >= cache_size:
+                # clearing the cache (rather than evicting a single entry) is safe when called from multiple threads
+                cache.clear()
+            result = cache[timestamp] = parse_timestamp(timestamp)
+        return result
+    return parse
+
+
+def compile_timestamp_parser(timestamp_format: str, cache_size: int = DefaultConfig.DEFAULT_TIMESTAMP_CACHE_SIZE):
+    """
+    Returns a function converting a timestamp in the given format into a datetime object. The timestamp may also be
+    given as an int (e.g., 200802010900 for "%Y%m%d%H%M").
+    Formats consisting of zero-padded numeric fields and constant separators are parsed by slicing the string at fixed
+    positions, which is considerably faster than datetime.strptime. Strings which do not fit these positions (e.g.,
+    numbers that are not zero-padded) are still parsed by datetime.strptime.
+    Unless cache_size is zero, the parsed timestamps are memoized (see memoize_timestamp_parser()).
+    """
+    return memoize_timestamp_parser(_compile_uncached_timestamp_parser(timestamp_format), cache_size)
+
+
+def _compile_uncached_timestamp_parser(timestamp_format: str):
+    """
+    Generates the timestamp parsing function for compile_timestamp_parser().
+    """
+    def parse_with_strptime(timestamp: str):
+        return datetime.strptime(str(timestamp), timestamp_format)
+
+    tokens = re.findall(r"%.|[^%]", timestamp_format)
+    slices = {}
+    separators = []
+    position = 0
+    for token in tokens:
+        if token.startswith("%"):
+            width = _FIXED_WIDTH_TIMESTAMP_DIRECTIVES.get(token[1])
+            if width is None or token[1] in slices:
+                return parse_with_strptime
+            slices[token[1]] = (position, position + width)
+            position += width
+        else:
+            separators.append((position, token))
+            position += 1
+    if any(directive not in slices for directive in "Ymd"):
+        return parse_with_strptime
+    # the fields absent from the format are omitted, such that datetime() assigns them their default values
+    arguments = ["int(s[%d:%d])" % slices[directive] for directive in _DATETIME_ARGUMENTS_ORDER
+                 if directive in slices]
+    conditions = ["len(s) == %d" % (position,)] + ["s[%d] == %r" % separator for separator in separators]
+    code = "def parse(timestamp):\n" \
+           "    s = timestamp if type(timestamp) is str else str(timestamp)\n" \
+           "    if %s:\n" \
+           "        return _datetime(%s)\n" \
+           "    return _parse_with_strptime(s)\n" % (" and ".join(conditions), ", ".join(arguments))
+    namespace = {"_datetime": datetime, "_parse_with_strptime": parse_with_strptime}
+    exec(code, namespace)
+    return namespace["parse"]
@@ -0,0 +1,12 @@
+from enum import Enum
+
+
+class TimestampTypes(Enum):
+    """
+    The representations of the event timestamps used by the evaluation mechanism (see EpochTimestampDataFormatter).
+    """
+    DATETIME = 0
+    # integer number of milliseconds since the epoch
+    EPOCH_MILLISECONDS = 1
+    # integer number of nanoseconds since the epoch
+    EPOCH_NANOSECONDS = 2
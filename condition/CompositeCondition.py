@@ -3,10 +3,12 @@ This file contains the composite condition classes.
 """
 from abc import ABC
 from copy import deepcopy
+from typing import List
 
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
-from condition.Condition import Condition, AtomicCondition
+from condition.Condition import Condition, AtomicCondition, merge_referenced_attributes
 from condition.KCCondition import KCCondition
+from misc import DefaultConfig
 
 
 class CompositeCondition(Condition, ABC):
@@ -75,12 +77,27 @@ class CompositeCondition(Condition, ABC):
         """
         return self._conditions
 
+    def get_terminating_result(self):
+        """
+        Returns the result of a sub-condition which determines the result of this composite condition.
+        """
+        return self._terminating_result
+
     def extract_atomic_conditions(self):
         result = []
         for f in self._conditions:
             result.extend(f.extract_atomic_conditions())
         return result
 
+    def get_referenced_attributes(self):
+        referenced_attributes = {}
+        for condition in self._conditions:
+            condition_referenced_attributes = condition.get_referenced_attributes()
+            if condition_referenced_attributes is None:
+                return None
+            merge_referenced_attributes(referenced_attributes, condition_referenced_attributes)
+        return referenced_attributes
+
     def add_atomic_condition(self, condition: AtomicCondition):
         """
         Adds a new atomic condition to this composite condition.
@@ -171,6 +188,84 @@ class AndCondition(CompositeCondition):
         return AndCondition(*conditions_arr)
 
 
+class AdaptiveAndCondition(AndCondition):
+    """
+    An AND condition whose sub-conditions are periodically reordered to minimize the expected cost of its evaluation.
+    As a conjunction is order-independent, reordering the sub-conditions does not affect the result.
+    Once every sampling_interval evaluations of the compiled condition (see ConditionCompiler), all sub-conditions are
+    evaluated and their evaluation times and results are recorded. Once every reordering_interval samples, the
+    sub-conditions are sorted in ascending order of their average evaluation time divided by their failure rate, which
+    minimizes the expected cost for independent sub-conditions. The recorded values are then halved, such that the order
+    follows the changes in the data.
+    Since each evaluation tree node holds its own sub-condition of the pattern condition, the sub-conditions are
+    reordered separately for each node.
+    """
+    def __init__(self, *condition_list, sampling_interval: int = DefaultConfig.DEFAULT_CONDITION_SAMPLING_INTERVAL,
+                 reordering_interval: int = DefaultConfig.DEFAULT_CONDITION_REORDERING_INTERVAL):
+        if sampling_interval <= 0:
+            raise Exception("sampling_interval must be positive number, got %s" % (sampling_interval,))
+        if reordering_interval <= 0:
+            raise Exception("reordering_interval must be positive number, got %s" % (reordering_interval,))
+        super().__init__(*condition_list)
+        self.__sampling_interval = sampling_interval
+        self.__reordering_interval = reordering_interval
+        self.__samples_count = 0
+        self.__evaluation_times = []
+        self.__failure_counts = []
+
+    def get_sampling_interval(self):
+        """
+        Returns the number of evaluations between two samples.
+        """
+        return self.__sampling_interval
+
+    def add_sample(self, evaluation_times: List[float], failures: List[bool]):
+        """
+        Records the evaluation times and the failures of the sub-conditions, listed according to their current order.
+        Returns True if the sub-conditions were reordered following this sample and False otherwise.
+        """
+        if len(self.__evaluation_times) != len(evaluation_times):
+            # the sub-conditions were modified since the last sample
+            self.__samples_count = 0
+            self.__evaluation_times = [0.0] * len(evaluation_times)
+            self.__failure_counts = [0.0] * len(evaluation_times)
+        for i, (evaluation_time, failure) in enumerate(zip(evaluation_times, failures)):
+            self.__evaluation_times[i] += evaluation_time
+            if failure:
+                self.__failure_counts[i] += 1
+        self.__samples_count += 1
+        if self.__samples_count < self.__reordering_interval:
+            return False
+        return self.__reorder()
+
+    def __reorder(self):
+        """
+        Sorts the sub-conditions according to the recorded samples and returns True if their order was changed.
+        """
+        def get_expected_cost_rank(index: int):
+            if self.__failure_counts[index] == 0:
+                return float("inf"), self.__evaluation_times[index]
+            return self.__evaluation_times[index] / self.__failure_counts[index], 0.0
+
+        new_order = sorted(range(len(self._conditions)), key=get_expected_cost_rank)
+        self._conditions = [self._conditions[i] for i in new_order]
+        self.__evaluation_times = [self.__evaluation_times[i] / 2 for i in new_order]
+        self.__failure_counts = [self.__failure_counts[i] / 2 for i in new_order]
+        self.__samples_count = 0
+        return new_order != sorted(new_order)
+
+    def get_condition_of(self, names: set, get_kleene_closure_conditions=False, consume_returned_conditions=False):
+        condition = super().get_condition_of(names, get_kleene_closure_conditions, consume_returned_conditions)
+        if condition is None:
+            return None
+        return self.get_constructor()(*condition.get_conditions_list())
+
+    def get_constructor(self):
+        return lambda *condition_list: AdaptiveAndCondition(*condition_list,
+                                                            sampling_interval=self.__sampling_interval,
+                                                            reordering_interval=self.__reordering_interval)
+
+
 class OrCondition(CompositeCondition):
     """
     This class uses CompositeCondition with True as the terminating result, which complies with OR operator logic.
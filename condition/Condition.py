@@ -4,6 +4,7 @@ This file contains the basic Condition classes.
 from abc import ABC, abstractmethod
 from copy import deepcopy
 from enum import Enum
+from typing import Dict, Set
 
 from adaptive.statistics.StatisticsTypes import StatisticsTypes
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
@@ -41,16 +42,65 @@ class EquationSides(Enum):
     right = 1
 
 
+class _AttributeProbeValue:
+    """
+    Stands for an attribute value while probing a getattr function. Only arithmetic operations are supported, such that
+    a function whose control flow depends on the attribute values fails rather than reveals a partial set of attributes.
+    """
+    def __arithmetic_operation(self, *args):
+        return self
+
+    __add__ = __radd__ = __sub__ = __rsub__ = __mul__ = __rmul__ = __arithmetic_operation
+    __truediv__ = __rtruediv__ = __floordiv__ = __rfloordiv__ = __mod__ = __rmod__ = __arithmetic_operation
+    __pow__ = __rpow__ = __neg__ = __pos__ = __abs__ = __arithmetic_operation
+
+    def __unsupported_operation(self, *args):
+        raise TypeError("The attribute value is unknown while probing")
+
+    __eq__ = __ne__ = __lt__ = __le__ = __gt__ = __ge__ = __hash__ = __bool__ = __unsupported_operation
+    __str__ = __format__ = __int__ = __float__ = __index__ = __len__ = __iter__ = __unsupported_operation
+
+
+class _AttributeProbePayload:
+    """
+    An event payload recording the names of the attributes accessed by a getattr function.
+    """
+    def __init__(self):
+        self.attribute_names = set()
+
+    def __getitem__(self, attribute_name: str):
+        self.attribute_names.add(attribute_name)
+        return _AttributeProbeValue()
+
+    def get(self, attribute_name: str, default=None):
+        return self[attribute_name]
+
+
+def merge_referenced_attributes(target: Dict[str, Set[str]], source: Dict[str, Set[str]]):
+    """
+    Adds the referenced attributes listed in the source dict to the target dict. A None value stands for all
+    attributes.
+    """
+    for key, attribute_names in source.items():
+        if attribute_names is None or (key in target and target[key] is None):
+            target[key] = None
+        else:
+            target.setdefault(key, set()).update(attribute_names)
+
+
 class Variable:
     """
     This class represents a variable in an event-related condition.
     Typically, it will be of the form "x.y" where "X" corresponds to a known event name and y is an attribute available
     for events of x's type.
+    The names of the payload attributes read by the getattr function can optionally be declared. Otherwise, they are
+    inferred by probing the function (see get_attribute_names()).
     """
-    def __init__(self, name: str, getattr_func: callable):
+    def __init__(self, name: str, getattr_func: callable, attribute_names: Set[str] = None):
         self.name = name
         # this callback function is used to fetch the attribute value from an event payload dict
         self.getattr_func = getattr_func
+        self.attribute_names = attribute_names
 
     def eval(self, binding: dict = None):
         """
@@ -61,6 +111,16 @@ class Variable:
             raise NameError("Name %s is not bound to a value" % self.name)
         return self.getattr_func(binding[self.name])
 
+    def get_attribute_names(self):
+        """
+        Returns the names of the payload attributes read by this variable, or None if they cannot be determined.
+        Unless declared explicitly, the attributes are inferred by applying the getattr function on a payload recording
+        the accessed attributes.
+        """
+        if self.attribute_names is None:
+            self.attribute_names = get_accessed_attribute_names(self.getattr_func)
+        return self.attribute_names
+
     def __repr__(self):
         return self.name
 
@@ -70,6 +130,19 @@ class Variable:
                 self.getattr_func.__code__.co_code == other.getattr_func.__code__.co_code)
 
 
+def get_accessed_attribute_names(getattr_func: callable):
+    """
+    Returns the names of the payload attributes read by the given getattr function, or None if they cannot be
+    determined, e.g., when the function fails on the probe payload or reads the attributes conditionally.
+    """
+    probe_payload = _AttributeProbePayload()
+    try:
+        getattr_func(probe_payload)
+    except Exception:
+        return None
+    return probe_payload.attribute_names
+
+
 class Condition(ABC):
     """
     The base abstract class of the condition classes hierarchy.
@@ -99,6 +172,14 @@ class Condition(ABC):
         """
         raise NotImplementedError()
 
+    def get_referenced_attributes(self):
+        """
+        Returns a dict mapping the event names associated with this condition to the sets of the payload attributes read
+        by this condition. A None value stands for an event name whose attributes are unknown. If the event names
+        themselves are unknown, None is returned.
+        """
+        return None
+
     def get_conditions_intersection(self, condition):
         """
         Returns the intersection condition between self and the condition argument.
@@ -182,6 +263,9 @@ class TrueCondition(AtomicCondition):
     def is_condition_of(self, names: set):
         return False
 
+    def get_referenced_attributes(self):
+        return {}
+
     def __eq__(self, other):
         return type(other) == TrueCondition
 
@@ -225,6 +309,12 @@ class SimpleCondition(AtomicCondition):
         """
         return set(term.name for term in self.terms)
 
+    def get_referenced_attributes(self):
+        referenced_attributes = {}
+        for term in self.terms:
+            merge_referenced_attributes(referenced_attributes, {term.name: term.get_attribute_names()})
+        return referenced_attributes
+
 
 class BinaryCondition(SimpleCondition):
     """
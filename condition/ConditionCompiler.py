@@ -0,0 +1,276 @@
+"""
+This file contains the compilation of conditions into plain Python functions.
+Evaluating a condition object walks the condition tree: the composite conditions iterate over their sub-conditions,
+the atomic conditions collect the values of their terms, and the variables validate the binding before extracting the
+attribute values. As the conditions are evaluated for every candidate partial match, this overhead dominates the cost
+of simple conditions. A compiled condition is a single generated function receiving the events of a candidate partial
+match in a fixed order, which directly invokes the attribute extraction functions and the relation operators of the
+simple conditions on the contents of the events (i.e., the payloads, or the lists of payloads for Kleene closure
+events). The position and the kind of each event are resolved upon compilation, hence no binding dict is created.
+The attribute values of the primitive events are read through the memoized values of the events (see
+EventAttributeValues), such that each attribute is only extracted once per event.
+A join filter is a generated function selecting, out of a list of candidate partial matches, the ones that may be
+combined with a given partial match, using the time window and the basic relation conditions between the two
+partial matches. The candidates are checked in a single list comprehension, such that no event lists are merged and no
+validation methods are invoked for the rejected candidates.
+"""
+from collections.abc import Hashable
+from time import perf_counter
+from typing import List, Set
+
+from adaptive.statistics.StatisticsTypes import StatisticsTypes
+from condition.BaseRelationCondition import EqCondition, NotEqCondition, GreaterThanCondition, \
+    GreaterThanEqCondition, SmallerThanCondition, SmallerThanEqCondition
+from condition.CompositeCondition import CompositeCondition, AdaptiveAndCondition
+from condition.Condition import AtomicCondition, SimpleCondition, Variable
+
+# the operators of the basic relation conditions that can be inlined into a join filter
+_RELATION_OPERATORS = {
+    EqCondition: "==",
+    NotEqCondition: "!=",
+    GreaterThanCondition: ">",
+    GreaterThanEqCondition: ">=",
+    SmallerThanCondition: "<",
+    SmallerThanEqCondition: "<=",
+}
+
+
+def _evaluate_empty_condition(events):
+    return True
+
+
+def _get_aggregated_event_content(event):
+    return [primitive_event.payload for primitive_event in event.primitive_events]
+
+
+def compile_condition(condition: CompositeCondition, event_names: List[str], aggregated_event_names: Set[str] = None,
+                      reordering_callback: callable = None):
+    """
+    Returns a function equivalent to the eval() method of the given condition, which receives the events as a sequence
+    ordered according to the given event names rather than a binding dict of their contents. The events whose names
+    appear in aggregated_event_names are expected to be aggregated events produced by a Kleene closure operator.
+    The sub-conditions are evaluated in the same order and with the same short-circuiting as by eval(). The statistics
+    collectors of the atomic conditions are bound upon compilation, hence the condition must be recompiled after a
+    statistics collector is attached or replaced.
+    If a reordering callback is provided, the compiled function periodically samples the adaptive conditions (see
+    AdaptiveAndCondition) and invokes the callback once their sub-conditions are reordered, which must recompile the
+    condition. Otherwise, the adaptive conditions are compiled in their current order.
+    """
+    if condition.get_num_conditions() == 0:
+        return _evaluate_empty_condition
+    return _ConditionCodeGenerator(event_names, aggregated_event_names, reordering_callback).compile(condition)
+
+
+def _filter_by_time_window(partial_match, candidates, window):
+    first_timestamp = partial_match.first_timestamp
+    last_timestamp = partial_match.last_timestamp
+    return [candidate for candidate in candidates
+            if (candidate.last_timestamp if candidate.last_timestamp > last_timestamp else last_timestamp) -
+            (candidate.first_timestamp if candidate.first_timestamp < first_timestamp else first_timestamp) <= window]
+
+
+def compile_join_filter(condition: CompositeCondition, first_event_names: List[str], second_event_names: List[str],
+                        aggregated_event_names: Set[str] = None):
+    """
+    Returns a function receiving a partial match, whose events are ordered according to first_event_names, a list of
+    candidate partial matches, whose events are ordered according to second_event_names, and a time window. The function
+    returns the candidates that can be combined with the given partial match without violating the time window or the
+    basic relation conditions (e.g., SmallerThanCondition) between the two partial matches appearing in the conjunction
+    of the given condition. The rest of the condition is not verified.
+    The relation conditions with statistics collectors are not used, such that the collected statistics are not
+    affected.
+    """
+    first_positions = {name: i for i, name in enumerate(first_event_names)
+                       if aggregated_event_names is None or name not in aggregated_event_names}
+    second_positions = {name: i for i, name in enumerate(second_event_names)
+                        if aggregated_event_names is None or name not in aggregated_event_names}
+    getattr_func_names = {}
+    # maps the expressions extracting the attribute values of the given partial match to the names of their results
+    hoisted_values = {}
+    checks = []
+    sub_conditions = condition.get_conditions_list() if condition.get_terminating_result() is False else []
+    for sub_condition in sub_conditions:
+        if type(sub_condition) not in _RELATION_OPERATORS or sub_condition.get_statistics_collector() is not None:
+            continue
+        terms = sub_condition.terms
+        if len(terms) != 2 or not all(isinstance(term, Variable) and type(term).eval is Variable.eval and
+                                      isinstance(term.getattr_func, Hashable) for term in terms):
+            continue
+        first_terms = [term for term in terms if term.name in first_positions]
+        second_terms = [term for term in terms if term.name in second_positions]
+        if len(first_terms) != 1 or len(second_terms) != 1:
+            continue
+        operands = []
+        for term in terms:
+            getattr_func = getattr_func_names.setdefault(term.getattr_func,
+                                                         "_getattr_func%d" % (len(getattr_func_names),))
+            if term is first_terms[0]:
+                # the attribute values of the given partial match are only fetched once
+                expression = "partial_match.events[%d].attribute_values[%s]" % (first_positions[term.name],
+                                                                                 getattr_func)
+                operands.append(hoisted_values.setdefault(expression, "value%d" % (len(hoisted_values),)))
+            else:
+                operands.append("candidate.events[%d].attribute_values[%s]" % (second_positions[term.name],
+                                                                               getattr_func))
+        checks.append("%s %s %s" % (operands[0], _RELATION_OPERATORS[type(sub_condition)], operands[1]))
+    if len(checks) == 0:
+        return _filter_by_time_window
+    source = "\n".join([
+        "def _join_filter(partial_match, candidates, window):",
+        "    if len(candidates) == 0:",
+        "        return candidates",
+        "    first_timestamp = partial_match.first_timestamp",
+        "    last_timestamp = partial_match.last_timestamp",
+        *["    %s = %s" % (name, expression) for expression, name in hoisted_values.items()],
+        "    return [candidate for candidate in candidates",
+        "            if (candidate.last_timestamp if candidate.last_timestamp > last_timestamp else last_timestamp) -",
+        "            (candidate.first_timestamp if candidate.first_timestamp < first_timestamp else first_timestamp) <=",
+        "            window and %s]" % (" and ".join(checks),),
+    ])
+    namespace = {name: getattr_func for getattr_func, name in getattr_func_names.items()}
+    exec(source, namespace)
+    return namespace["_join_filter"]
+
+
+class _ConditionCodeGenerator:
+    """
+    Generates the source code of a compiled condition. A separate function is generated for each composite condition,
+    while the simple conditions are inlined into the function of the composite condition containing them. The objects
+    referenced by the generated code are stored in a shared namespace.
+    """
+    def __init__(self, event_names: List[str], aggregated_event_names: Set[str] = None,
+                 reordering_callback: callable = None):
+        self.__content_expressions = {
+            name: "_get_aggregated_event_content(events[%d])" % (i,)
+            if aggregated_event_names is not None and name in aggregated_event_names else "events[%d].payload" % (i,)
+            for i, name in enumerate(event_names)
+        }
+        self.__attribute_values_expressions = {
+            name: "events[%d].attribute_values" % (i,)
+            for i, name in enumerate(event_names)
+            if aggregated_event_names is None or name not in aggregated_event_names
+        }
+        self.__namespace = {"_SELECTIVITY_MATRIX": StatisticsTypes.SELECTIVITY_MATRIX,
+                            "_get_aggregated_event_content": _get_aggregated_event_content,
+                            "_perf_counter": perf_counter,
+                            "_reordering_callback": reordering_callback}
+        self.__is_sampling_enabled = reordering_callback is not None
+        self.__source = []
+
+    def compile(self, condition: CompositeCondition):
+        """
+        Returns the compiled function of the given composite condition.
+        """
+        function_name = self.__generate_composite_condition(condition)
+        exec("\n".join(self.__source), self.__namespace)
+        return self.__namespace[function_name]
+
+    def __add_object(self, prefix: str, obj: object):
+        """
+        Makes the given object accessible to the generated code and returns the name referring to it.
+        """
+        name = "_%s%d" % (prefix, len(self.__namespace))
+        self.__namespace[name] = obj
+        return name
+
+    def __generate_composite_condition(self, condition: CompositeCondition):
+        """
+        Generates a function evaluating the given composite condition and returns its name.
+        """
+        terminating_result = condition.get_terminating_result()
+        body = []
+        if self.__is_sampling_enabled and isinstance(condition, AdaptiveAndCondition):
+            sampling_function_name = self.__generate_sampling_function(condition)
+            countdown = self.__add_object("countdown", condition.get_sampling_interval())
+            body.append("    global %s" % (countdown,))
+            body.append("    %s -= 1" % (countdown,))
+            body.append("    if %s == 0:" % (countdown,))
+            body.append("        %s = %d" % (countdown, condition.get_sampling_interval()))
+            body.append("        return %s(events)" % (sampling_function_name,))
+        for sub_condition in condition.get_conditions_list():
+            statements, expression = self.__generate_sub_condition(sub_condition, "result")
+            body.extend("    %s" % (statement,) for statement in statements)
+            body.append("    if %s == %r:" % (expression, terminating_result))
+            body.append("        return %r" % (terminating_result,))
+        body.append("    return %r" % (not terminating_result,))
+        function_name = self.__add_object("composite_condition", None)
+        self.__source.append("def %s(events):\n%s\n" % (function_name, "\n".join(body)))
+        return function_name
+
+    def __generate_sampling_function(self, condition: AdaptiveAndCondition):
+        """
+        Generates a function evaluating all sub-conditions of the given adaptive condition, recording their evaluation
+        times and results in the condition, and returns its name.
+        """
+        sub_conditions_number = condition.get_num_conditions()
+        adaptive_condition = self.__add_object("adaptive_condition", condition)
+        body = ["    time0 = _perf_counter()"]
+        for i, sub_condition in enumerate(condition.get_conditions_list()):
+            statements, expression = self.__generate_sub_condition(sub_condition, "result%d" % (i,))
+            body.extend("    %s" % (statement,) for statement in statements)
+            body.append("    failure%d = %s == False" % (i, expression))
+            body.append("    time%d = _perf_counter()" % (i + 1,))
+        evaluation_times = ", ".join("time%d - time%d" % (i + 1, i) for i in range(sub_conditions_number))
+        failures = ", ".join("failure%d" % (i,) for i in range(sub_conditions_number))
+        body.append("    if %s.add_sample((%s,), (%s,)):" % (adaptive_condition, evaluation_times, failures))
+        body.append("        _reordering_callback()")
+        body.append("    return not (%s)" % (failures.replace(", ", " or "),))
+        function_name = self.__add_object("sample_condition", None)
+        self.__source.append("def %s(events):\n%s\n" % (function_name, "\n".join(body)))
+        return function_name
+
+    def __generate_sub_condition(self, condition, result_name: str):
+        """
+        Returns the statements required for evaluating the given sub-condition of a composite condition, along with an
+        expression for its result.
+        """
+        expression = self.__generate_condition_expression(condition)
+        statistics_collector = condition.get_statistics_collector() \
+            if self.__is_inlined_simple_condition(condition) else None
+        if statistics_collector is None:
+            return [], expression
+        # replicates the selectivity statistics update performed by AtomicCondition.eval
+        update_statistics = self.__add_object("update_statistics", statistics_collector.update_statistics_by_type)
+        condition_name = self.__add_object("condition", condition)
+        return ["%s = %s" % (result_name, expression),
+                "%s(_SELECTIVITY_MATRIX, (%s, %s))" % (update_statistics, condition_name, result_name)], result_name
+
+    def __generate_condition_expression(self, condition):
+        """
+        Returns an expression evaluating the given sub-condition of a composite condition.
+        """
+        if isinstance(condition, CompositeCondition) and type(condition).eval is CompositeCondition.eval:
+            if condition.get_num_conditions() == 0:
+                return "True"
+            return "%s(events)" % (self.__generate_composite_condition(condition),)
+        if self.__is_inlined_simple_condition(condition):
+            relation_op = self.__add_object("relation_op", condition.relation_op)
+            terms = [self.__generate_term_expression(term) for term in condition.terms]
+            return "%s(%s)" % (relation_op, ", ".join(terms))
+        # any other condition is evaluated by its own eval() method on a binding dict
+        condition_name = self.__add_object("condition", condition)
+        binding = ", ".join("%r: %s" % (name, expression) for name, expression in self.__content_expressions.items())
+        return "%s.eval({%s})" % (condition_name, binding)
+
+    def __generate_term_expression(self, term):
+        """
+        Returns an expression evaluating the given term of a simple condition.
+        """
+        if isinstance(term, Variable):
+            getattr_func = self.__add_object("getattr_func", term.getattr_func)
+            if term.name in self.__attribute_values_expressions and isinstance(term.getattr_func, Hashable):
+                return "%s[%s]" % (self.__attribute_values_expressions[term.name], getattr_func)
+            return "%s(%s)" % (getattr_func, self.__content_expressions[term.name])
+        return self.__add_object("constant", term)
+
+    def __is_inlined_simple_condition(self, condition):
+        """
+        Returns True if the given condition is a simple condition whose evaluation can be inlined and False otherwise.
+        Conditions overriding the evaluation logic of their classes, as well as conditions referring to unknown event
+        names, are evaluated by their own eval() methods.
+        """
+        if not isinstance(condition, SimpleCondition) or type(condition).eval is not AtomicCondition.eval or \
+                type(condition)._eval is not SimpleCondition._eval:
+            return False
+        return all(type(term).eval is Variable.eval and term.name in self.__content_expressions
+                   for term in condition.terms if isinstance(term, Variable))
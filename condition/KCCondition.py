@@ -3,7 +3,7 @@ This file contains the Kleene closure condition classes.
 """
 from abc import ABC
 
-from condition.Condition import AtomicCondition
+from condition.Condition import AtomicCondition, get_accessed_attribute_names
 
 
 class KCCondition(AtomicCondition, ABC):
@@ -39,6 +39,10 @@ class KCCondition(AtomicCondition, ABC):
         """
         return self._names
 
+    def get_referenced_attributes(self):
+        attribute_names = get_accessed_attribute_names(self._getattr_func)
+        return {name: attribute_names for name in self._names}
+
     def __repr__(self):
         return "KC [" + ", ".join(self._names) + "]"
 
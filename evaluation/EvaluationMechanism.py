@@ -1,6 +1,7 @@
 from abc import ABC
 
 from base.DataFormatter import DataFormatter
+from stream.AsyncStream import AsyncStream
 from stream.Stream import InputStream, OutputStream
 
 
@@ -14,8 +15,20 @@ class EvaluationMechanism(ABC):
         """
         raise NotImplementedError()
 
+    async def eval_async(self, events: AsyncStream, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        An asynchronous version of eval() receiving the events from an asynchronous stream.
+        """
+        raise NotImplementedError()
+
     def get_structure_summary(self):
         """
         Returns an object summarizing the structure of this evaluation mechanism.
         """
         raise NotImplementedError()
+
+    def get_skipped_events_count(self):
+        """
+        Returns the number of input events discarded as irrelevant without being parsed.
+        """
+        raise NotImplementedError()
@@ -4,6 +4,7 @@ from typing import List, Dict
 from adaptive.optimizer.Optimizer import Optimizer
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
 from base.Pattern import Pattern
+from base.TimestampTypes import TimestampTypes
 from evaluation.EvaluationMechanismTypes import EvaluationMechanismTypes
 from misc import DefaultConfig
 from plan.multi.LocalSearchTreePlanMerger import LocalSearchTreePlanMerger
@@ -26,9 +27,11 @@ class EvaluationMechanismParameters:
     Parameters required for evaluation mechanism creation.
     """
     def __init__(self, eval_mechanism_type: EvaluationMechanismTypes = DefaultConfig.DEFAULT_EVALUATION_MECHANISM_TYPE,
-                 optimizer_params: OptimizerParameters = OptimizerParameters()):
+                 optimizer_params: OptimizerParameters = OptimizerParameters(),
+                 timestamp_type: TimestampTypes = DefaultConfig.DEFAULT_TIMESTAMP_TYPE):
         self.type = eval_mechanism_type
         self.optimizer_params = optimizer_params
+        self.timestamp_type = timestamp_type
 
 
 class TreeBasedEvaluationMechanismParameters(EvaluationMechanismParameters):
@@ -39,11 +42,27 @@ class TreeBasedEvaluationMechanismParameters(EvaluationMechanismParameters):
                  storage_params: TreeStorageParameters = TreeStorageParameters(),
                  optimizer_params: OptimizerParameters = StatisticsDeviationAwareOptimizerParameters(),
                  tree_update_type: TreeEvaluationMechanismUpdateTypes = DefaultConfig.DEFAULT_TREE_UPDATE_TYPE,
-                 local_search_params: LocalSearchParameters = TabuSearchLocalSearchParameters()):
-        super().__init__(EvaluationMechanismTypes.TREE_BASED, optimizer_params)
+                 local_search_params: LocalSearchParameters = TabuSearchLocalSearchParameters(),
+                 batch_size: int = DefaultConfig.DEFAULT_EVENT_BATCH_SIZE,
+                 attribute_projection: bool = DefaultConfig.DEFAULT_ATTRIBUTE_PROJECTION,
+                 parsing_processes_number: int = DefaultConfig.DEFAULT_PARSING_PROCESSES_NUMBER,
+                 parsing_chunk_size: int = DefaultConfig.DEFAULT_PARSING_CHUNK_SIZE,
+                 timestamp_type: TimestampTypes = DefaultConfig.DEFAULT_TIMESTAMP_TYPE):
+        if batch_size <= 0:
+            raise Exception("batch_size must be positive number, got %s" % (batch_size,))
+        if parsing_processes_number < 0:
+            raise Exception("parsing_processes_number must be non-negative number, got %s" %
+                            (parsing_processes_number,))
+        if parsing_chunk_size <= 0:
+            raise Exception("parsing_chunk_size must be positive number, got %s" % (parsing_chunk_size,))
+        super().__init__(EvaluationMechanismTypes.TREE_BASED, optimizer_params, timestamp_type)
         self.storage_params = storage_params
         self.tree_update_type = tree_update_type
         self.local_search_params = local_search_params
+        self.batch_size = batch_size
+        self.attribute_projection = attribute_projection
+        self.parsing_processes_number = parsing_processes_number
+        self.parsing_chunk_size = parsing_chunk_size
 
 
 class EvaluationMechanismFactory:
@@ -73,7 +92,8 @@ class EvaluationMechanismFactory:
         optimizer_params = eval_mechanism_params.optimizer_params
         statistic_collector_params = optimizer_params.statistics_collector_params
         statistics_collector = StatisticsCollectorFactory.build_statistics_collector(statistic_collector_params,
-                                                                                     patterns)
+                                                                                     patterns,
+                                                                                     eval_mechanism_params.timestamp_type)
         optimizer = OptimizerFactory.build_optimizer(eval_mechanism_params.optimizer_params)
         cost_model_type = eval_mechanism_params.optimizer_params.tree_plan_params.cost_model_type
         pattern_to_tree_plan_map = {pattern: optimizer.build_initial_plan(pattern, cost_model_type)
@@ -87,7 +107,10 @@ class EvaluationMechanismFactory:
 
         return EvaluationMechanismFactory.__create_tree_based_evaluation_mechanism_by_update_type(
             pattern_to_tree_plan_map, eval_mechanism_params.storage_params, runtime_statistics_collector, optimizer,
-            optimizer_params.statistics_updates_time_window, eval_mechanism_params.tree_update_type)
+            optimizer_params.statistics_updates_time_window, eval_mechanism_params.tree_update_type,
+            eval_mechanism_params.batch_size, eval_mechanism_params.attribute_projection,
+            eval_mechanism_params.parsing_processes_number, eval_mechanism_params.parsing_chunk_size,
+            eval_mechanism_params.timestamp_type)
 
     @staticmethod
     def __merge_tree_plans(pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
@@ -121,7 +144,12 @@ class EvaluationMechanismFactory:
                                                                 statistics_collector: StatisticsCollector,
                                                                 optimizer: Optimizer,
                                                                 statistics_update_time_window: timedelta,
-                                                                tree_update_type: TreeEvaluationMechanismUpdateTypes):
+                                                                tree_update_type: TreeEvaluationMechanismUpdateTypes,
+                                                                batch_size: int,
+                                                                attribute_projection: bool,
+                                                                parsing_processes_number: int,
+                                                                parsing_chunk_size: int,
+                                                                timestamp_type: TimestampTypes):
         """
         Instantiates a tree-based evaluation mechanism given all the parameters.
         """
@@ -130,12 +158,22 @@ class EvaluationMechanismFactory:
                                                        storage_params,
                                                        statistics_collector,
                                                        optimizer,
-                                                       statistics_update_time_window)
+                                                       statistics_update_time_window,
+                                                       batch_size,
+                                                       attribute_projection,
+                                                       parsing_processes_number,
+                                                       parsing_chunk_size,
+                                                       timestamp_type)
 
         if tree_update_type == TreeEvaluationMechanismUpdateTypes.SIMULTANEOUS_TREE_EVALUATION:
             return SimultaneousTreeBasedEvaluationMechanism(pattern_to_tree_plan_map,
                                                             storage_params,
                                                             statistics_collector,
                                                             optimizer,
-                                                            statistics_update_time_window)
+                                                            statistics_update_time_window,
+                                                            batch_size,
+                                                            attribute_projection,
+                                                            parsing_processes_number,
+                                                            parsing_chunk_size,
+                                                            timestamp_type)
         raise Exception("Unknown evaluation mechanism type: %s" % (tree_update_type,))
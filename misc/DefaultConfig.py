@@ -11,15 +11,24 @@ from plan.multi.local_search.LocalSearchApproaches import LocalSearchApproaches
 from tree.evaluation.TreeEvaluationMechanismUpdateTypes import TreeEvaluationMechanismUpdateTypes
 from parallel.ParallelExecutionModes import *
 from parallel.ParallelExecutionPlatforms import ParallelExecutionPlatforms
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
 from plan.IterativeImprovement import IterativeImprovementType, IterativeImprovementInitType
 from plan.TreeCostModels import TreeCostModels
 from plan.TreePlanBuilderTypes import TreePlanBuilderTypes
 from transformation.PatternTransformationRules import PatternTransformationRules
 from plan.negation.NegationAlgorithmTypes import NegationAlgorithmTypes
 from plan.multi.MultiPatternTreePlanMergeApproaches import MultiPatternTreePlanMergeApproaches
+from base.TimestampTypes import TimestampTypes
 
 # general settings
 DEFAULT_EVALUATION_MECHANISM_TYPE = EvaluationMechanismTypes.TREE_BASED
+DEFAULT_EVENT_BATCH_SIZE = 1  # the number of events processed between subsequent collections of the ready matches
+DEFAULT_ATTRIBUTE_PROJECTION = False  # whether the events are parsed into payloads restricted to the used attributes
+DEFAULT_TIMESTAMP_TYPE = TimestampTypes.DATETIME  # the representation of the event timestamps during evaluation
+
+# adaptive condition ordering settings
+DEFAULT_CONDITION_SAMPLING_INTERVAL = 100  # the number of evaluations of an adaptive condition between two samples
+DEFAULT_CONDITION_REORDERING_INTERVAL = 50  # the number of samples of an adaptive condition between two reorderings
 
 # plan generation-related defaults
 DEFAULT_TREE_PLAN_BUILDER = TreePlanBuilderTypes.TRIVIAL_LEFT_DEEP_TREE
@@ -39,6 +48,22 @@ PRIORITIZE_SORTING_BY_TIMESTAMP = True
 ITERATIVE_IMPROVEMENT_TYPE = IterativeImprovementType.SWAP_BASED
 ITERATIVE_IMPROVEMENT_INIT_TYPE = IterativeImprovementInitType.RANDOM
 
+# input stream settings
+DEFAULT_COMPRESSED_STREAM_CHUNK_SIZE = 1000  # the number of lines passed at once by the decompressing thread
+DEFAULT_COMPRESSED_STREAM_PREFETCHED_CHUNKS_NUMBER = 4  # the number of chunks decompressed ahead of the consumer
+DEFAULT_ASYNC_STREAM_YIELD_INTERVAL = 100  # the number of items consumed from an async stream between two yields
+DEFAULT_SOCKET_RECEIVE_BUFFER_SIZE = 1 << 16  # the maximal number of bytes received from a socket at once
+DEFAULT_SOCKET_RECONNECT_ATTEMPTS = 5  # the number of reconnection attempts before a socket stream gives up
+DEFAULT_SOCKET_RECONNECT_INTERVAL = 0.1  # the waiting time (in seconds) before the first reconnection attempt
+DEFAULT_FOLLOWED_FILE_MIN_POLL_INTERVAL = 0.01  # the initial waiting time (in seconds) between polls of a followed file
+DEFAULT_FOLLOWED_FILE_MAX_POLL_INTERVAL = 1.0  # the maximal waiting time (in seconds) between polls of a followed file
+
+# data formatter settings
+DEFAULT_TIMESTAMP_CACHE_SIZE = 1024  # the maximal number of parsed timestamps memoized by a timestamp parser
+DEFAULT_PARSING_PROCESSES_NUMBER = 0  # the number of worker processes parsing the events (0 for parsing inline)
+DEFAULT_PARSING_CHUNK_SIZE = 1000  # the number of raw events sent to a parsing process at once
+DEFAULT_PARSING_PREFETCHED_CHUNKS_NUMBER = 4  # the number of chunks per parsing process parsed ahead of the consumer
+
 # parallel execution settings
 DEFAULT_PARALLEL_EXECUTION_MODE = ParallelExecutionModes.SEQUENTIAL
 DEFAULT_PARALLEL_EXECUTION_PLATFORM = ParallelExecutionPlatforms.THREADING
@@ -47,6 +72,8 @@ DEFAULT_PARALLEL_UNITS_NUMBER = 1
 DEFAULT_PARALLEL_KEY = None
 DEFAULT_PARALLEL_ATTRIBUTES_DICT = None
 DEFAULT_PARALLEL_MULTIPLE = 12
+DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY = None  # the maximal number of events buffered per execution unit or None
+DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY = StreamOverflowPolicies.BLOCK
 
 # settings for pattern transformation rules
 PREPROCESSING_RULES_ORDER = None  # disabled for now
@@ -0,0 +1,125 @@
+"""
+This file contains the implementation of a parsing stage running in a pool of worker processes.
+Since parsing the raw events is independent for each event, it can be performed by multiple processes in parallel
+while the evaluation mechanism processes the previously parsed events. Unlike threads, the worker processes are not
+limited by the GIL.
+"""
+import multiprocessing
+import multiprocessing.pool
+import sys
+from collections import deque
+from typing import Iterable, Set
+
+from base.DataFormatter import DataFormatter
+from base.Event import Event
+from misc import DefaultConfig
+
+# the state of a worker process, initialized once upon the creation of the process
+_worker_data_formatter = None
+_worker_event_types = None
+_worker_is_prefiltering_enabled = False
+
+
+def _init_worker(data_formatter: DataFormatter, event_types: Set[str]):
+    """
+    Initializes the state of a worker process.
+    """
+    global _worker_data_formatter, _worker_event_types, _worker_is_prefiltering_enabled
+    _worker_data_formatter = data_formatter
+    _worker_event_types = event_types
+    _worker_is_prefiltering_enabled = data_formatter.can_extract_raw_event_type()
+
+
+def _parse_chunk(first_index: int, raw_events: list):
+    """
+    Parses a chunk of consecutive raw events, the first of which has the given serial number. Returns the parsed events
+    of the relevant types along with the number of events that were discarded without being parsed.
+    """
+    events = []
+    skipped_events_count = 0
+    for index, raw_event in enumerate(raw_events, first_index):
+        if _worker_is_prefiltering_enabled and \
+                _worker_data_formatter.get_raw_event_type(raw_event) not in _worker_event_types:
+            skipped_events_count += 1
+            continue
+        event = Event(raw_event, _worker_data_formatter, index)
+        if event.type in _worker_event_types:
+            events.append(event)
+    return events, skipped_events_count
+
+
+class ParallelEventParser:
+    """
+    Converts raw events into Event objects using a pool of worker processes.
+    The raw events are sent to the workers in chunks of chunk_size events, and at most prefetched_chunks_number chunks
+    per process are parsed ahead of the consumer. The parsed events are returned in the order of the input and the
+    events irrelevant to the given event types are discarded.
+    The serial number of each event is its position in the input (offset by first_index), regardless of the way the
+    events are distributed among the workers.
+    """
+    def __init__(self, data_formatter: DataFormatter, event_types: Set[str],
+                 processes_number: int = DefaultConfig.DEFAULT_PARSING_PROCESSES_NUMBER,
+                 chunk_size: int = DefaultConfig.DEFAULT_PARSING_CHUNK_SIZE,
+                 prefetched_chunks_number: int = DefaultConfig.DEFAULT_PARSING_PREFETCHED_CHUNKS_NUMBER):
+        if processes_number <= 0:
+            raise Exception("processes_number must be positive number, got %s" % (processes_number,))
+        if chunk_size <= 0:
+            raise Exception("chunk_size must be positive number, got %s" % (chunk_size,))
+        self.__data_formatter = data_formatter
+        self.__event_types = set(event_types)
+        self.__processes_number = processes_number
+        self.__chunk_size = chunk_size
+        self.__max_pending_chunks_number = processes_number * prefetched_chunks_number
+        self.__skipped_events_count = 0
+
+    def parse(self, raw_events: Iterable, first_index: int = 0):
+        """
+        A generator returning the relevant events parsed from the given raw events.
+        """
+        self.__skipped_events_count = 0
+        pool = multiprocessing.Pool(self.__processes_number, initializer=_init_worker,
+                                    initargs=(self.__data_formatter, self.__event_types))
+        try:
+            pending_chunks = deque()
+            for chunk in self.__create_chunks(raw_events, first_index):
+                pending_chunks.append(pool.apply_async(_parse_chunk, chunk))
+                if len(pending_chunks) >= self.__max_pending_chunks_number:
+                    yield from self.__get_parsed_events(pending_chunks.popleft())
+            while len(pending_chunks) > 0:
+                yield from self.__get_parsed_events(pending_chunks.popleft())
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def get_skipped_events_count(self):
+        """
+        Returns the number of events discarded during the last parsing without being parsed.
+        """
+        return self.__skipped_events_count
+
+    def __create_chunks(self, raw_events: Iterable, first_index: int):
+        """
+        Splits the given raw events into chunks, each represented by the serial number of its first event and the list
+        of its raw events.
+        """
+        chunk = []
+        for raw_event in raw_events:
+            chunk.append(raw_event)
+            if len(chunk) >= self.__chunk_size:
+                yield first_index, chunk
+                first_index += len(chunk)
+                chunk = []
+        if len(chunk) > 0:
+            yield first_index, chunk
+
+    def __get_parsed_events(self, pending_chunk: multiprocessing.pool.AsyncResult):
+        """
+        Waits for the given chunk to be parsed and returns its events.
+        """
+        events, skipped_events_count = pending_chunk.get()
+        self.__skipped_events_count += skipped_events_count
+        for event in events:
+            # the event types are no longer interned after being transferred from a worker process
+            if type(event.type) is str:
+                event.type = sys.intern(event.type)
+        return events
@@ -1,6 +1,7 @@
 from misc import DefaultConfig
 from parallel.ParallelExecutionModes import *
 from parallel.ParallelExecutionPlatforms import ParallelExecutionPlatforms
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
 
 
 class ParallelExecutionParameters:
@@ -22,12 +23,20 @@ class DataParallelExecutionParameters(ParallelExecutionParameters):
     def __init__(self,
                  platform: ParallelExecutionPlatforms = DefaultConfig.DEFAULT_PARALLEL_EXECUTION_PLATFORM,
                  data_parallel_mode: DataParallelExecutionModes = DefaultConfig.DEFAULT_DATA_PARALLEL_ALGORITHM,
-                 units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER):
+                 units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY,
+                 unit_stream_overflow_policy: StreamOverflowPolicies =
+                 DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY):
         if units_number <= 0:
             raise Exception(f"units_number must be positive number, got {units_number}")
+        if unit_stream_capacity is not None and unit_stream_capacity <= 0:
+            raise Exception(f"unit_stream_capacity must be positive number, got {unit_stream_capacity}")
         super().__init__(execution_mode=ParallelExecutionModes.DATA_PARALLELISM, platform=platform)
         self.algorithm = data_parallel_mode
         self.units_number = units_number
+        # the maximal number of events waiting to be processed by a single execution unit (None for no limit)
+        self.unit_stream_capacity = unit_stream_capacity
+        self.unit_stream_overflow_policy = unit_stream_overflow_policy
 
 
 class DataParallelExecutionParametersHirzelAlgorithm(DataParallelExecutionParameters):
@@ -37,10 +46,15 @@ class DataParallelExecutionParametersHirzelAlgorithm(DataParallelExecutionParame
     def __init__(self,
                  platform: ParallelExecutionPlatforms = DefaultConfig.DEFAULT_PARALLEL_EXECUTION_PLATFORM,
                  units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER,
-                 key: str = DefaultConfig.DEFAULT_PARALLEL_KEY):
+                 key: str = DefaultConfig.DEFAULT_PARALLEL_KEY,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY,
+                 unit_stream_overflow_policy: StreamOverflowPolicies =
+                 DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY):
         super().__init__(platform,
                          DataParallelExecutionModes.GROUP_BY_KEY_ALGORITHM,
-                         units_number)
+                         units_number,
+                         unit_stream_capacity,
+                         unit_stream_overflow_policy)
         self.divide_key = key
 
 
@@ -51,10 +65,15 @@ class DataParallelExecutionParametersRIPAlgorithm(DataParallelExecutionParameter
     def __init__(self,
                  platform: ParallelExecutionPlatforms = DefaultConfig.DEFAULT_PARALLEL_EXECUTION_PLATFORM,
                  units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER,
-                 multiple: float = DefaultConfig.DEFAULT_PARALLEL_MULTIPLE):
+                 multiple: float = DefaultConfig.DEFAULT_PARALLEL_MULTIPLE,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY,
+                 unit_stream_overflow_policy: StreamOverflowPolicies =
+                 DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY):
         super().__init__(platform,
                          DataParallelExecutionModes.RIP_ALGORITHM,
-                         units_number)
+                         units_number,
+                         unit_stream_capacity,
+                         unit_stream_overflow_policy)
         self.rip_multiple = multiple
 
 
@@ -65,8 +84,13 @@ class DataParallelExecutionParametersHyperCubeAlgorithm(DataParallelExecutionPar
     def __init__(self,
                  platform: ParallelExecutionPlatforms = DefaultConfig.DEFAULT_PARALLEL_EXECUTION_PLATFORM,
                  units_number: int = DefaultConfig.DEFAULT_PARALLEL_UNITS_NUMBER,
-                 attributes_dict: dict = DefaultConfig.DEFAULT_PARALLEL_ATTRIBUTES_DICT):
+                 attributes_dict: dict = DefaultConfig.DEFAULT_PARALLEL_ATTRIBUTES_DICT,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY,
+                 unit_stream_overflow_policy: StreamOverflowPolicies =
+                 DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY):
         super().__init__(platform,
                          DataParallelExecutionModes.HYPER_CUBE_ALGORITHM,
-                         units_number)
+                         units_number,
+                         unit_stream_capacity,
+                         unit_stream_overflow_policy)
         self.divide_keys_dict = attributes_dict
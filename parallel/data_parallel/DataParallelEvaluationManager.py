@@ -29,8 +29,14 @@ class DataParallelEvaluationManager(ParallelEvaluationManager, ABC):
         self.__algorithm.eval(events, matches, data_formatter)
         # for now it copies all the output stream to the match stream inside the algorithms classes
 
+    async def eval_async(self, events: InputStream, matches: OutputStream, data_formatter: DataFormatter):
+        raise Exception("Asynchronous evaluation is not supported in the data parallel mode")
+
     def get_pattern_match_stream(self):
         return self.__pattern_matches
 
     def get_structure_summary(self):
         return self.__algorithm.get_structure_summary()
+
+    def get_skipped_events_count(self):
+        return self.__algorithm.get_skipped_events_count()
@@ -5,6 +5,9 @@ from base.DataFormatter import DataFormatter
 from base.PatternMatch import *
 from parallel.platform.ParallelExecutionPlatform import ParallelExecutionPlatform, Lock
 from stream.Stream import *
+from stream.BoundedStream import BoundedStream
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+from misc import DefaultConfig
 from parallel.manager.EvaluationManager import EvaluationManager
 from parallel.manager.SequentialEvaluationManager import SequentialEvaluationManager
 from typing import Set, Callable
@@ -16,9 +19,15 @@ class DataParallelExecutionAlgorithm(ABC):
     """
 
     def __init__(self, units_number, patterns: Pattern or List[Pattern],
-                 eval_mechanism_params: EvaluationMechanismParameters, platform: ParallelExecutionPlatform):
+                 eval_mechanism_params: EvaluationMechanismParameters, platform: ParallelExecutionPlatform,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY,
+                 unit_stream_overflow_policy: StreamOverflowPolicies =
+                 DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY):
         self.units_number = units_number
         self.platform = platform
+        self.unit_stream_capacity = unit_stream_capacity
+        self.unit_stream_overflow_policy = unit_stream_overflow_policy
+        self.__unit_streams = []
         # create SequentialEvaluationManager for every unit
         self.evaluation_managers = [SequentialEvaluationManager(patterns, eval_mechanism_params)
                                     for _ in range(self.units_number)]
@@ -38,13 +47,15 @@ class DataParallelExecutionAlgorithm(ABC):
                                                                   matches=matches,
                                                                   unit_id=unit_id,
                                                                   lock=self.match_lock),
-                                                data_formatter)
+                                                data_formatter,
+                                                self._create_unit_stream())
             execution_unit.start()
             execution_units.append(execution_unit)
+        self.__unit_streams = [execution_unit.events for execution_unit in execution_units]
 
         # iterate over all events
-        for raw_event in events:
-            event = Event(raw_event, data_formatter)
+        for index, raw_event in enumerate(events):
+            event = Event(raw_event, data_formatter, index)
             for unit_id in self._classifier(event):
                 execution_units[unit_id].add_event(raw_event)
 
@@ -55,6 +66,21 @@ class DataParallelExecutionAlgorithm(ABC):
         # close global OutputStream (only here) after all execution units finished
         matches.close()
 
+    def _create_unit_stream(self):
+        """
+        Creates the stream buffering the events waiting to be processed by a single execution unit.
+        """
+        if self.unit_stream_capacity is None:
+            return Stream()
+        return BoundedStream(self.unit_stream_capacity, self.unit_stream_overflow_policy)
+
+    def get_unit_streams(self):
+        """
+        Returns the event streams of the execution units created during the last activation of the algorithm.
+        For bounded streams, these can be used to inspect the backpressure statistics of each unit.
+        """
+        return self.__unit_streams
+
     def _create_skip_item(self, unit_id: int) -> Callable[[PatternMatch], bool]:
         """
         Returns a function for filtering out the matches arriving from the different execution units.
@@ -70,12 +96,18 @@ class DataParallelExecutionAlgorithm(ABC):
     def get_structure_summary(self):
         return tuple(map(lambda em: em.get_structure_summary(), self.evaluation_managers))
 
+    def get_skipped_events_count(self):
+        """
+        Returns the total number of events discarded by the execution units without being parsed.
+        """
+        return sum(em.get_skipped_events_count() for em in self.evaluation_managers)
+
     class ExecutionUnit:
         """
         A wrap for single unit that has input stream and an execution unit.
         """
-        def __init__(self, platform, unit_id, evaluation_manager, matches, data_formatter):
-            self.events = Stream()
+        def __init__(self, platform, unit_id, evaluation_manager, matches, data_formatter, events: Stream = None):
+            self.events = Stream() if events is None else events
             self.execution_unit = platform.create_parallel_execution_unit(unit_id,
                                                                           self._run,
                                                                           evaluation_manager,
@@ -111,7 +143,8 @@ class DataParallelExecutionAlgorithm(ABC):
         (same data from different units).
         """
         def __init__(self, skip_item: Callable[[PatternMatch], bool], matches: OutputStream, unit_id: int, lock: Lock):
-            super().__init__()
+            # the items are forwarded directly to the shared match stream, hence no synchronized buffer is needed
+            super().__init__(is_thread_safe=False)
             self.matches = matches
             # set the unique_match function
             self.skip_item = skip_item
@@ -5,6 +5,8 @@ from base.PatternMatch import *
 from parallel.platform.ParallelExecutionPlatform import ParallelExecutionPlatform
 from misc.Utils import is_int, is_float
 from typing import Set
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+from misc import DefaultConfig
 
 
 class GroupByKeyParallelExecutionAlgorithm(DataParallelExecutionAlgorithm):
@@ -24,8 +26,12 @@ class GroupByKeyParallelExecutionAlgorithm(DataParallelExecutionAlgorithm):
                  patterns: Pattern or List[Pattern],
                  eval_mechanism_params: EvaluationMechanismParameters,
                  platform: ParallelExecutionPlatform,
-                 key: str):
-        super().__init__(units_number, patterns, eval_mechanism_params, platform)
+                 key: str,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY,
+                 unit_stream_overflow_policy: StreamOverflowPolicies =
+                 DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY):
+        super().__init__(units_number, patterns, eval_mechanism_params, platform,
+                         unit_stream_capacity, unit_stream_overflow_policy)
         self._key = key
 
     def _classifier(self, event: Event) -> Set[int]:
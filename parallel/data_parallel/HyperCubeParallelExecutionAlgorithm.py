@@ -11,6 +11,8 @@ from functools import reduce
 from misc.Utils import array, ndarray
 from misc.Utils import is_int, is_float
 from typing import Tuple, Set
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+from misc import DefaultConfig
 
 
 class HyperCubeParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
@@ -21,7 +23,10 @@ class HyperCubeParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
     """
 
     def __init__(self, units_number, patterns: Pattern or List[Pattern],
-                 eval_mechanism_params: EvaluationMechanismParameters, platform, attributes_dict: dict):
+                 eval_mechanism_params: EvaluationMechanismParameters, platform, attributes_dict: dict,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY,
+                 unit_stream_overflow_policy: StreamOverflowPolicies =
+                 DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY):
         if isinstance(patterns, Pattern):
             patterns = [patterns]
         for pattern in patterns:
@@ -49,7 +54,8 @@ class HyperCubeParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
 
         shares, cube_size = self._calc_cubic_shares(units_number, dims)
         self._cube = array(range(cube_size)).reshape(shares)
-        super().__init__(self._cube.size, patterns, eval_mechanism_params, platform)
+        super().__init__(self._cube.size, patterns, eval_mechanism_params, platform,
+                         unit_stream_capacity, unit_stream_overflow_policy)
 
     def _classifier(self, event: Event) -> Set[int]:
         """
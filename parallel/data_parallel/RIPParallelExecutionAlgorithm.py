@@ -5,7 +5,10 @@ from evaluation.EvaluationMechanismFactory import EvaluationMechanismParameters
 from base.PatternMatch import *
 from typing import Set
 from base.DataFormatter import DataFormatter
+from base.EpochTimestampDataFormatter import convert_time_window, convert_timestamp
 from stream.Stream import *
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+from misc import DefaultConfig
 
 
 class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
@@ -16,8 +19,12 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
     """
     def __init__(self, units_number, patterns: Pattern or List[Pattern],
                  eval_mechanism_params: EvaluationMechanismParameters,
-                 platform, multiple: float):
-        super().__init__(units_number, patterns, eval_mechanism_params, platform)
+                 platform, multiple: float,
+                 unit_stream_capacity: int = DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_CAPACITY,
+                 unit_stream_overflow_policy: StreamOverflowPolicies =
+                 DefaultConfig.DEFAULT_PARALLEL_UNIT_STREAM_OVERFLOW_POLICY):
+        super().__init__(units_number, patterns, eval_mechanism_params, platform,
+                         unit_stream_capacity, unit_stream_overflow_policy)
 
         # in case of multi pattern
         if isinstance(patterns, list):
@@ -30,7 +37,13 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
         if self._time_delta > self._interval:  # multiple must be > 1
             raise Exception("time delta > interval")
 
+        # the timestamps of the matches are represented according to the timestamp type of the evaluation mechanisms
+        self.__timestamp_type = DefaultConfig.DEFAULT_TIMESTAMP_TYPE if eval_mechanism_params is None \
+            else eval_mechanism_params.timestamp_type
+        self.__match_interval = convert_time_window(self._interval, self.__timestamp_type)
+
         self._start_time = None
+        self.__match_start_time = None
 
     def eval(self, events: InputStream, matches: OutputStream, data_formatter: DataFormatter):
         """
@@ -38,8 +51,9 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
         Sets the algorithm's start time as the time of the first event, this start time will be referenced by
         the calling methods as a base point.
         """
-        first_event = Event(events.first(), data_formatter)
+        first_event = Event(events.first(), data_formatter, 0)
         self._start_time = first_event.timestamp
+        self.__match_start_time = convert_timestamp(self._start_time, self.__timestamp_type)
         super(RIPParallelExecutionAlgorithm, self).eval(events, matches, data_formatter)
 
     def _create_skip_item(self, unit_id: int):
@@ -47,7 +61,8 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
         Only allows a match to pass if it was returned by the first of the two overlapping execution units.
         """
         def skip_item(item: PatternMatch):
-            first_matching_unit = self.__get_unit_number(item.first_timestamp)
+            first_matching_unit = self.__get_unit_number(item.first_timestamp, self.__match_start_time,
+                                                         self.__match_interval)
             return first_matching_unit != unit_id
         return skip_item
 
@@ -56,15 +71,15 @@ class RIPParallelExecutionAlgorithm(DataParallelExecutionAlgorithm, ABC):
         Returns possible unit ids for the given event
         """
         event_time = event.timestamp
-        unit_id1 = self.__get_unit_number(event_time - self._time_delta)
-        unit_id2 = self.__get_unit_number(event_time)
+        unit_id1 = self.__get_unit_number(event_time - self._time_delta, self._start_time, self._interval)
+        unit_id2 = self.__get_unit_number(event_time, self._start_time, self._interval)
         return {unit_id1, unit_id2}
 
-    def __get_unit_number(self, event_time) -> int:
+    def __get_unit_number(self, event_time, start_time, interval) -> int:
         """
         Returns the ID of the execution unit in charge of the time interval to which the given timestamp belongs.
         In case of an overlapping window between two threads, the first ID is returned.
         """
-        diff_time = event_time - self._start_time
-        unit_id = int((diff_time / self._interval) % self.units_number)
+        diff_time = event_time - start_time
+        unit_id = int((diff_time / interval) % self.units_number)
         return unit_id  # result is zero based
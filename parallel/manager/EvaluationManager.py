@@ -5,6 +5,7 @@ It internally activates and uses a CEP evaluation mechanism.
 """
 from abc import ABC
 
+from stream.AsyncStream import AsyncStream
 from stream.Stream import InputStream, OutputStream
 from base.DataFormatter import DataFormatter
 
@@ -20,6 +21,13 @@ class EvaluationManager(ABC):
         """
         raise NotImplementedError()
 
+    async def eval_async(self, event_stream: AsyncStream, pattern_matches: OutputStream,
+                         data_formatter: DataFormatter):
+        """
+        An asynchronous version of eval() receiving the events from an asynchronous stream.
+        """
+        raise NotImplementedError()
+
     def get_pattern_match_stream(self):
         """
         Returns the most recently used pattern match stream.
@@ -31,3 +39,9 @@ class EvaluationManager(ABC):
         Returns a string containing a short description of the underlying evaluation mechanism structure
         """
         raise NotImplementedError()
+
+    def get_skipped_events_count(self):
+        """
+        Returns the number of input events discarded as irrelevant without being parsed.
+        """
+        raise NotImplementedError()
@@ -6,6 +6,7 @@ from evaluation.EvaluationMechanismFactory import (
     EvaluationMechanismFactory,
 )
 from parallel.manager.EvaluationManager import EvaluationManager
+from stream.AsyncStream import AsyncStream
 from stream.Stream import InputStream, OutputStream
 from base.Pattern import Pattern
 from base.DataFormatter import DataFormatter
@@ -28,8 +29,16 @@ class SequentialEvaluationManager(EvaluationManager):
         self.__pattern_matches = pattern_matches
         self.__eval_mechanism.eval(event_stream, pattern_matches, data_formatter)
 
+    async def eval_async(self, event_stream: AsyncStream, pattern_matches: OutputStream,
+                         data_formatter: DataFormatter):
+        self.__pattern_matches = pattern_matches
+        await self.__eval_mechanism.eval_async(event_stream, pattern_matches, data_formatter)
+
     def get_pattern_match_stream(self):
         return self.__pattern_matches
 
     def get_structure_summary(self):
         return self.__eval_mechanism.get_structure_summary()
+
+    def get_skipped_events_count(self):
+        return self.__eval_mechanism.get_skipped_events_count()
@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta
 import random
 
-from base.DataFormatter import DataFormatter, EventTypeClassifier
-from misc.Utils import str_to_number
+from base.ColumnTypes import ColumnTypes
+from base.DataFormatter import EventTypeClassifier
+from base.SchemaDataFormatter import DataSchema, SchemaDataFormatter
 
 SENSORS_TIMESTAMP_KEY = "TimeStamp"
 SENSORS_TYPE_KEY = "SensorType"
@@ -36,6 +37,15 @@ SENSORS_KEYS_DICT = {
         ]
 }
 
+# the event timestamp is represented in sensors using a "%m/%d/%Y %H:%M:%S" format
+SENSORS_SCHEMAS = {
+    sensor_type: DataSchema(
+        columns=list(zip(keys, [ColumnTypes.STRING, ColumnTypes.STRING] + [ColumnTypes.NUMBER] * (len(keys) - 2))),
+        timestamp_column=SENSORS_TIMESTAMP_KEY,
+        timestamp_format="%m/%d/%Y %H:%M:%S")
+    for sensor_type, keys in SENSORS_KEYS_DICT.items()
+}
+
 
 class SensorsEventTypeClassifier(EventTypeClassifier):
     """
@@ -45,32 +55,20 @@ class SensorsEventTypeClassifier(EventTypeClassifier):
     def get_event_type(self, event_payload: dict):
         return event_payload[SENSORS_TYPE_KEY]
 
+    def get_event_type_attribute(self):
+        return SENSORS_TYPE_KEY
+
 
-class SensorsDataFormatter(DataFormatter):
+class SensorsDataFormatter(SchemaDataFormatter):
     """
     A data formatter implementation for a Sensors event stream, where each event is given as a string in Sensors
     format.
+    If use_schema_payload is set, the events are parsed into compact schema-backed payloads instead of dicts.
     """
 
-    def __init__(self, event_type_classifier: EventTypeClassifier = SensorsEventTypeClassifier()):
-        super().__init__(event_type_classifier)
-
-    def parse_event(self, raw_data: str):
-        """
-        Parses a Sensors formatted string into an event.
-        """
-        event_attributes = raw_data.replace("\n", "").split(",")
-        return dict(zip(
-            SENSORS_KEYS_DICT[event_attributes[0]],
-            map(str_to_number, event_attributes)
-        ))
-
-    def get_event_timestamp(self, event_payload: dict):
-        """
-        The event timestamp is represented in sensors using a "%m/%d/%Y %H:%M:%S" format.
-        """
-        timestamp_str = event_payload[SENSORS_TIMESTAMP_KEY]
-        return datetime.strptime(timestamp_str, "%m/%d/%Y %H:%M:%S")
+    def __init__(self, event_type_classifier: EventTypeClassifier = SensorsEventTypeClassifier(),
+                 use_schema_payload: bool = False):
+        super().__init__(SENSORS_SCHEMAS, event_type_classifier, use_schema_payload=use_schema_payload)
 
 
 def random_str(lowest, highest):
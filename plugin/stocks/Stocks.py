@@ -1,8 +1,6 @@
-from datetime import datetime
-from typing import Any, Dict, Optional
-
-from base.DataFormatter import DataFormatter, EventTypeClassifier
-from misc.Utils import str_to_number
+from base.ColumnTypes import ColumnTypes
+from base.DataFormatter import EventTypeClassifier
+from base.SchemaDataFormatter import DataSchema, SchemaDataFormatter
 
 METASTOCK_STOCK_TICKER_KEY = "Stock Ticker"
 METASTOCK_EVENT_TIMESTAMP_KEY = "Date"
@@ -19,6 +17,13 @@ METASTOCK_7_COLUMN_KEYS = [
 
 ADDITIONAL_OPTIONAL_KEYS = [PROBABILITY_KEY]
 
+# the event timestamp is represented in metastock 7 using a YYYYMMDDhhmm format
+METASTOCK_7_SCHEMA = DataSchema(
+    columns=list(zip(METASTOCK_7_COLUMN_KEYS, [ColumnTypes.STRING, ColumnTypes.INT] + [ColumnTypes.NUMBER] * 5)),
+    optional_columns=[(PROBABILITY_KEY, ColumnTypes.NUMBER)],
+    timestamp_column=METASTOCK_EVENT_TIMESTAMP_KEY,
+    timestamp_format="%Y%m%d%H%M")
+
 
 class MetastockByTickerEventTypeClassifier(EventTypeClassifier):
     """
@@ -30,32 +35,16 @@ class MetastockByTickerEventTypeClassifier(EventTypeClassifier):
         """
         return event_payload[METASTOCK_STOCK_TICKER_KEY]
 
+    def get_event_type_attribute(self):
+        return METASTOCK_STOCK_TICKER_KEY
+
 
-class MetastockDataFormatter(DataFormatter):
+class MetastockDataFormatter(SchemaDataFormatter):
     """
     A data formatter implementation for a stock event stream, where each event is given as a string in metastock 7
     format.
+    If use_schema_payload is set, the events are parsed into compact schema-backed payloads instead of dicts.
     """
-    def __init__(self, event_type_classifier: EventTypeClassifier = MetastockByTickerEventTypeClassifier()):
-        super().__init__(event_type_classifier)
-
-    def parse_event(self, raw_data: str):
-        """
-        Parses a metastock 7 formatted string into an event.
-        """
-        event_attributes = raw_data.replace("\n", "").split(",")
-        return dict(zip(
-            METASTOCK_7_COLUMN_KEYS + ADDITIONAL_OPTIONAL_KEYS,
-            map(str_to_number, event_attributes)
-        ))
-
-    def get_event_timestamp(self, event_payload: dict):
-        """
-        The event timestamp is represented in metastock 7 using a YYYYMMDDhhmm format.
-        """
-        timestamp_str = str(event_payload[METASTOCK_EVENT_TIMESTAMP_KEY])
-        return datetime(year=int(timestamp_str[0:4]), month=int(timestamp_str[4:6]), day=int(timestamp_str[6:8]),
-                        hour=int(timestamp_str[8:10]), minute=int(timestamp_str[10:12]))
-
-    def get_probability(self, event_payload: Dict[str, Any]) -> Optional[float]:
-        return event_payload.get(PROBABILITY_KEY, None)
+    def __init__(self, event_type_classifier: EventTypeClassifier = MetastockByTickerEventTypeClassifier(),
+                 use_schema_payload: bool = False):
+        super().__init__(METASTOCK_7_SCHEMA, event_type_classifier, PROBABILITY_KEY, use_schema_payload)
@@ -1,4 +1,6 @@
+import copy
 from datetime import datetime
+from typing import Dict, Set
 from base.DataFormatter import DataFormatter, EventTypeClassifier
 import json
 
@@ -20,6 +22,9 @@ class DummyTwitterEventTypeClassifier(EventTypeClassifier):
     def get_event_type(self, event_payload: dict):
         return self.TWEET_TYPE
 
+    def get_event_type_attributes(self):
+        return set()
+
 
 class TweetDataFormatter(DataFormatter):
     """
@@ -27,6 +32,9 @@ class TweetDataFormatter(DataFormatter):
     """
     def __init__(self, event_type_classifier: EventTypeClassifier = DummyTwitterEventTypeClassifier()):
         super().__init__(event_type_classifier)
+        self.__mandatory_fields = TWEET_MANDATORY_FIELDS
+        self.__optional_fields = TWEET_OPTIONAL_FIELDS
+        self.__optional_dict_fields = TWEET_OPTIONAL_DICT_FIELDS
 
     def parse_event(self, raw_data: str):
         """
@@ -34,14 +42,29 @@ class TweetDataFormatter(DataFormatter):
         To conserve memory, only a selection of the most important fields presented in the tweet are included.
         """
         json_version = json.loads(raw_data)
-        tweet_payload_dict = {key: json_version[key] for key in TWEET_MANDATORY_FIELDS}
+        tweet_payload_dict = {key: json_version[key] for key in self.__mandatory_fields}
         tweet_payload_dict.update({key: json_version[key]
-                                   for key in TWEET_OPTIONAL_FIELDS if key in json_version})
+                                   for key in self.__optional_fields if key in json_version})
         tweet_payload_dict.update({primary_key: json_version[primary_key][secondary_key]
-                                   for (primary_key, secondary_key) in TWEET_OPTIONAL_DICT_FIELDS.items()
+                                   for (primary_key, secondary_key) in self.__optional_dict_fields.items()
                                    if primary_key in json_version and json_version[primary_key] is not None})
         return tweet_payload_dict
 
+    def get_projected_formatter(self, attributes_by_event_type: Dict[str, Set[str]]):
+        """
+        Returns a formatter only including the given fields (and the timestamp) in the payloads.
+        """
+        attribute_names = self._get_projected_attribute_names(attributes_by_event_type)
+        if attribute_names is None:
+            return self
+        attribute_names.add(TWEET_EVENT_TIMESTAMP_KEY)
+        projected_formatter = copy.copy(self)
+        projected_formatter.__mandatory_fields = [key for key in TWEET_MANDATORY_FIELDS if key in attribute_names]
+        projected_formatter.__optional_fields = [key for key in TWEET_OPTIONAL_FIELDS if key in attribute_names]
+        projected_formatter.__optional_dict_fields = {key: value for key, value in TWEET_OPTIONAL_DICT_FIELDS.items()
+                                                      if key in attribute_names}
+        return projected_formatter
+
     def get_event_timestamp(self, event_payload: dict):
         """
         The timestamps in Twitter are formatted as follows: Wed Oct 10 20:19:24 +0000 2018
@@ -0,0 +1,65 @@
+import asyncio
+
+from misc import DefaultConfig
+from stream.Stream import Stream
+
+
+class AsyncStream(Stream):
+    """
+    A stream to be used by coroutines running in a single asyncio event loop.
+    Items are added synchronously using add_item() and consumed using 'async for' or get_item_async(). When the stream
+    is empty, the consumer awaits the next item instead of blocking the thread, allowing the producers (e.g., socket
+    readers) to run in the same event loop. Thus, it can serve both as an input stream for CEP.run_async() and as an
+    asynchronous sink for the pattern matches.
+    To avoid starving the other coroutines when many items are available, the consumer yields control to the event loop
+    after every yield_interval items.
+    Items produced by a different thread should be added using loop.call_soon_threadsafe(stream.add_item, item).
+    """
+    def __init__(self, yield_interval: int = DefaultConfig.DEFAULT_ASYNC_STREAM_YIELD_INTERVAL):
+        super().__init__(is_thread_safe=False)
+        if yield_interval <= 0:
+            raise Exception("Yield interval must be positive, got %s" % (yield_interval,))
+        self.__yield_interval = yield_interval
+        self.__items_since_last_yield = 0
+        self.__item_available = asyncio.Event()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._stream.qsize() == 0:
+            await self.__wait_for_item()
+        else:
+            self.__items_since_last_yield += 1
+            if self.__items_since_last_yield >= self.__yield_interval:
+                self.__items_since_last_yield = 0
+                await asyncio.sleep(0)
+        next_item = self._stream.get()
+        if next_item is None:
+            raise StopAsyncIteration()
+        return next_item
+
+    def add_item(self, item: object):
+        super().add_item(item)
+        self.__item_available.set()
+
+    def close(self):
+        super().close()
+        self.__item_available.set()
+
+    async def get_item_async(self):
+        return await self.__anext__()
+
+    def duplicate(self):
+        ret = AsyncStream(self.__yield_interval)
+        ret._stream.queue = self._stream.queue.copy()
+        return ret
+
+    async def __wait_for_item(self):
+        """
+        Suspends the calling coroutine until a new item is added to this stream.
+        """
+        while self._stream.qsize() == 0:
+            self.__item_available.clear()
+            await self.__item_available.wait()
+        self.__items_since_last_yield = 0
@@ -0,0 +1,317 @@
+"""
+This file contains the implementation of a compact binary container for event files.
+An event file in this format stores the already parsed event payloads, such that replaying it skips the text parsing
+performed by the data formatter.
+
+The file consists of the following parts:
+1. A magic string identifying the format.
+2. The event records. Each record starts with a 2-byte layout ID, optionally followed by the event timestamp (as
+   8-byte microseconds since the epoch), followed by the values of the event attributes packed according to the
+   layout. A layout specifies the names of the attributes and the types of their values and is shared by all events
+   with the same attribute structure. Integers and floats are stored as 8-byte numbers and strings are stored as 4-byte
+   indices into a string table.
+3. A JSON-encoded footer containing the layouts, the string table, the number of records, the offset of the last record
+   and whether the records contain timestamps.
+4. The offset of the footer (8 bytes) followed by the magic string.
+"""
+import json
+import os
+import struct
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from base.DataFormatter import DataFormatter
+from base.SchemaDataFormatter import memoize_timestamp_parser
+from stream.Stream import InputStream
+
+BINARY_EVENT_FILE_MAGIC = b"OCEPBIN1"
+
+_LAYOUT_ID_FORMAT = struct.Struct("<H")
+_TIMESTAMPED_RECORD_HEADER_FORMAT = struct.Struct("<Hq")
+_TRAILER_FORMAT = struct.Struct("<Q%ds" % (len(BINARY_EVENT_FILE_MAGIC),))
+_MAX_LAYOUTS_NUMBER = 2 ** 16
+
+_INT_TYPE_CODE = "q"
+_FLOAT_TYPE_CODE = "d"
+_STRING_TYPE_CODE = "I"
+
+_READ_CHUNK_SIZE = 1 << 16
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class TimestampedPayload(dict):
+    """
+    An event payload read from a binary event file along with the event timestamp stored next to it, such that the
+    timestamp does not have to be parsed again from the attribute values.
+    """
+    __slots__ = ("timestamp",)
+
+    def __init__(self, items, timestamp: datetime):
+        super().__init__(items)
+        self.timestamp = timestamp
+
+
+def _convert_from_microseconds(microseconds: int):
+    """
+    Converts a timestamp stored in a binary event file into a datetime object.
+    """
+    return _EPOCH + microseconds * _MICROSECOND
+
+
+class _RecordLayout:
+    """
+    Describes the binary representation of all events sharing the same attribute names and value types.
+    """
+    def __init__(self, keys: List[str], type_codes: List[str]):
+        self.keys = keys
+        self.type_codes = type_codes
+        self.struct = struct.Struct("<" + "".join(type_codes))
+        self.string_positions = [i for i, type_code in enumerate(type_codes) if type_code == _STRING_TYPE_CODE]
+
+
+class BinaryEventFileWriter:
+    """
+    Writes parsed event payloads into a binary event file.
+    If store_timestamps is set, the timestamp of each event (a naive datetime object) must be given along with its
+    payload and is stored in the file as well.
+    """
+    def __init__(self, file_path: str, store_timestamps: bool = False):
+        self.__file = open(file_path, "wb")
+        self.__file.write(BINARY_EVENT_FILE_MAGIC)
+        self.__store_timestamps = store_timestamps
+        self.__position = len(BINARY_EVENT_FILE_MAGIC)
+        self.__last_record_offset = None
+        self.__layouts = []
+        self.__layout_ids = {}
+        self.__strings = []
+        self.__string_ids = {}
+        self.__records_count = 0
+
+    def write(self, payload: Dict[str, object], timestamp: datetime = None):
+        """
+        Appends the given event payload to the file.
+        """
+        if self.__store_timestamps and (not isinstance(timestamp, datetime) or timestamp.tzinfo is not None):
+            raise Exception("Expected a naive datetime timestamp, got %s" % (timestamp,))
+        type_codes = tuple(self.__get_type_code(key, value) for key, value in payload.items())
+        layout_key = (tuple(payload.keys()), type_codes)
+        layout_id = self.__layout_ids.get(layout_key)
+        if layout_id is None:
+            if len(self.__layouts) >= _MAX_LAYOUTS_NUMBER:
+                raise Exception("Too many distinct event layouts in a single binary event file")
+            layout_id = len(self.__layouts)
+            self.__layouts.append(_RecordLayout(list(payload.keys()), list(type_codes)))
+            self.__layout_ids[layout_key] = layout_id
+        layout = self.__layouts[layout_id]
+        values = [self.__get_string_id(value) if type_code == _STRING_TYPE_CODE else value
+                  for value, type_code in zip(payload.values(), type_codes)]
+        if self.__store_timestamps:
+            header = _TIMESTAMPED_RECORD_HEADER_FORMAT.pack(layout_id, (timestamp - _EPOCH) // _MICROSECOND)
+        else:
+            header = _LAYOUT_ID_FORMAT.pack(layout_id)
+        record = header + layout.struct.pack(*values)
+        self.__file.write(record)
+        self.__last_record_offset = self.__position
+        self.__position += len(record)
+        self.__records_count += 1
+
+    def close(self):
+        """
+        Writes the footer and closes the file.
+        """
+        footer_offset = self.__position
+        footer = {
+            "layouts": [[layout.keys, layout.type_codes] for layout in self.__layouts],
+            "strings": self.__strings,
+            "records_count": self.__records_count,
+            "last_record_offset": self.__last_record_offset,
+            "has_timestamps": self.__store_timestamps
+        }
+        self.__file.write(json.dumps(footer).encode("utf-8"))
+        self.__file.write(_TRAILER_FORMAT.pack(footer_offset, BINARY_EVENT_FILE_MAGIC))
+        self.__file.close()
+
+    def __get_string_id(self, value: str):
+        """
+        Returns the index of the given string in the string table, adding it to the table if necessary.
+        """
+        string_id = self.__string_ids.get(value)
+        if string_id is None:
+            string_id = len(self.__strings)
+            self.__strings.append(value)
+            self.__string_ids[value] = string_id
+        return string_id
+
+    @staticmethod
+    def __get_type_code(key: str, value: object):
+        """
+        Returns the code of the binary type used to store the given attribute value.
+        """
+        # bool is a subclass of int and cannot be stored without losing its type
+        if isinstance(value, int) and not isinstance(value, bool):
+            return _INT_TYPE_CODE
+        if isinstance(value, float):
+            return _FLOAT_TYPE_CODE
+        if isinstance(value, str):
+            return _STRING_TYPE_CODE
+        raise Exception("Unsupported value type for attribute %s: %s" % (key, type(value)))
+
+
+class BinaryFileInputStream(InputStream):
+    """
+    Reads the event payloads from a binary event file created by BinaryEventFileWriter.
+    The items of this stream are already parsed dictionaries rather than raw strings. Hence, it must be used in
+    conjunction with a ParsedEventDataFormatter. If the file contains the event timestamps, the items are
+    TimestampedPayload objects.
+    Similarly to a lazy FileInputStream, the file is read in chunks and is never fully loaded into memory.
+    """
+    def __init__(self, file_path: str, start_record: int = 0):
+        super().__init__(is_thread_safe=False)
+        self.__file_path = file_path
+        with open(file_path, "rb") as f:
+            if f.read(len(BINARY_EVENT_FILE_MAGIC)) != BINARY_EVENT_FILE_MAGIC:
+                raise Exception("%s is not a binary event file" % (file_path,))
+            f.seek(-_TRAILER_FORMAT.size, os.SEEK_END)
+            self.__footer_offset, magic = _TRAILER_FORMAT.unpack(f.read(_TRAILER_FORMAT.size))
+            if magic != BINARY_EVENT_FILE_MAGIC:
+                raise Exception("Binary event file %s is truncated" % (file_path,))
+            f.seek(self.__footer_offset)
+            footer = json.loads(f.read(os.path.getsize(file_path) - _TRAILER_FORMAT.size - self.__footer_offset))
+        self.__layouts = [_RecordLayout(keys, type_codes) for keys, type_codes in footer["layouts"]]
+        self.__strings = footer["strings"]
+        self.__records_count = footer["records_count"]
+        self.__last_record_offset = footer["last_record_offset"]
+        self.__has_timestamps = footer["has_timestamps"]
+        self.__header_format = _TIMESTAMPED_RECORD_HEADER_FORMAT if self.__has_timestamps else _LAYOUT_ID_FORMAT
+        self.__max_record_size = self.__header_format.size + max((layout.struct.size for layout in self.__layouts),
+                                                                 default=0)
+        self.__next_record = min(start_record, self.__records_count)
+        self.__records = self.__read_records(len(BINARY_EVENT_FILE_MAGIC), self.__next_record)
+
+    def __next__(self):
+        item = next(self.__records)
+        self.__next_record += 1
+        return item
+
+    def close(self):
+        """
+        Stops reading the file.
+        """
+        self.__records.close()
+        self.__next_record = self.__records_count
+
+    def duplicate(self):
+        """
+        Returns a new stream replaying the file from the current position of this stream.
+        """
+        return BinaryFileInputStream(self.__file_path, self.__next_record)
+
+    def count(self):
+        """
+        Returns the number of records that were not yet read.
+        """
+        return self.__records_count - self.__next_record
+
+    def first(self):
+        if self.count() == 0:
+            return None
+        return self.__read_single_record(len(BINARY_EVENT_FILE_MAGIC), self.__next_record)
+
+    def last(self):
+        if self.count() == 0:
+            return None
+        # the last record is read directly from its offset rather than by replaying the file
+        return self.__read_single_record(self.__last_record_offset, 0)
+
+    def __read_single_record(self, offset: int, records_to_skip: int):
+        """
+        Reads a single record using a new generator (see __read_records()), which is closed right away along with
+        its file.
+        """
+        records = self.__read_records(offset, records_to_skip)
+        try:
+            return next(records)
+        finally:
+            records.close()
+
+    def __read_records(self, offset: int, records_to_skip: int):
+        """
+        A generator reading the file chunk by chunk and decoding the records one at a time, starting from the record
+        at the given offset and skipping the given number of records.
+        """
+        layouts = self.__layouts
+        strings = self.__strings
+        has_timestamps = self.__has_timestamps
+        unpack_header = self.__header_format.unpack_from
+        header_size = self.__header_format.size
+        # consecutive events typically share the same timestamp
+        convert_timestamp = memoize_timestamp_parser(_convert_from_microseconds)
+        with open(self.__file_path, "rb") as f:
+            f.seek(offset)
+            remaining_bytes = self.__footer_offset - offset
+            buffer = b""
+            position = 0
+            while True:
+                if len(buffer) - position < self.__max_record_size and remaining_bytes > 0:
+                    chunk = f.read(min(_READ_CHUNK_SIZE, remaining_bytes))
+                    remaining_bytes -= len(chunk)
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                if position >= len(buffer):
+                    return
+                header = unpack_header(buffer, position)
+                layout = layouts[header[0]]
+                if records_to_skip > 0:
+                    position += header_size + layout.struct.size
+                    records_to_skip -= 1
+                    continue
+                values = layout.struct.unpack_from(buffer, position + header_size)
+                position += header_size + layout.struct.size
+                if len(layout.string_positions) > 0:
+                    values = list(values)
+                    for i in layout.string_positions:
+                        values[i] = strings[values[i]]
+                if has_timestamps:
+                    yield TimestampedPayload(zip(layout.keys, values), convert_timestamp(header[1]))
+                else:
+                    yield dict(zip(layout.keys, values))
+
+
+class ParsedEventDataFormatter(DataFormatter):
+    """
+    A data formatter for streams whose items are already parsed event payloads, e.g., BinaryFileInputStream.
+    The timestamps of TimestampedPayload items are returned as is. The extraction of the event type, the probability
+    and the timestamps of other items is delegated to the formatter of the original format.
+    """
+    def __init__(self, source_data_formatter: DataFormatter):
+        super().__init__(None)
+        self.__source_data_formatter = source_data_formatter
+
+    def parse_event(self, raw_data: dict):
+        return raw_data
+
+    def get_event_timestamp(self, event_payload: dict):
+        if type(event_payload) is TimestampedPayload:
+            return event_payload.timestamp
+        return self.__source_data_formatter.get_event_timestamp(event_payload)
+
+    def get_event_type(self, event_payload: dict):
+        return self.__source_data_formatter.get_event_type(event_payload)
+
+    def get_probability(self, event_payload: dict):
+        return self.__source_data_formatter.get_probability(event_payload)
+
+
+def convert_to_binary_event_file(input_path: str, output_path: str, data_formatter: DataFormatter):
+    """
+    Parses the given text event file using the given data formatter and stores the parsed events along with their
+    timestamps in a binary event file.
+    """
+    writer = BinaryEventFileWriter(output_path, store_timestamps=True)
+    with open(input_path, "r") as input_file:
+        for line in input_file:
+            payload = data_formatter.parse_event(line)
+            writer.write(payload, data_formatter.get_event_timestamp(payload))
+    writer.close()
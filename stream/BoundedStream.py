@@ -0,0 +1,188 @@
+import pickle
+import tempfile
+import threading
+import time
+from collections import deque
+from queue import Empty
+
+from stream.Stream import Stream
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+
+
+class BoundedQueue:
+    """
+    A thread-safe replacement for queue.Queue holding at most a predefined number of items in memory.
+    Implements the subset of the queue.Queue API used by the streams. The behavior upon overflow is determined by the
+    given overflow policy.
+    """
+    def __init__(self, capacity: int, overflow_policy: StreamOverflowPolicies, spill_directory: str = None):
+        if capacity <= 0:
+            raise Exception("Stream capacity must be positive, got %s" % (capacity,))
+        self.queue = deque()
+        self.__capacity = capacity
+        self.__overflow_policy = overflow_policy
+        self.__spill_directory = spill_directory
+
+        self.__lock = threading.Lock()
+        self.__not_empty = threading.Condition(self.__lock)
+        self.__not_full = threading.Condition(self.__lock)
+
+        # the spill file is only created upon the first overflow
+        self.__spill_file = None
+        self.__spill_read_offset = 0
+        self.__spill_write_offset = 0
+        # the number of items currently residing in the spill file
+        self.__spill_size = 0
+
+        self.blocked_time = 0.0
+        self.blocked_count = 0
+        self.dropped_items_count = 0
+        self.spilled_items_count = 0
+
+    def put(self, item: object, force: bool = False):
+        """
+        Adds an item to the queue, applying the overflow policy if the queue is full. If force is set, the item is
+        added regardless of the capacity limit.
+        """
+        with self.__lock:
+            if self.__spill_size > 0:
+                # to preserve the order of the items, keep spilling until the spilled items are consumed
+                self.__spill(item)
+                return
+            if len(self.queue) >= self.__capacity and not force:
+                if self.__overflow_policy == StreamOverflowPolicies.BLOCK:
+                    self.__wait_until_not_full()
+                elif self.__overflow_policy == StreamOverflowPolicies.DROP_OLDEST:
+                    self.queue.popleft()
+                    self.dropped_items_count += 1
+                elif self.__overflow_policy == StreamOverflowPolicies.DROP_NEWEST:
+                    self.dropped_items_count += 1
+                    return
+                elif self.__overflow_policy == StreamOverflowPolicies.SPILL:
+                    self.__spill(item)
+                    return
+                else:
+                    raise Exception("Unknown stream overflow policy: %s" % (self.__overflow_policy,))
+            self.queue.append(item)
+            self.__not_empty.notify()
+
+    def get(self, block: bool = True):
+        """
+        Removes and returns the oldest item in the queue.
+        """
+        with self.__lock:
+            while len(self.queue) == 0 and self.__spill_size == 0:
+                if not block:
+                    raise Empty()
+                self.__not_empty.wait()
+            if len(self.queue) == 0:
+                self.__load_spilled_items()
+            item = self.queue.popleft()
+            self.__not_full.notify()
+            return item
+
+    def qsize(self):
+        with self.__lock:
+            return len(self.queue) + self.__spill_size
+
+    def has_spilled_items(self):
+        """
+        Returns True if some of the items currently stored in this queue reside on disk and False otherwise.
+        """
+        with self.__lock:
+            return self.__spill_size > 0
+
+    def __wait_until_not_full(self):
+        """
+        Blocks the calling thread until the consumer frees some space and updates the blocking statistics.
+        Must be called with the lock held.
+        """
+        start_time = time.monotonic()
+        while len(self.queue) >= self.__capacity:
+            self.__not_full.wait()
+        self.blocked_time += time.monotonic() - start_time
+        self.blocked_count += 1
+
+    def __spill(self, item: object):
+        """
+        Appends the given item to the spill file. Must be called with the lock held.
+        """
+        if self.__spill_file is None:
+            self.__spill_file = tempfile.TemporaryFile(dir=self.__spill_directory)
+        self.__spill_file.seek(self.__spill_write_offset)
+        pickle.dump(item, self.__spill_file)
+        self.__spill_write_offset = self.__spill_file.tell()
+        self.__spill_size += 1
+        self.spilled_items_count += 1
+        self.__not_empty.notify()
+
+    def __load_spilled_items(self):
+        """
+        Moves the oldest spilled items back to the (empty) in-memory buffer. Must be called with the lock held.
+        """
+        self.__spill_file.seek(self.__spill_read_offset)
+        while self.__spill_size > 0 and len(self.queue) < self.__capacity:
+            self.queue.append(pickle.load(self.__spill_file))
+            self.__spill_size -= 1
+        self.__spill_read_offset = self.__spill_file.tell()
+        if self.__spill_size == 0:
+            # the spill file is empty - reuse it from the beginning
+            self.__spill_file.seek(0)
+            self.__spill_file.truncate()
+            self.__spill_read_offset = self.__spill_write_offset = 0
+
+
+class BoundedStream(Stream):
+    """
+    A thread-safe stream holding at most a predefined number of items in memory.
+    Used to decouple a producer from a slower consumer without letting the memory consumption grow unboundedly.
+    The behavior upon overflow is specified by the overflow policy. For the SPILL policy, a spill directory can be
+    provided for the temporary files (the default temporary directory is used otherwise).
+    """
+    def __init__(self, capacity: int, overflow_policy: StreamOverflowPolicies = StreamOverflowPolicies.BLOCK,
+                 spill_directory: str = None):
+        super().__init__()
+        self._stream = BoundedQueue(capacity, overflow_policy, spill_directory)
+
+    def close(self):
+        # the end-of-stream marker must never be dropped or block the producer
+        self._stream.put(None, force=True)
+
+    def duplicate(self):
+        if self._stream.has_spilled_items():
+            raise Exception("Unsupported operation")
+        return super().duplicate()
+
+    def first(self):
+        if len(self._stream.queue) == 0 and self._stream.has_spilled_items():
+            raise Exception("Unsupported operation")
+        return super().first()
+
+    def last(self):
+        if self._stream.has_spilled_items():
+            raise Exception("Unsupported operation")
+        return super().last()
+
+    def get_blocked_time(self):
+        """
+        Returns the total time (in seconds) the producers of this stream spent waiting for free space.
+        """
+        return self._stream.blocked_time
+
+    def get_blocked_count(self):
+        """
+        Returns the number of times a producer of this stream was blocked due to the stream being full.
+        """
+        return self._stream.blocked_count
+
+    def get_dropped_items_count(self):
+        """
+        Returns the number of items discarded due to the stream being full.
+        """
+        return self._stream.dropped_items_count
+
+    def get_spilled_items_count(self):
+        """
+        Returns the total number of items written to disk due to the stream being full.
+        """
+        return self._stream.spilled_items_count
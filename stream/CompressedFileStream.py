@@ -0,0 +1,207 @@
+import bz2
+import gzip
+import lzma
+import threading
+from queue import Queue, Full
+
+from misc import DefaultConfig
+from stream.CompressionTypes import CompressionTypes
+from stream.Stream import InputStream
+
+_COMPRESSION_TYPES_BY_EXTENSION = {
+    ".gz": CompressionTypes.GZIP,
+    ".gzip": CompressionTypes.GZIP,
+    ".bz2": CompressionTypes.BZ2,
+    ".xz": CompressionTypes.XZ,
+    ".lzma": CompressionTypes.XZ,
+}
+
+_OPEN_FUNCTIONS = {
+    CompressionTypes.GZIP: gzip.open,
+    CompressionTypes.BZ2: bz2.open,
+    CompressionTypes.XZ: lzma.open,
+}
+
+# the interval (in seconds) in which a blocked decoding thread checks whether the stream was closed
+_DECODER_STOP_CHECK_INTERVAL = 0.1
+
+
+def is_compressed_file(file_path: str):
+    """
+    Returns True if the extension of the given file corresponds to one of the supported compression types and False
+    otherwise.
+    """
+    return any(file_path.lower().endswith(extension) for extension in _COMPRESSION_TYPES_BY_EXTENSION)
+
+
+class CompressedFileInputStream(InputStream):
+    """
+    Reads the objects from a compressed input file, one line at a time.
+    If the compression type is not specified, it is deduced from the file extension.
+    The file is decompressed incrementally by a background thread, which stays a few chunks of lines ahead of the
+    consumer. This way, the decompression overlaps with the evaluation, while the memory consumption is bounded by
+    chunk_size * prefetched_chunks_number lines.
+    Since the position in a compressed file cannot be efficiently restored, the position of this stream is tracked as
+    the number of lines read so far. first(), last(), count() and duplicate() are relative to this position.
+    """
+    def __init__(self, file_path: str, compression_type: CompressionTypes = None, start_line: int = 0,
+                 chunk_size: int = DefaultConfig.DEFAULT_COMPRESSED_STREAM_CHUNK_SIZE,
+                 prefetched_chunks_number: int = DefaultConfig.DEFAULT_COMPRESSED_STREAM_PREFETCHED_CHUNKS_NUMBER):
+        super().__init__(is_thread_safe=False)
+        if compression_type is None:
+            compression_type = self.__get_compression_type_by_extension(file_path)
+        # opening the file here makes sure that errors such as a missing file are reported immediately
+        open(file_path, "rb").close()
+        self.__file_path = file_path
+        self.__compression_type = compression_type
+        self.__chunk_size = chunk_size
+        self.__prefetched_chunks_number = prefetched_chunks_number
+        self.__lines_read = start_line
+        self.__is_exhausted = False
+        # the decoding thread is only started upon the first access to the stream
+        self.__decoder = None
+        self.__chunks = None
+        self.__stop_event = threading.Event()
+        self.__current_chunk = []
+        self.__current_chunk_index = 0
+
+    def __next__(self):
+        if self.__current_chunk_index >= len(self.__current_chunk):
+            self.__read_next_chunk()
+        line = self.__current_chunk[self.__current_chunk_index]
+        self.__current_chunk_index += 1
+        self.__lines_read += 1
+        return line
+
+    def close(self):
+        """
+        Stops the decoding thread and marks the stream as exhausted.
+        """
+        self.__stop_event.set()
+        if self.__decoder is not None:
+            self.__decoder.join()
+            self.__decoder = None
+        self.__current_chunk = []
+        self.__current_chunk_index = 0
+        self.__is_exhausted = True
+
+    def duplicate(self):
+        """
+        Returns a new stream replaying the file from the current position of this stream.
+        """
+        start_line = self.__lines_read
+        if self.__is_exhausted:
+            # the stream might have been closed before reaching the end of the file
+            start_line += sum(1 for _ in self.__lines_after_current_position())
+        return CompressedFileInputStream(self.__file_path, self.__compression_type, start_line,
+                                         self.__chunk_size, self.__prefetched_chunks_number)
+
+    def count(self):
+        """
+        Returns the number of lines that were not yet read from the file.
+        """
+        return sum(1 for _ in self.__remaining_lines())
+
+    def first(self):
+        return next(self.__remaining_lines(), None)
+
+    def last(self):
+        last_line = None
+        for line in self.__remaining_lines():
+            last_line = line
+        return last_line
+
+    def __read_next_chunk(self):
+        """
+        Replaces the current (fully consumed) chunk with the next chunk produced by the decoding thread.
+        """
+        if self.__is_exhausted:
+            raise StopIteration()
+        if self.__decoder is None:
+            self.__start_decoder()
+        chunk = self.__chunks.get()
+        if isinstance(chunk, Exception):
+            self.close()
+            raise chunk
+        if chunk is None:
+            self.close()
+            raise StopIteration()
+        self.__current_chunk = chunk
+        self.__current_chunk_index = 0
+
+    def __start_decoder(self):
+        """
+        Creates and starts the background thread decompressing the file.
+        """
+        self.__chunks = Queue(maxsize=self.__prefetched_chunks_number)
+        self.__decoder = threading.Thread(target=self.__decode, args=(self.__lines_read,), daemon=True)
+        self.__decoder.start()
+
+    def __decode(self, lines_to_skip: int):
+        """
+        The routine of the decoding thread. Splits the decompressed content of the file into chunks of lines and
+        passes them to the consumer. The end of the file is signaled by None.
+        """
+        try:
+            with self.__open() as f:
+                chunk = []
+                for line in f:
+                    if lines_to_skip > 0:
+                        lines_to_skip -= 1
+                        continue
+                    chunk.append(line)
+                    if len(chunk) >= self.__chunk_size:
+                        if not self.__put_chunk(chunk):
+                            return
+                        chunk = []
+                if len(chunk) > 0 and not self.__put_chunk(chunk):
+                    return
+            self.__put_chunk(None)
+        except Exception as e:
+            self.__put_chunk(e)
+
+    def __put_chunk(self, chunk):
+        """
+        Passes the given chunk to the consumer, waiting for free space if necessary. Returns False if the stream was
+        closed in the meantime and True otherwise.
+        """
+        while not self.__stop_event.is_set():
+            try:
+                self.__chunks.put(chunk, timeout=_DECODER_STOP_CHECK_INTERVAL)
+                return True
+            except Full:
+                continue
+        return False
+
+    def __open(self):
+        """
+        Opens the file for reading the decompressed text.
+        """
+        return _OPEN_FUNCTIONS[self.__compression_type](self.__file_path, "rt")
+
+    def __remaining_lines(self):
+        """
+        Returns an iterator over the lines that were not yet read from the file without affecting the stream position.
+        """
+        if self.__is_exhausted:
+            return iter(())
+        return self.__lines_after_current_position()
+
+    def __lines_after_current_position(self):
+        """
+        A generator scanning the file starting from the current position of the stream using a separate decoder.
+        """
+        with self.__open() as f:
+            for line_index, line in enumerate(f):
+                if line_index >= self.__lines_read:
+                    yield line
+
+    @staticmethod
+    def __get_compression_type_by_extension(file_path: str):
+        """
+        Deduces the compression type from the extension of the given file.
+        """
+        for extension, compression_type in _COMPRESSION_TYPES_BY_EXTENSION.items():
+            if file_path.lower().endswith(extension):
+                return compression_type
+        raise Exception("Cannot deduce the compression type of %s from its extension" % (file_path,))
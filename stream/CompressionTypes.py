@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class CompressionTypes(Enum):
+    """
+    The compression formats supported by the compressed file input stream.
+    """
+    GZIP = 0
+    BZ2 = 1
+    XZ = 2
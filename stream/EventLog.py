@@ -0,0 +1,155 @@
+"""
+This file contains the implementation of a read-only event log which can be replayed any number of times, possibly
+simultaneously, by independent cursors. Unlike Stream.duplicate(), creating a new cursor does not copy the events.
+"""
+import mmap
+import os
+from abc import ABC
+from array import array
+from typing import List
+
+from stream.Stream import InputStream
+
+
+class EventLog(ABC):
+    """
+    An abstract read-only sequence of raw events shared by any number of readers.
+    The events are read using cursors, each maintaining its own position in the log.
+    """
+    def __len__(self):
+        """
+        Returns the number of events in this log.
+        """
+        raise NotImplementedError()
+
+    def __getitem__(self, index: int):
+        """
+        Returns the event at the given position in this log.
+        """
+        raise NotImplementedError()
+
+    def create_cursor(self, start_index: int = 0):
+        """
+        Returns a new input stream reading the events of this log starting from the given index.
+        """
+        return EventLogCursor(self, start_index)
+
+    def close(self):
+        """
+        Releases the resources held by this log. The log must not be accessed afterwards.
+        """
+        pass
+
+
+class ListEventLog(EventLog):
+    """
+    An event log backed by a list of events held in memory. The given list is neither copied nor modified.
+    """
+    def __init__(self, items: List[object]):
+        self.__items = items
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __getitem__(self, index: int):
+        return self.__items[index]
+
+
+class FileEventLog(EventLog):
+    """
+    An event log consisting of the lines of a file.
+    The file is memory-mapped, such that all the cursors (and all the logs created for the same file) share the
+    operating system page cache instead of holding private copies of the lines. Upon creation, the file is scanned once
+    to build an index of the line offsets. Then, each line is only decoded when read by a cursor.
+    """
+    def __init__(self, file_path: str):
+        self.__file = open(file_path, "rb")
+        # an empty file cannot be memory-mapped
+        self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ) \
+            if os.fstat(self.__file.fileno()).st_size > 0 else b""
+        self.__line_offsets = self.__index_lines()
+
+    def __len__(self):
+        return len(self.__line_offsets) - 1
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Event log index out of range: %s" % (index,))
+        line = self.__data[self.__line_offsets[index]:self.__line_offsets[index + 1]].decode("utf-8")
+        # the line separators are normalized the same way as for a file opened in text mode
+        if line.endswith("\r\n"):
+            line = line[:-2] + "\n"
+        return line
+
+    def close(self):
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+        self.__file.close()
+
+    def __index_lines(self):
+        """
+        Returns the start offsets of all lines in the file, followed by the size of the file.
+        """
+        line_offsets = array("Q", [0])
+        data = self.__data
+        data_size = len(data)
+        find = data.find
+        offset = find(b"\n")
+        while offset >= 0:
+            line_offsets.append(offset + 1)
+            offset = find(b"\n", offset + 1)
+        if line_offsets[-1] != data_size:
+            # the last line is not terminated by a line separator
+            line_offsets.append(data_size)
+        return line_offsets
+
+
+class EventLogCursor(InputStream):
+    """
+    An input stream reading the events of an event log from a given position.
+    Cursors are independent of one another: reading from a cursor only advances its own position. As opposed to other
+    streams, duplicate(), first(), last() and count() take constant time and do not copy any events.
+    """
+    def __init__(self, event_log: EventLog, start_index: int = 0):
+        super().__init__(is_thread_safe=False)
+        self.__event_log = event_log
+        self.__position = min(start_index, len(event_log))
+
+    def __next__(self):
+        if self.__position >= len(self.__event_log):
+            raise StopIteration()
+        item = self.__event_log[self.__position]
+        self.__position += 1
+        return item
+
+    def close(self):
+        """
+        Moves the cursor to the end of the log. The log itself remains open for the other cursors.
+        """
+        self.__position = len(self.__event_log)
+
+    def duplicate(self):
+        """
+        Returns a new cursor pointing to the current position of this cursor.
+        """
+        return EventLogCursor(self.__event_log, self.__position)
+
+    def count(self):
+        """
+        Returns the number of events that were not yet read by this cursor.
+        """
+        return len(self.__event_log) - self.__position
+
+    def first(self):
+        return self.__event_log[self.__position] if self.count() > 0 else None
+
+    def last(self):
+        return self.__event_log[-1] if self.count() > 0 else None
+
+    def get_position(self):
+        """
+        Returns the index of the next event to be read by this cursor.
+        """
+        return self.__position
@@ -1,52 +1,194 @@
 import os
+import time
 
+from stream.MatchSerializer import MatchSerializer, StringMatchSerializer
 from stream.Stream import InputStream, OutputStream
 
 
 class FileInputStream(InputStream):
     """
     Reads the objects from a predefined input file.
+    By default, the file is read lazily, one line at a time, so that the memory consumption of the stream does not
+    depend on the size of the input file. Setting is_lazy to False loads the entire content of the file into memory
+    upon creation of the stream.
+    A lazy stream never materializes the file content - instead, it keeps track of its current position in the file.
+    first(), last() and count() scan the file from this position using a separate file handle, and duplicate() creates
+    a new stream replaying the file from this position.
     """
-    def __init__(self, file_path: str):
-        super().__init__()
-        # TODO: reading the entire content of the input file here is very inefficient
-        with open(file_path, "r") as f:
-            for line in f.readlines():
-                self._stream.put(line)
-        self.close()
+    def __init__(self, file_path: str, is_lazy: bool = True, start_offset: int = 0):
+        # in the eager mode, the buffer is filled and closed before it can be accessed by any other thread
+        super().__init__(is_thread_safe=False)
+        self.__file_path = file_path
+        self.__is_lazy = is_lazy
+        if not self.__is_lazy:
+            with open(file_path, "r") as f:
+                f.seek(start_offset)
+                for line in f:
+                    self._stream.put(line)
+            self.close()
+            return
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError("No such file: %s" % (file_path,))
+        # the file is only opened upon the first access to the stream
+        self.__file = None
+        self.__offset = start_offset
+        self.__is_exhausted = False
+
+    def __next__(self):
+        if not self.__is_lazy:
+            return super().__next__()
+        if self.__file is None:
+            if self.__is_exhausted:
+                raise StopIteration()
+            self.__file = open(self.__file_path, "r")
+            self.__file.seek(self.__offset)
+        # readline() is used instead of the file iterator since the latter disables tell()
+        line = self.__file.readline()
+        if line == "":
+            self.close()
+            raise StopIteration()
+        return line
+
+    def close(self):
+        """
+        For a lazy stream, stops reading the file and releases the file handle.
+        """
+        if not self.__is_lazy:
+            super().close()
+            return
+        if self.__file is not None:
+            self.__offset = self.__file.tell()
+            self.__file.close()
+            self.__file = None
+        self.__is_exhausted = True
+
+    def duplicate(self):
+        """
+        For a lazy stream, returns a new stream replaying the file from the current position of this stream.
+        """
+        if not self.__is_lazy:
+            return super().duplicate()
+        if self.__is_exhausted:
+            return FileInputStream(self.__file_path, True, os.path.getsize(self.__file_path))
+        return FileInputStream(self.__file_path, True, self.__get_current_offset())
+
+    def count(self):
+        """
+        For a lazy stream, returns the number of lines that were not yet read from the file.
+        """
+        if not self.__is_lazy:
+            return super().count()
+        return sum(1 for _ in self.__remaining_lines())
+
+    def first(self):
+        if not self.__is_lazy:
+            return super().first()
+        return next(self.__remaining_lines(), None)
+
+    def last(self):
+        if not self.__is_lazy:
+            return super().last()
+        last_line = None
+        for line in self.__remaining_lines():
+            last_line = line
+        return last_line
+
+    def __get_current_offset(self):
+        """
+        Returns the position in the file from which the next line will be read.
+        """
+        return self.__offset if self.__file is None else self.__file.tell()
+
+    def __remaining_lines(self):
+        """
+        A generator scanning the lines that were not yet read from the file without affecting the stream position.
+        """
+        if self.__is_exhausted:
+            return
+        with open(self.__file_path, "r") as f:
+            f.seek(self.__get_current_offset())
+            for line in f:
+                yield line
 
 
 class FileOutputStream(OutputStream):
     """
     Writes the objects into a predefined output file.
+    By default, the objects are kept in memory and only written to the file upon closing the stream. In the
+    asynchronous mode, each object is written to the file immediately upon arrival.
+    Setting flush_size and/or flush_interval enables the buffered mode, in which the objects are accumulated in a buffer
+    and written to the file in a single operation once the buffer contains flush_size objects or flush_interval seconds
+    have passed since the last write. The time interval is only checked upon arrival of a new object. In this mode, the
+    memory consumption of the stream is bounded while the objects still reach the file continuously.
+    The format in which the objects are written is determined by the given serializer. By default, the string
+    representation of an object is used.
     """
-    def __init__(self, base_path: str, file_name: str, is_async: bool = False):
-        super().__init__()
+    def __init__(self, base_path: str, file_name: str, is_async: bool = False, serializer: MatchSerializer = None,
+                 flush_size: int = None, flush_interval: float = None):
+        # the buffered matches are only read back by close(), which is invoked by the thread producing them
+        super().__init__(is_thread_safe=False)
+        if flush_size is not None and flush_size <= 0:
+            raise Exception("flush_size must be positive number, got %s" % (flush_size,))
         if not os.path.exists(base_path):
             os.makedirs(base_path, exist_ok=True)
         self.__is_async = is_async
+        self.__is_buffered = flush_size is not None or flush_interval is not None
+        self.__serializer = serializer if serializer is not None else StringMatchSerializer()
         self.__output_path = os.path.join(base_path, file_name)
-        if self.__is_async:
+        if self.__is_async or self.__is_buffered:
             self.__output_file = open(self.__output_path, 'w')
         else:
             self.__output_file = None
+        self.__flush_size = flush_size
+        self.__flush_interval = flush_interval
+        self.__write_buffer = []
+        self.__last_flush_time = time.monotonic()
 
     def add_item(self, item: object):
         """
-        Depending on the settings, either writes the item to the file immediately or buffers it for future write.
+        Depending on the settings, either writes the item to the file immediately, adds it to the write buffer, or
+        keeps it in memory until the stream is closed.
         """
-        if self.__is_async:
-            self.__output_file.write(str(item))
+        if self.__is_buffered:
+            self.__write_buffer.append(self.__serializer.serialize(item))
+            if self.__should_flush():
+                self.flush()
+        elif self.__is_async:
+            self.__output_file.write(self.__serializer.serialize(item))
         else:
             super().add_item(item)
 
+    def flush(self):
+        """
+        In the buffered mode, writes the content of the write buffer to the file.
+        """
+        if not self.__is_buffered:
+            return
+        if len(self.__write_buffer) > 0:
+            self.__output_file.write("".join(self.__write_buffer))
+            self.__write_buffer.clear()
+        self.__output_file.flush()
+        self.__last_flush_time = time.monotonic()
+
     def close(self):
         """
-        If asynchronous write is disabled, writes everything to the output file before closing it.
+        Writes all pending items to the output file before closing it.
         """
-        super().close()
-        if not self.__is_async:
+        if self.__is_buffered:
+            self.flush()
+        else:
+            super().close()
+        if not self.__is_async and not self.__is_buffered:
             self.__output_file = open(self.__output_path, 'w')
             for item in self:
-                self.__output_file.write(str(item))
+                self.__output_file.write(self.__serializer.serialize(item))
         self.__output_file.close()
+
+    def __should_flush(self):
+        """
+        Returns True if the write buffer is to be written to the file and False otherwise.
+        """
+        if self.__flush_size is not None and len(self.__write_buffer) >= self.__flush_size:
+            return True
+        return self.__flush_interval is not None and \
+            time.monotonic() - self.__last_flush_time >= self.__flush_interval
@@ -0,0 +1,179 @@
+import os
+import threading
+import time
+
+from misc import DefaultConfig
+from stream.Stream import InputStream
+
+_READ_BLOCK_SIZE = 1 << 16
+_LINE_SEPARATOR = b"\n"
+
+
+class FollowedFileInputStream(InputStream):
+    """
+    Reads the lines of a file which is continuously appended to by another process, similarly to 'tail -f'.
+    Instead of ending at the end of the file, the stream keeps the file open and polls it for new data. The waiting time
+    between subsequent polls starts at min_poll_interval and is doubled after each poll finding no new data, up to
+    max_poll_interval. Whenever new data is found, all the complete lines appended to the file are read at once.
+    A line is only returned once its terminating line separator is written.
+    The stream handles log rotation: if the file is replaced by a new one, the remainder of the old file is read and the
+    stream proceeds to the new file; if the file is truncated, it is reread from its beginning.
+    The stream ends once stop() is called (possibly from another thread) or if no new data arrives for idle_timeout
+    seconds. A pending unterminated line is returned before the stream ends.
+    By default, the file is read from its beginning. If start_at_end is set, only the lines appended after the creation
+    of the stream are read.
+    Since the content of the file is not known in advance, first(), last(), count() and duplicate() are not supported.
+    """
+    def __init__(self, file_path: str, start_at_end: bool = False, idle_timeout: float = None,
+                 min_poll_interval: float = DefaultConfig.DEFAULT_FOLLOWED_FILE_MIN_POLL_INTERVAL,
+                 max_poll_interval: float = DefaultConfig.DEFAULT_FOLLOWED_FILE_MAX_POLL_INTERVAL):
+        super().__init__(is_thread_safe=False)
+        if min_poll_interval <= 0 or max_poll_interval < min_poll_interval:
+            raise Exception("Invalid poll intervals: %s, %s" % (min_poll_interval, max_poll_interval))
+        self.__file_path = file_path
+        self.__idle_timeout = idle_timeout
+        self.__min_poll_interval = min_poll_interval
+        self.__max_poll_interval = max_poll_interval
+        self.__file = open(file_path, "rb")
+        if start_at_end:
+            self.__file.seek(0, os.SEEK_END)
+        self.__stop_event = threading.Event()
+        self.__is_exhausted = False
+        self.__partial_line = b""
+        self.__lines = []
+        self.__next_line_index = 0
+        self.__rotations_count = 0
+
+    def __next__(self):
+        while self.__next_line_index >= len(self.__lines):
+            self.__wait_for_lines()
+        line = self.__lines[self.__next_line_index]
+        self.__next_line_index += 1
+        return line
+
+    def stop(self):
+        """
+        Makes the stream end after the lines already appended to the file are read. Can be called from any thread.
+        """
+        self.__stop_event.set()
+
+    def close(self):
+        """
+        Stops reading the file and releases the file handle.
+        """
+        self.__stop_event.set()
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+        self.__lines = []
+        self.__next_line_index = 0
+        self.__is_exhausted = True
+
+    def duplicate(self):
+        raise Exception("Unsupported operation")
+
+    def count(self):
+        raise Exception("Unsupported operation")
+
+    def first(self):
+        raise Exception("Unsupported operation")
+
+    def last(self):
+        raise Exception("Unsupported operation")
+
+    def get_rotations_count(self):
+        """
+        Returns the number of times the file was rotated or truncated while being followed.
+        """
+        return self.__rotations_count
+
+    def __wait_for_lines(self):
+        """
+        Polls the file until at least one new complete line is available or the stream ends.
+        """
+        if self.__is_exhausted:
+            raise StopIteration()
+        poll_interval = self.__min_poll_interval
+        last_data_time = time.monotonic()
+        while True:
+            # the stop flag is checked before reading, so that the data written before stop() was called is not lost
+            is_stopped = self.__stop_event.is_set()
+            if self.__read_lines() or self.__handle_rotation():
+                if self.__next_line_index < len(self.__lines):
+                    return
+                # only a part of a line was read - keep waiting for its end without backing off
+                poll_interval = self.__min_poll_interval
+                last_data_time = time.monotonic()
+                continue
+            if is_stopped or (self.__idle_timeout is not None and
+                              time.monotonic() - last_data_time >= self.__idle_timeout):
+                self.__finish()
+                return
+            if self.__idle_timeout is not None:
+                poll_interval = min(poll_interval, max(0.0, last_data_time + self.__idle_timeout - time.monotonic()))
+            self.__stop_event.wait(poll_interval)
+            poll_interval = min(poll_interval * 2, self.__max_poll_interval)
+
+    def __read_lines(self):
+        """
+        Reads all the data appended to the file since the last read and splits the complete lines. Returns True if any
+        new data was read and False otherwise.
+        """
+        data = self.__file.read(_READ_BLOCK_SIZE)
+        if len(data) == 0:
+            return False
+        blocks = [self.__partial_line, data]
+        while len(data) == _READ_BLOCK_SIZE:
+            data = self.__file.read(_READ_BLOCK_SIZE)
+            blocks.append(data)
+        data = b"".join(blocks)
+        last_separator_index = data.rfind(_LINE_SEPARATOR)
+        if last_separator_index < 0:
+            self.__partial_line = data
+            return True
+        self.__partial_line = data[last_separator_index + 1:]
+        lines = data[:last_separator_index].decode("utf-8").split("\n")
+        self.__lines = [line + "\n" for line in lines]
+        self.__next_line_index = 0
+        return True
+
+    def __handle_rotation(self):
+        """
+        Checks whether the followed file was replaced or truncated and, if so, reopens it or rewinds it, respectively.
+        The old content is assumed to be fully read at this point. Returns True if the file was reopened or rewound and
+        False otherwise.
+        """
+        try:
+            path_stat = os.stat(self.__file_path)
+        except FileNotFoundError:
+            # the file was moved and its replacement is not yet created
+            return False
+        file_stat = os.fstat(self.__file.fileno())
+        is_replaced = (path_stat.st_ino, path_stat.st_dev) != (file_stat.st_ino, file_stat.st_dev)
+        is_truncated = not is_replaced and path_stat.st_size < self.__file.tell()
+        if not is_replaced and not is_truncated:
+            return False
+        if is_replaced:
+            self.__file.close()
+            self.__file = open(self.__file_path, "rb")
+            # nothing is appended to the old file anymore, hence its unterminated last line is complete
+            if len(self.__partial_line) > 0:
+                self.__lines = [self.__partial_line.decode("utf-8")]
+                self.__next_line_index = 0
+        else:
+            # a partial line of the truncated content will never be completed
+            self.__file.seek(0)
+        self.__partial_line = b""
+        self.__rotations_count += 1
+        return True
+
+    def __finish(self):
+        """
+        Ends the stream, leaving a pending unterminated line as the last one to be read.
+        """
+        last_line = self.__partial_line.decode("utf-8")
+        self.__partial_line = b""
+        self.close()
+        if len(last_line) == 0:
+            raise StopIteration()
+        self.__lines = [last_line]
@@ -0,0 +1,88 @@
+"""
+This file contains the serializers determining the format in which the pattern matches are written to an output stream.
+"""
+import csv
+import io
+import json
+from abc import ABC
+from typing import List
+
+from base.Event import Event
+from base.PatternMatch import PatternMatch
+
+
+class MatchSerializer(ABC):
+    """
+    An abstract class for converting a pattern match into its textual representation.
+    """
+    def serialize(self, match: PatternMatch):
+        """
+        Returns a string representing the given pattern match, including the terminating line separator.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def _get_primitive_events(events: List[Event]):
+        """
+        Returns the primitive events in the given list, replacing each aggregated event (created by a Kleene closure
+        operator) with the primitive events it consists of.
+        """
+        primitive_events = []
+        for event in events:
+            if hasattr(event, "primitive_events"):
+                primitive_events.extend(MatchSerializer._get_primitive_events(event.primitive_events))
+            else:
+                primitive_events.append(event)
+        return primitive_events
+
+    @staticmethod
+    def _get_visible_payload(event: Event):
+        """
+        Returns the attributes of the given event excluding the ones used internally by the system.
+        """
+        return {key: value for key, value in event.payload.items() if key not in Event.HIDDEN_ATTRIBUTE_NAMES}
+
+
+class StringMatchSerializer(MatchSerializer):
+    """
+    The default serializer, using the string representation of a pattern match.
+    """
+    def serialize(self, match: PatternMatch):
+        return str(match)
+
+
+class JSONLinesMatchSerializer(MatchSerializer):
+    """
+    Writes each pattern match as a single-line JSON object containing the IDs of the matched patterns and the index and
+    the attributes of each participating primitive event.
+    Attribute values that cannot be represented in JSON (e.g., timestamps) are written as strings.
+    """
+    def serialize(self, match: PatternMatch):
+        match_object = {
+            "pattern_ids": match.pattern_ids,
+            "events": [{"index": event.index,
+                        "payload": self._get_visible_payload(event)}
+                       for event in self._get_primitive_events(match.events)]
+        }
+        return json.dumps(match_object, separators=(",", ":"), default=str) + "\n"
+
+
+class CSVMatchSerializer(MatchSerializer):
+    """
+    Writes each pattern match as a sequence of CSV rows, one per participating primitive event. Each row contains the
+    serial number of the match, the IDs of the matched patterns separated by spaces, the index of the event and the
+    values of its attributes.
+    """
+    def __init__(self, delimiter: str = ","):
+        self.__delimiter = delimiter
+        self.__match_counter = 0
+
+    def serialize(self, match: PatternMatch):
+        output = io.StringIO()
+        writer = csv.writer(output, delimiter=self.__delimiter, lineterminator="\n")
+        pattern_ids = " ".join(str(pattern_id) for pattern_id in match.pattern_ids)
+        for event in self._get_primitive_events(match.events):
+            writer.writerow([self.__match_counter, pattern_ids, event.index] +
+                            list(self._get_visible_payload(event).values()))
+        self.__match_counter += 1
+        return output.getvalue()
@@ -0,0 +1,136 @@
+import glob
+import heapq
+from typing import List
+
+from base.DataFormatter import DataFormatter
+from stream.CompressedFileStream import CompressedFileInputStream, is_compressed_file
+from stream.FileStream import FileInputStream
+from stream.Stream import InputStream
+
+
+class MergedInputStream(InputStream):
+    """
+    Merges several input streams, each sorted by event timestamp, into a single stream sorted by event timestamp.
+    The timestamps are extracted from the raw items using the given data formatter (see
+    DataFormatter.get_raw_event_timestamp()). Events with equal timestamps are returned in the order of their streams
+    in the given list.
+    At any moment, only a single item per input stream is held by the merged stream. Thus, the memory consumption only
+    depends on the number of the input streams and not on their size.
+    """
+    def __init__(self, streams: List[InputStream], data_formatter: DataFormatter):
+        super().__init__(is_thread_safe=False)
+        self.__streams = streams
+        self.__data_formatter = data_formatter
+        # a heap containing the next unreturned item of each non-exhausted stream, initialized upon the first access
+        self.__heap = None
+
+    def __next__(self):
+        if self.__heap is None:
+            self.__init_heap()
+        if len(self.__heap) == 0:
+            raise StopIteration()
+        _, stream_index, item = self.__heap[0]
+        next_entry = self.__read_entry(stream_index)
+        if next_entry is None:
+            heapq.heappop(self.__heap)
+        else:
+            heapq.heapreplace(self.__heap, next_entry)
+        return item
+
+    def close(self):
+        """
+        Closes all the input streams.
+        """
+        for stream in self.__streams:
+            stream.close()
+        self.__heap = []
+
+    def duplicate(self):
+        """
+        Returns a new stream replaying the input streams from the current position of this stream.
+        """
+        ret = MergedInputStream([stream.duplicate() for stream in self.__streams], self.__data_formatter)
+        if self.__heap is not None:
+            ret.__heap = list(self.__heap)
+        return ret
+
+    def count(self):
+        pending_items_count = 0 if self.__heap is None else len(self.__heap)
+        return pending_items_count + sum(stream.count() for stream in self.__streams)
+
+    def first(self):
+        if self.__heap is None:
+            self.__init_heap()
+        return self.__heap[0][2] if len(self.__heap) > 0 else None
+
+    def last(self):
+        if self.__heap is None:
+            self.__init_heap()
+        last_entry = None
+        pending_entries = {entry[1]: entry for entry in self.__heap}
+        for stream_index, stream in enumerate(self.__streams):
+            # if a stream has no unread items, its last item is the pending one (if any)
+            last_item = stream.last()
+            if last_item is None:
+                entry = pending_entries.get(stream_index)
+            else:
+                entry = self.__create_entry(stream_index, last_item)
+            if entry is not None and (last_entry is None or entry[:2] > last_entry[:2]):
+                last_entry = entry
+        return None if last_entry is None else last_entry[2]
+
+    def __init_heap(self):
+        """
+        Reads the first item of each input stream.
+        """
+        self.__heap = []
+        for stream_index in range(len(self.__streams)):
+            entry = self.__read_entry(stream_index)
+            if entry is not None:
+                self.__heap.append(entry)
+        heapq.heapify(self.__heap)
+
+    def __read_entry(self, stream_index: int):
+        """
+        Reads the next item from the given input stream and returns the corresponding heap entry, or None if the
+        stream is exhausted.
+        """
+        try:
+            item = next(self.__streams[stream_index])
+        except StopIteration:
+            return None
+        return self.__create_entry(stream_index, item)
+
+    def __create_entry(self, stream_index: int, item: object):
+        """
+        Creates a heap entry for the given item. The stream index breaks the ties between equal timestamps and
+        prevents the items themselves from being compared.
+        """
+        timestamp = self.__data_formatter.get_raw_event_timestamp(item)
+        return timestamp, stream_index, item
+
+
+class MergedFileInputStream(MergedInputStream):
+    """
+    Reads the events from multiple input files, each sorted by event timestamp, and merges them into a single stream
+    sorted by event timestamp.
+    The files can be given either as a list of paths or as a glob pattern (e.g., "data/NASDAQ_*.txt"), in which case
+    the matching files are taken in the lexicographical order of their paths. Compressed files are supported as well.
+    All files are read lazily and simultaneously.
+    """
+    def __init__(self, file_paths: str or List[str], data_formatter: DataFormatter):
+        if isinstance(file_paths, str):
+            pattern = file_paths
+            file_paths = sorted(glob.glob(pattern))
+            if len(file_paths) == 0:
+                raise FileNotFoundError("No files match the pattern: %s" % (pattern,))
+        super().__init__([self.__create_file_stream(file_path) for file_path in file_paths], data_formatter)
+
+    @staticmethod
+    def __create_file_stream(file_path: str):
+        """
+        Creates an input stream reading the given file.
+        """
+        if is_compressed_file(file_path):
+            return CompressedFileInputStream(file_path)
+        return FileInputStream(file_path)
@@ -0,0 +1,110 @@
+import heapq
+from datetime import timedelta
+
+from base.DataFormatter import DataFormatter
+from stream.Stream import InputStream
+
+
+class ReorderedInputStream(InputStream):
+    """
+    Restores the timestamp order of an input stream whose events may arrive slightly out of order.
+    The events are buffered in a heap ordered by timestamp, which is extracted from the raw items using the given data
+    formatter (see DataFormatter.get_raw_event_timestamp()). The stream maintains a watermark - the latest timestamp
+    observed so far minus the given maximal delay - and only releases an event once its timestamp is not later than the
+    watermark, i.e., once no earlier event is expected to arrive. When the input stream is exhausted, the remaining
+    events are released in timestamp order. Events with equal timestamps are released in their arrival order.
+    An event arriving after a later event was already released (i.e., delayed by more than max_delay) cannot be placed
+    in order anymore and is discarded. The number of such late events is available via get_late_events_count().
+    The output of this stream is sorted by timestamp, as expected by the evaluation mechanisms.
+    """
+    def __init__(self, stream: InputStream, data_formatter: DataFormatter, max_delay: timedelta):
+        super().__init__(is_thread_safe=False)
+        if max_delay < timedelta(0):
+            raise Exception("Maximal delay must be non-negative, got %s" % (max_delay,))
+        self.__stream = stream
+        self.__data_formatter = data_formatter
+        self.__max_delay = max_delay
+        # the heap entries are (timestamp, arrival index, item) tuples
+        self.__heap = []
+        self.__arrived_events_count = 0
+        self.__max_timestamp = None
+        self.__last_released_timestamp = None
+        self.__late_events_count = 0
+        self.__is_input_exhausted = False
+
+    def __next__(self):
+        while not self.__is_input_exhausted:
+            if len(self.__heap) > 0 and self.__heap[0][0] <= self.__max_timestamp - self.__max_delay:
+                break
+            self.__read_next_item()
+        if len(self.__heap) == 0:
+            raise StopIteration()
+        timestamp, _, item = heapq.heappop(self.__heap)
+        self.__last_released_timestamp = timestamp
+        return item
+
+    def close(self):
+        """
+        Closes the input stream and discards the buffered events.
+        """
+        self.__stream.close()
+        self.__heap = []
+        self.__is_input_exhausted = True
+
+    def duplicate(self):
+        """
+        Returns a new stream replaying the events from the current position of this stream.
+        """
+        ret = ReorderedInputStream(self.__stream.duplicate(), self.__data_formatter, self.__max_delay)
+        ret.__heap = list(self.__heap)
+        ret.__arrived_events_count = self.__arrived_events_count
+        ret.__max_timestamp = self.__max_timestamp
+        ret.__last_released_timestamp = self.__last_released_timestamp
+        ret.__late_events_count = self.__late_events_count
+        ret.__is_input_exhausted = self.__is_input_exhausted
+        return ret
+
+    def count(self):
+        """
+        Returns the number of events that were not yet released, excluding the late events to be discarded.
+        """
+        return sum(1 for _ in self.duplicate())
+
+    def first(self):
+        return next(self.duplicate(), None)
+
+    def last(self):
+        last_item = None
+        for item in self.duplicate():
+            last_item = item
+        return last_item
+
+    def get_late_events_count(self):
+        """
+        Returns the number of events discarded so far due to arriving too late.
+        """
+        return self.__late_events_count
+
+    def get_buffered_events_count(self):
+        """
+        Returns the number of events currently held by this stream.
+        """
+        return len(self.__heap)
+
+    def __read_next_item(self):
+        """
+        Reads the next item from the input stream and adds it to the heap, unless it arrived too late.
+        """
+        try:
+            item = next(self.__stream)
+        except StopIteration:
+            self.__is_input_exhausted = True
+            return
+        timestamp = self.__data_formatter.get_raw_event_timestamp(item)
+        if self.__last_released_timestamp is not None and timestamp < self.__last_released_timestamp:
+            self.__late_events_count += 1
+            return
+        if self.__max_timestamp is None or timestamp > self.__max_timestamp:
+            self.__max_timestamp = timestamp
+        heapq.heappush(self.__heap, (timestamp, self.__arrived_events_count, item))
+        self.__arrived_events_count += 1
@@ -0,0 +1,324 @@
+"""
+This file contains a stream reading newline-delimited records from a TCP or a Unix domain socket, along with a local
+server replaying an event file over a socket. The latter can be used to measure the end-to-end ingestion throughput
+on a single machine.
+"""
+import os
+import socket
+import threading
+import time
+from typing import Tuple, Union
+
+from misc import DefaultConfig
+from stream.Stream import InputStream
+
+# a TCP address is specified as a (host, port) tuple and a Unix domain socket address as a file path
+SocketAddress = Union[Tuple[str, int], str]
+
+_RECORD_SEPARATOR = b"\n"
+_REPLAY_SEND_BUFFER_SIZE = 1 << 16
+# the interval (in seconds) in which a waiting replay server checks whether it was stopped
+_SERVER_STOP_CHECK_INTERVAL = 0.1
+
+
+def _create_socket(address: SocketAddress):
+    """
+    Creates a stream socket of the family matching the given address.
+    """
+    family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET
+    return socket.socket(family, socket.SOCK_STREAM)
+
+
+class SocketInputStream(InputStream):
+    """
+    Reads newline-delimited records (e.g., the lines of an event file) from a TCP or a Unix domain socket.
+    The data is received in blocks of receive_buffer_size bytes, such that a single recv call typically yields many
+    records. A record split between two blocks is kept in the buffer until its remainder arrives.
+    The connection is established upon the first access to the stream. If the connection cannot be established or is
+    broken, up to reconnect_attempts reconnections are attempted, waiting reconnect_interval seconds before the first
+    attempt and doubling the waiting time after each failure. A partially received record is discarded upon
+    reconnection. When the peer closes the connection, the stream ends, unless reconnect_on_close is set - in this case,
+    the stream only ends if the source cannot be reconnected to.
+    Since the records are received from a live source, first(), last(), count() and duplicate() are not supported.
+    """
+    def __init__(self, address: SocketAddress,
+                 receive_buffer_size: int = DefaultConfig.DEFAULT_SOCKET_RECEIVE_BUFFER_SIZE,
+                 reconnect_attempts: int = DefaultConfig.DEFAULT_SOCKET_RECONNECT_ATTEMPTS,
+                 reconnect_interval: float = DefaultConfig.DEFAULT_SOCKET_RECONNECT_INTERVAL,
+                 reconnect_on_close: bool = False):
+        super().__init__(is_thread_safe=False)
+        if receive_buffer_size <= 0:
+            raise Exception("Receive buffer size must be positive, got %s" % (receive_buffer_size,))
+        if reconnect_attempts < 0:
+            raise Exception("Reconnect attempts must be a non-negative number, got %s" % (reconnect_attempts,))
+        self.__address = address
+        self.__receive_buffer_size = receive_buffer_size
+        self.__reconnect_attempts = reconnect_attempts
+        self.__reconnect_interval = reconnect_interval
+        self.__reconnect_on_close = reconnect_on_close
+        self.__socket = None
+        self.__is_exhausted = False
+        # the incomplete record received so far
+        self.__partial_record = b""
+        self.__records = []
+        self.__next_record_index = 0
+        self.__reconnections_count = 0
+
+    def __next__(self):
+        while self.__next_record_index >= len(self.__records):
+            self.__receive_records()
+        record = self.__records[self.__next_record_index]
+        self.__next_record_index += 1
+        return record
+
+    def close(self):
+        """
+        Disconnects from the source and marks the stream as exhausted.
+        """
+        self.__disconnect()
+        self.__records = []
+        self.__next_record_index = 0
+        self.__is_exhausted = True
+
+    def duplicate(self):
+        raise Exception("Unsupported operation")
+
+    def count(self):
+        raise Exception("Unsupported operation")
+
+    def first(self):
+        raise Exception("Unsupported operation")
+
+    def last(self):
+        raise Exception("Unsupported operation")
+
+    def get_reconnections_count(self):
+        """
+        Returns the number of times the connection to the source was reestablished.
+        """
+        return self.__reconnections_count
+
+    def __receive_records(self):
+        """
+        Receives the next block of data from the socket and splits it into records.
+        """
+        if self.__is_exhausted:
+            raise StopIteration()
+        if self.__socket is None:
+            self.__connect()
+        try:
+            data = self.__socket.recv(self.__receive_buffer_size)
+        except OSError:
+            self.__reconnect(is_closed_by_peer=False)
+            return
+        if len(data) == 0:
+            self.__handle_closed_connection()
+            return
+        data = self.__partial_record + data
+        last_separator_index = data.rfind(_RECORD_SEPARATOR)
+        if last_separator_index < 0:
+            self.__partial_record = data
+            return
+        self.__partial_record = data[last_separator_index + 1:]
+        # the records are decoded all at once, keeping the separators as the lines read from a file do
+        records = data[:last_separator_index].decode("utf-8").split("\n")
+        self.__records = [record + "\n" for record in records]
+        self.__next_record_index = 0
+
+    def __handle_closed_connection(self):
+        """
+        Handles the closing of the connection by the peer.
+        """
+        if self.__reconnect_on_close:
+            self.__reconnect(is_closed_by_peer=True)
+            return
+        # a last record which is not terminated by a separator is still a valid record
+        last_record = self.__partial_record.decode("utf-8")
+        self.close()
+        if len(last_record) > 0:
+            # the stream is already exhausted, but the last record can still be read
+            self.__records = [last_record]
+            return
+        raise StopIteration()
+
+    def __connect(self):
+        """
+        Connects to the source, retrying if necessary. Raises the last connection error if all attempts fail.
+        """
+        interval = self.__reconnect_interval
+        for attempt in range(self.__reconnect_attempts + 1):
+            if attempt > 0:
+                time.sleep(interval)
+                interval *= 2
+            new_socket = _create_socket(self.__address)
+            try:
+                new_socket.connect(self.__address)
+            except OSError as e:
+                new_socket.close()
+                last_error = e
+                continue
+            self.__socket = new_socket
+            return
+        raise last_error
+
+    def __reconnect(self, is_closed_by_peer: bool):
+        """
+        Replaces a broken or closed connection with a new one. If the source cannot be reconnected to, the stream ends
+        if the connection was closed by the peer and the connection error is raised otherwise.
+        """
+        self.__disconnect()
+        self.__partial_record = b""
+        try:
+            self.__connect()
+        except OSError:
+            if not is_closed_by_peer:
+                raise
+            self.close()
+            raise StopIteration()
+        self.__reconnections_count += 1
+
+    def __disconnect(self):
+        """
+        Closes the current connection, if any.
+        """
+        if self.__socket is not None:
+            self.__socket.close()
+            self.__socket = None
+
+
+class SocketReplayServer:
+    """
+    A local server streaming the lines of a given file to each client connecting to it, one client at a time.
+    The lines are sent at the given rate (in lines per second) or as fast as possible if no rate is specified. After
+    the last line is sent, the connection is closed and the next client is accepted. Up to connections_number clients
+    are served (an unlimited number if not specified).
+    Specifying port 0 in a TCP address binds the server to an arbitrary free port, which can be retrieved using
+    get_address().
+    """
+    def __init__(self, file_path: str, address: SocketAddress = ("127.0.0.1", 0), rate: float = None,
+                 connections_number: int = None):
+        if rate is not None and rate <= 0:
+            raise Exception("Replay rate must be positive, got %s" % (rate,))
+        if not os.path.isfile(file_path):
+            raise FileNotFoundError("No such file: %s" % (file_path,))
+        self.__file_path = file_path
+        self.__rate = rate
+        self.__connections_number = connections_number
+        self.__server_socket = _create_socket(address)
+        if not isinstance(address, str):
+            self.__server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.__server_socket.bind(address)
+        self.__server_socket.listen()
+        self.__server_socket.settimeout(_SERVER_STOP_CHECK_INTERVAL)
+        self.__address = self.__server_socket.getsockname()
+        self.__stop_event = threading.Event()
+        self.__thread = None
+        self.__sent_lines_count = 0
+
+    def start(self):
+        """
+        Starts serving the clients in a background thread.
+        """
+        self.__thread = threading.Thread(target=self.__serve, daemon=True)
+        self.__thread.start()
+
+    def stop(self):
+        """
+        Stops the server, disconnecting the currently served client.
+        """
+        self.__stop_event.set()
+        if self.__thread is not None:
+            self.__thread.join()
+            self.__thread = None
+        self.__close_server_socket()
+
+    def join(self):
+        """
+        Waits until the server finishes serving the specified number of clients.
+        """
+        if self.__thread is not None:
+            self.__thread.join()
+
+    def get_address(self):
+        """
+        Returns the address the server is listening on.
+        """
+        return self.__address
+
+    def get_sent_lines_count(self):
+        """
+        Returns the total number of lines sent to the clients.
+        """
+        return self.__sent_lines_count
+
+    def __serve(self):
+        """
+        The routine of the server thread.
+        """
+        served_connections_count = 0
+        while not self.__stop_event.is_set():
+            if self.__connections_number is not None and served_connections_count >= self.__connections_number:
+                break
+            try:
+                connection, _ = self.__server_socket.accept()
+            except socket.timeout:
+                continue
+            served_connections_count += 1
+            with connection:
+                try:
+                    self.__replay(connection)
+                except OSError:
+                    # the client disconnected - proceed to the next one
+                    pass
+        self.__close_server_socket()
+
+    def __replay(self, connection: socket.socket):
+        """
+        Sends the lines of the file over the given connection, respecting the replay rate.
+        """
+        connection.settimeout(None)
+        # when a rate is specified, the lines are sent in small batches to keep the rate smooth
+        lines_per_send = None if self.__rate is None else max(1, int(self.__rate / 100))
+        start_time = time.monotonic()
+        lines_sent_on_connection = 0
+        buffer = []
+        buffer_size = 0
+        with open(self.__file_path, "rb") as f:
+            for line in f:
+                if self.__stop_event.is_set():
+                    return
+                if not line.endswith(_RECORD_SEPARATOR):
+                    line += _RECORD_SEPARATOR
+                buffer.append(line)
+                buffer_size += len(line)
+                if lines_per_send is None and buffer_size < _REPLAY_SEND_BUFFER_SIZE:
+                    continue
+                if lines_per_send is not None and len(buffer) < lines_per_send:
+                    continue
+                lines_sent_on_connection += len(buffer)
+                self.__send(connection, buffer)
+                buffer, buffer_size = [], 0
+                if self.__rate is not None:
+                    delay = start_time + lines_sent_on_connection / self.__rate - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+        self.__send(connection, buffer)
+
+    def __send(self, connection: socket.socket, lines: list):
+        """
+        Sends the given lines over the given connection.
+        """
+        if len(lines) == 0:
+            return
+        connection.sendall(b"".join(lines))
+        self.__sent_lines_count += len(lines)
+
+    def __close_server_socket(self):
+        """
+        Closes the listening socket, removing the socket file in case of a Unix domain socket.
+        """
+        if self.__server_socket.fileno() < 0:
+            return
+        self.__server_socket.close()
+        if isinstance(self.__address, str) and os.path.exists(self.__address):
+            os.unlink(self.__address)
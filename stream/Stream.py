@@ -1,12 +1,39 @@
+from collections import deque
 from queue import Queue
 
 
+class UnsynchronizedQueue:
+    """
+    A lightweight replacement for queue.Queue to be used when a stream is only accessed by a single thread.
+    Implements the subset of the queue.Queue API used by the streams on top of a plain deque, avoiding the cost of
+    acquiring a lock and notifying a condition variable upon every operation.
+    """
+    def __init__(self):
+        self.queue = deque()
+
+    def put(self, item: object):
+        self.queue.append(item)
+
+    def get(self, block: bool = True):
+        if len(self.queue) == 0:
+            # no other thread could ever add an item - blocking would result in a deadlock
+            raise Exception("Attempted to read from an empty non-thread-safe stream")
+        return self.queue.popleft()
+
+    def qsize(self):
+        return len(self.queue)
+
+
 class Stream:
     """
     Represents a generic stream of objects.
+    By default, a stream is thread-safe and can be used to pass items between threads. A stream that is only accessed
+    by a single thread (e.g., when no parallel execution is configured) can be created with is_thread_safe set to False
+    to avoid the synchronization overhead.
     """
-    def __init__(self):
-        self._stream = Queue()
+    def __init__(self, is_thread_safe: bool = True):
+        self._is_thread_safe = is_thread_safe
+        self._stream = Queue() if is_thread_safe else UnsynchronizedQueue()
 
     def __next__(self):
         next_item = self._stream.get(block=True)  # Blocking get
@@ -24,7 +51,7 @@ class Stream:
         self._stream.put(None)
 
     def duplicate(self):
-        ret = Stream()
+        ret = Stream(self._is_thread_safe)
         ret._stream.queue = self._stream.queue.copy()
         return ret
 
@@ -43,6 +70,12 @@ class Stream:
             x = self._stream.queue[-2]
         return x
 
+    def is_thread_safe(self):
+        """
+        Returns True if this stream can be safely accessed by multiple threads and False otherwise.
+        """
+        return self._is_thread_safe
+
 
 class InputStream(Stream):
     """
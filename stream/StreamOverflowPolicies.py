@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class StreamOverflowPolicies(Enum):
+    """
+    The policies for handling a new item arriving at a bounded stream that is already at full capacity.
+    """
+    # the producer is blocked until the consumer frees some space
+    BLOCK = 0
+    # the oldest item in the stream is discarded to make room for the new one
+    DROP_OLDEST = 1
+    # the new item is discarded
+    DROP_NEWEST = 2
+    # the new item is written to a temporary file on disk and is read back once the in-memory buffer is drained
+    SPILL = 3
@@ -1,4 +1,6 @@
 from test.testUtils import *
+import tempfile
+from stream.BinaryFileStream import BinaryFileInputStream, ParsedEventDataFormatter, convert_to_binary_event_file
 from datetime import timedelta
 from condition.Condition import Variable, TrueCondition, BinaryCondition, SimpleCondition
 from condition.CompositeCondition import AndCondition
@@ -245,3 +247,24 @@ def duplicateEventTypeTest(createTestFile=False, eval_mechanism_params=DEFAULT_T
     )
     runTest(test_name, [pattern], createTestFile, eventStream=nasdaqEventStreamTiny,
             eval_mechanism_params=eval_mechanism_params)
+
+
+def binaryFileDuplicateEventTypeTest(createTestFile=False,
+                                     eval_mechanism_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
+                                     test_name="binaryFileDuplicateEventType"):
+    """
+    Same as duplicateEventTypeTest, with the events replayed from a binary event file.
+    """
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("AMZN", "a"), PrimitiveEventStructure("AMZN", "b"),
+                    PrimitiveEventStructure("AMZN", "c")),
+        TrueCondition(),
+        timedelta(minutes=10)
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        binary_file_path = os.path.join(directory, "NASDAQ_TINY.bin")
+        convert_to_binary_event_file(os.path.join(absolutePath, "test/EventFiles/NASDAQ_TINY.txt"), binary_file_path,
+                                     DEFAULT_TESTING_DATA_FORMATTER)
+        runTest(test_name, [pattern], createTestFile, eventStream=BinaryFileInputStream(binary_file_path),
+                eval_mechanism_params=eval_mechanism_params, expected_file_name="duplicateEventType",
+                data_formatter=ParsedEventDataFormatter(DEFAULT_TESTING_DATA_FORMATTER))
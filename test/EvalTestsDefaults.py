@@ -136,3 +136,13 @@ DEFAULT_TESTING_SIMULTANEOUS_EVALUATION_MECHANISM_SETTINGS_AND_ZSTREAM_INVARIANT
     TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
                                            tree_update_type=TreeEvaluationMechanismUpdateTypes.SIMULTANEOUS_TREE_EVALUATION,
                                            optimizer_params=DEFAULT_TESTING_ZSTREAM_INVARIANT_OPTIMIZER_SETTINGS)
+
+
+"""
+evaluation mechanism: trivial, batched
+optimizer: default (non-adaptive)
+"""
+DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS = \
+    TreeBasedEvaluationMechanismParameters(storage_params=DEFAULT_TREE_STORAGE_PARAMETERS,
+                                           tree_update_type=TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION,
+                                           batch_size=100)
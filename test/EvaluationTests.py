@@ -315,3 +315,38 @@ def googleAmazonLowPatternSearchTest_8():
     googleAmazonLowPatternSearchTest(
         eval_mechanism_params=DEFAULT_TESTING_SIMULTANEOUS_EVALUATION_MECHANISM_SETTINGS_AND_ZSTREAM_INVARIANT_OPTIMIZER,
         test_name = 'googleAmazonLow|_adaptive_zstream_invariant_optimizer_simultaneous_tree_update')
+
+
+def simple_9():
+    simplePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                            test_name='simple|_batched_evaluation')
+
+
+def googleAscendPatternSearchTest_9():
+    googleAscendPatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                  test_name='googleAscend|_batched_evaluation')
+
+
+def amazonInstablePatternSearchTest_9():
+    amazonInstablePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                    test_name='amazonInstable|_batched_evaluation')
+
+
+def msftDrivRacePatternSearchTest_9():
+    msftDrivRacePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                  test_name='msftDrivRace|_batched_evaluation')
+
+
+def googleIncreasePatternSearchTest_9():
+    googleIncreasePatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                    test_name='googleIncrease|_batched_evaluation')
+
+
+def amazonSpecificPatternSearchTest_9():
+    amazonSpecificPatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                    test_name='amazonSpecific|_batched_evaluation')
+
+
+def googleAmazonLowPatternSearchTest_9():
+    googleAmazonLowPatternSearchTest(eval_mechanism_params=DEFAULT_TESTING_BATCHED_EVALUATION_MECHANISM_SETTINGS,
+                                     test_name='googleAmazonLow|_batched_evaluation')
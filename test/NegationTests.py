@@ -172,6 +172,30 @@ def multipleNotAtTheEndTest(create_test_file=False):
     runTest("MultipleNotEnd", [pattern], create_test_file, eval_params)
 
 
+# ON NASDAQ *HALF* SHORT
+def multipleNotAtTheEndBatchedTest(create_test_file=False):
+    """
+    Same as multipleNotAtTheEndTest, with the ready matches collected once per batch of events.
+    """
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"), PrimitiveEventStructure("GOOG", "c"), NegationOperator(PrimitiveEventStructure("TYP1", "x")),
+                    NegationOperator(PrimitiveEventStructure("TYP2", "y")), NegationOperator(PrimitiveEventStructure("TYP3", "z"))),
+        AndCondition(
+            GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("b", lambda x: x["Opening Price"])),
+            SmallerThanCondition(Variable("b", lambda x: x["Opening Price"]),
+                                 Variable("c", lambda x: x["Opening Price"]))
+        ),
+        timedelta(minutes=5)
+    )
+    eval_params = TreeBasedEvaluationMechanismParameters(
+        optimizer_params=OptimizerParameters(opt_type=OptimizerTypes.TRIVIAL_OPTIMIZER,
+                                             tree_plan_params=TreePlanBuilderParameters(builder_type=TreePlanBuilderTypes.TRIVIAL_LEFT_DEEP_TREE,
+                                  negation_algorithm_type=NegationAlgorithmTypes.NAIVE_NEGATION_ALGORITHM)),
+        batch_size=50)
+    runTest("MultipleNotEndBatched", [pattern], create_test_file, eval_params, expected_file_name="MultipleNotEnd")
+
+
 # ON CUSTOM3
 def testWithMultipleNotAtBeginningMiddleEnd(create_test_file=False):
     pattern = Pattern(
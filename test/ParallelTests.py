@@ -121,6 +121,31 @@ def simpleRIPTest(createTestFile=False, eval_mechanism_params=DEFAULT_TESTING_EV
             eventStream=custom4)
 
 
+def boundedStreamRIPTest(createTestFile=False, eval_mechanism_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
+                         test_name="parallel_bounded_stream_RIP_"):
+    """
+    Same as simpleRIPTest, but with the event streams of the execution units bounded to a small capacity, forcing
+    the input thread to wait for the units.
+    """
+    pattern = Pattern(
+        SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b")),
+        AndCondition(
+            BinaryCondition(Variable("a", lambda x: x["Opening Price"]),
+                            Variable("b", lambda x: x["Opening Price"]),
+                            relation_op=lambda x, y: x == y)
+        ),
+        timedelta(minutes=5)
+    )
+    units = 8
+    parallel_execution_params = DataParallelExecutionParametersRIPAlgorithm(units_number=units,
+                                                                            multiple=12,
+                                                                            unit_stream_capacity=2,
+                                                                            unit_stream_overflow_policy=
+                                                                            StreamOverflowPolicies.BLOCK)
+    runTest(test_name, [pattern], createTestFile, eval_mechanism_params, parallel_execution_params,
+            eventStream=custom4, expected_file_name="parallel_2_")
+
+
 def StocksDataRIPTest(createTestFile=False, eval_mechanism_params=DEFAULT_TESTING_EVALUATION_MECHANISM_SETTINGS,
                       test_name="Stocks_Data_RIP_Test_"):
     pattern1 = Pattern(
@@ -0,0 +1,254 @@
+import os
+import pathlib
+from datetime import timedelta
+
+from CEP import CEP
+from adaptive.statistics.StatisticsTypes import StatisticsTypes
+from base.Event import EventAttributeValues
+from base.Pattern import Pattern
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure
+from condition.BaseRelationCondition import GreaterThanCondition, SmallerThanCondition, EqCondition
+from condition.CompositeCondition import AndCondition, OrCondition, AdaptiveAndCondition
+from condition.Condition import Variable, SimpleCondition, BinaryCondition
+from condition.ConditionCompiler import compile_condition, compile_join_filter
+from evaluation.EvaluationMechanismFactory import TreeBasedEvaluationMechanismParameters
+from plugin.stocks.Stocks import MetastockDataFormatter
+from stream.Stream import Stream
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+SHORT_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+
+
+def run_condition_tests():
+    condition_compiler_test = TestConditionCompiler()
+    condition_compiler_test.run_tests()
+    print("Condition unit tests executed successfully.")
+
+
+"""
+CONDITION COMPILER
+"""
+
+
+class _RecordingStatisticsCollector:
+    """
+    Records the selectivity statistics updates.
+    """
+    def __init__(self):
+        self.updates = []
+
+    def update_statistics_by_type(self, statistics_type, data):
+        self.updates.append((statistics_type, data))
+
+
+class _Event:
+    """
+    A minimal event holding a payload.
+    """
+    def __init__(self, payload: dict):
+        self.payload = payload
+        self.attribute_values = EventAttributeValues(payload)
+
+
+class _AggregatedEvent:
+    """
+    A minimal aggregated event holding a list of primitive events.
+    """
+    def __init__(self, payloads: list):
+        self.primitive_events = [_Event(payload) for payload in payloads]
+
+
+class _PartialMatch:
+    """
+    A minimal partial match holding a list of events and their timestamps.
+    """
+    def __init__(self, payloads: list, first_timestamp: int, last_timestamp: int):
+        self.events = [_Event(payload) for payload in payloads]
+        self.first_timestamp = first_timestamp
+        self.last_timestamp = last_timestamp
+
+
+class _NegatedCondition(BinaryCondition):
+    """
+    A condition overriding the evaluation logic of its class.
+    """
+    def _eval(self, binding: dict = None):
+        return not super()._eval(binding)
+
+
+class TestConditionCompiler:
+    def __init__(self):
+        self.names = ["a", "b", "c"]
+        self.bindings = [{"a": {"x": a, "y": 5 - a}, "b": {"x": b, "y": b * b}, "c": {"x": c, "y": -c}}
+                         for a in range(4) for b in range(4) for c in range(4)]
+
+    def __create_conditions(self):
+        return [
+            AndCondition(),
+            AndCondition(SmallerThanCondition(Variable("a", lambda x: x["x"]), Variable("b", lambda x: x["x"]))),
+            AndCondition(GreaterThanCondition(Variable("c", lambda x: x["y"]), -2),
+                         EqCondition(Variable("a", lambda x: x["x"] + 1), Variable("b", lambda x: x["x"])),
+                         SimpleCondition(Variable("a", lambda x: x["x"]), Variable("b", lambda x: x["y"]),
+                                         Variable("c", lambda x: x["x"]), relation_op=lambda a, b, c: a + b > c)),
+            OrCondition(EqCondition(Variable("a", lambda x: x["x"]), 2),
+                        AndCondition(SmallerThanCondition(Variable("b", lambda x: x["x"]), 2),
+                                     GreaterThanCondition(Variable("c", lambda x: x["x"]), 1)),
+                        AndCondition()),
+            AndCondition(_NegatedCondition(Variable("a", lambda x: x["x"]), Variable("c", lambda x: x["x"]),
+                                           lambda a, c: a < c),
+                         OrCondition(SmallerThanCondition(Variable("b", lambda x: x["y"]), 4),
+                                     EqCondition(Variable("c", lambda x: x["x"]), 3))),
+        ]
+
+    def test_equivalence(self):
+        for condition in self.__create_conditions():
+            compiled_condition = compile_condition(condition, self.names)
+            for binding in self.bindings:
+                events = [_Event(binding[name]) for name in self.names]
+                assert compiled_condition(events) == condition.eval(binding), \
+                    "ConditionCompiler: the compiled condition %s yields a different result" % (condition,)
+
+    def test_statistics(self):
+        condition = self.__create_conditions()[2]
+        statistics_collector = _RecordingStatisticsCollector()
+        condition.set_statistics_collector(statistics_collector)
+        compiled_condition = compile_condition(condition, self.names)
+        for binding in self.bindings:
+            condition.eval(binding)
+        expected_updates = statistics_collector.updates
+        statistics_collector.updates = []
+        for binding in self.bindings:
+            compiled_condition([_Event(binding[name]) for name in self.names])
+        assert len(expected_updates) > 0, "ConditionCompiler: no statistics were collected"
+        assert statistics_collector.updates == expected_updates, \
+            "ConditionCompiler: the compiled condition collects different statistics"
+        assert all(statistics_type == StatisticsTypes.SELECTIVITY_MATRIX
+                   for statistics_type, _ in statistics_collector.updates), \
+            "ConditionCompiler: incorrect statistics type"
+
+    def test_positions(self):
+        condition = self.__create_conditions()[1]
+        compiled_condition = compile_condition(condition, ["b", "c", "a"])
+        assert compiled_condition([_Event({"x": 2}), _Event({"x": 0}), _Event({"x": 1})]), \
+            "ConditionCompiler: incorrect event order"
+        assert not compiled_condition([_Event({"x": 1}), _Event({"x": 0}), _Event({"x": 2})]), \
+            "ConditionCompiler: incorrect event order"
+
+    def test_aggregated_events(self):
+        condition = AndCondition(SmallerThanCondition(Variable("a", lambda x: x["x"]),
+                                                      Variable("b", lambda x: sum(p["x"] for p in x))),
+                                 EqCondition(Variable("b", lambda x: len(x)), 2))
+        compiled_condition = compile_condition(condition, ["a", "b"], {"b"})
+        assert compiled_condition([_Event({"x": 2}), _AggregatedEvent([{"x": 1}, {"x": 3}])]), \
+            "ConditionCompiler: incorrect aggregated event content"
+        assert not compiled_condition([_Event({"x": 5}), _AggregatedEvent([{"x": 1}, {"x": 3}])]), \
+            "ConditionCompiler: incorrect aggregated event content"
+        assert not compiled_condition([_Event({"x": 0}), _AggregatedEvent([{"x": 1}])]), \
+            "ConditionCompiler: incorrect aggregated event content"
+
+    def test_attribute_memoization(self):
+        calls = []
+
+        def get_x(payload):
+            calls.append(payload)
+            return payload["x"]
+
+        condition = AndCondition(SmallerThanCondition(Variable("a", get_x), Variable("b", lambda x: x["x"])),
+                                 GreaterThanCondition(Variable("a", get_x), -1))
+        compiled_condition = compile_condition(condition, ["a", "b"])
+        event = _Event({"x": 1})
+        for b in range(5):
+            assert compiled_condition([event, _Event({"x": b})]) == (b > 1), \
+                "ConditionCompiler: incorrect result with memoized attribute values"
+        assert len(calls) == 1, "ConditionCompiler: the attribute value was extracted more than once"
+
+    def test_adaptive_ordering(self):
+        def expensive_relation(a, b):
+            sum(range(1000))
+            return a >= 0
+
+        expensive_condition = BinaryCondition(Variable("a", lambda x: x["x"]), Variable("b", lambda x: x["x"]),
+                                              expensive_relation)
+        selective_condition = EqCondition(Variable("c", lambda x: x["x"]), 3)
+        condition = AdaptiveAndCondition(expensive_condition, selective_condition,
+                                         SmallerThanCondition(Variable("a", lambda x: x["x"]), 100),
+                                         sampling_interval=2, reordering_interval=10)
+        compiled_conditions = []
+
+        def recompile():
+            compiled_conditions.append(compile_condition(condition, self.names, reordering_callback=recompile))
+
+        recompile()
+        for _ in range(10):
+            for binding in self.bindings:
+                events = [_Event(binding[name]) for name in self.names]
+                assert compiled_conditions[-1](events) == condition.eval(binding), \
+                    "ConditionCompiler: the adaptive condition %s yields a different result" % (condition,)
+        assert len(compiled_conditions) > 1, "ConditionCompiler: the adaptive condition was not recompiled"
+        assert condition.get_conditions_list()[0] is selective_condition, \
+            "ConditionCompiler: the selective condition was not moved to the front"
+        assert condition.get_conditions_list()[-1] is expensive_condition, \
+            "ConditionCompiler: the expensive condition was not moved to the back"
+
+    def test_join_filter(self):
+        condition = AndCondition(SmallerThanCondition(Variable("a", lambda x: x["x"]), Variable("c", lambda x: x["x"])),
+                                 EqCondition(Variable("c", lambda x: x["y"]), Variable("b", lambda x: x["y"])),
+                                 GreaterThanCondition(Variable("b", lambda x: x["x"]), 1),
+                                 SimpleCondition(Variable("a", lambda x: x["x"]), Variable("c", lambda x: x["x"]),
+                                                 relation_op=lambda a, c: a == c))
+        join_filter = compile_join_filter(condition, ["c"], ["a", "b"])
+        partial_match = _PartialMatch([{"x": 2, "y": 4}], 10, 10)
+        candidates = [_PartialMatch([{"x": a}, {"x": b, "y": y}], first_timestamp, first_timestamp + 1)
+                      for a in range(4) for b in range(4) for y in range(3, 6) for first_timestamp in range(5, 15)]
+        expected_candidates = [candidate for candidate in candidates
+                               if max(candidate.last_timestamp, 10) - min(candidate.first_timestamp, 10) <= 3 and
+                               candidate.events[0].payload["x"] < 2 and candidate.events[1].payload["y"] == 4]
+        assert join_filter(partial_match, candidates, 3) == expected_candidates, \
+            "ConditionCompiler: the join filter selects incorrect candidates"
+        assert compile_join_filter(OrCondition(*condition.get_conditions_list()), ["c"], ["a", "b"])(
+            partial_match, candidates, 3) == [candidate for candidate in candidates
+                                              if max(candidate.last_timestamp, 10) -
+                                              min(candidate.first_timestamp, 10) <= 3], \
+            "ConditionCompiler: the join filter verifies the sub-conditions of a disjunction"
+
+    @staticmethod
+    def __get_matches(condition):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"),
+                        PrimitiveEventStructure("AAPL", "c")),
+            condition,
+            timedelta(minutes=5)
+        )
+        events = Stream()
+        with open(SHORT_FILE_PATH) as f:
+            for line in f:
+                events.add_item(line)
+        events.close()
+        matches = Stream()
+        CEP([pattern], TreeBasedEvaluationMechanismParameters()).run(events, matches, MetastockDataFormatter())
+        return [tuple(event.index for event in match.events) for match in matches]
+
+    def test_adaptive_evaluation(self):
+        def create_conditions():
+            return [BinaryCondition(Variable("a", lambda x: x["Peak Price"]), Variable("c", lambda x: x["Peak Price"]),
+                                    lambda a, c: a < c + 1000),
+                    BinaryCondition(Variable("b", lambda x: x["Opening Price"]),
+                                    Variable("c", lambda x: x["Opening Price"]), lambda b, c: b < c),
+                    SmallerThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                         Variable("c", lambda x: x["Opening Price"]))]
+        matches = self.__get_matches(AndCondition(*create_conditions()))
+        adaptive_matches = self.__get_matches(AdaptiveAndCondition(*create_conditions(),
+                                                                   sampling_interval=1, reordering_interval=3))
+        assert len(matches) > 0, "AdaptiveAndCondition: no matches found"
+        assert adaptive_matches == matches, "AdaptiveAndCondition: the adaptive condition yields different matches"
+
+    def run_tests(self):
+        self.test_equivalence()
+        self.test_statistics()
+        self.test_positions()
+        self.test_aggregated_events()
+        self.test_attribute_memoization()
+        self.test_adaptive_ordering()
+        self.test_adaptive_evaluation()
+        self.test_join_filter()
@@ -0,0 +1,326 @@
+import json
+import os
+import pathlib
+import timeit
+from datetime import datetime, timedelta
+
+from CEP import CEP
+from base.ColumnTypes import ColumnTypes
+from base.Event import Event
+from base.EventSchema import SchemaPayload
+from base.Pattern import Pattern
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure
+from base.SchemaDataFormatter import DataSchema, SchemaDataFormatter, compile_timestamp_parser, \
+    memoize_timestamp_parser, parse_number
+from condition.BaseRelationCondition import GreaterThanCondition
+from condition.Condition import Variable, get_accessed_attribute_names
+from evaluation.EvaluationMechanismFactory import TreeBasedEvaluationMechanismParameters
+from misc.ConsumptionPolicy import ConsumptionPolicy
+from misc.Utils import str_to_number
+from plugin.sensors.Sensors import SensorsDataFormatter, SensorsEventTypeClassifier
+from plugin.stocks.Stocks import MetastockDataFormatter, MetastockByTickerEventTypeClassifier
+from plugin.twitter.TwitterDataFormatter import TweetDataFormatter
+from stream.Stream import Stream
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+SHORT_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+SENSORS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/Sensors_short.dat")
+
+
+def run_data_formatter_tests():
+    schema_data_formatter_test = TestSchemaDataFormatter()
+    schema_data_formatter_test.run_tests()
+    print("Data formatter unit tests executed successfully.")
+
+
+def run_timestamp_parsing_benchmark():
+    """
+    Compares the timestamp parsing methods on the timestamps of the stock and sensor event files. Not a test.
+    """
+    def parse_metastock_timestamp_by_slicing(timestamp):
+        timestamp_str = str(timestamp)
+        return datetime(year=int(timestamp_str[0:4]), month=int(timestamp_str[4:6]), day=int(timestamp_str[6:8]),
+                        hour=int(timestamp_str[8:10]), minute=int(timestamp_str[10:12]))
+
+    for file_path, timestamp_format, original_parse_timestamp in [
+            (SHORT_FILE_PATH, "%Y%m%d%H%M", parse_metastock_timestamp_by_slicing),
+            (SENSORS_FILE_PATH, "%m/%d/%Y %H:%M:%S", lambda t: datetime.strptime(t, "%m/%d/%Y %H:%M:%S"))]:
+        with open(file_path) as f:
+            timestamps = [line.split(",")[1] for line in f]
+        compiled_parse_timestamp = compile_timestamp_parser(timestamp_format, cache_size=0)
+        # a new memoizing parser is created for each repetition, such that the memoized timestamps are not reused
+        parser_factories = [("original", lambda: original_parse_timestamp),
+                            ("compiled", lambda: compiled_parse_timestamp),
+                            ("compiled and memoized", lambda: memoize_timestamp_parser(compiled_parse_timestamp))]
+        for name, create_parser in parser_factories:
+            running_time = timeit.timeit(lambda: [parse_timestamp(t) for parse_timestamp in [create_parser()]
+                                                  for t in timestamps], number=100)
+            print("Bench Mark timestamp parsing (%s) - %s: %s" % (timestamp_format, name, running_time))
+
+
+class UnknownAttributeEventTypeClassifier(MetastockByTickerEventTypeClassifier):
+    """
+    Deduces the event type exactly as MetastockByTickerEventTypeClassifier, but does not specify the attribute
+    containing it. Hence, the events cannot be filtered before parsing them.
+    """
+    def get_event_type_attribute(self):
+        return None
+
+
+class TestSchemaDataFormatter:
+    def test_parse_number(self):
+        for value in ["0", "136", "-29", "+7", " 7", "1_000", "136.2", "-0.785", "1e3", "inf", "AAPL",
+                      ""]:
+            expected_value = str_to_number(value)
+            actual_value = parse_number(value)
+            assert type(actual_value) == type(expected_value) and str(actual_value) == str(expected_value), \
+                "parse_number: incorrect value for %s" % (value,)
+
+    def test_typed_columns(self):
+        schema = DataSchema(columns=[("Name", ColumnTypes.STRING), ("Time", ColumnTypes.STRING),
+                                     ("Count", ColumnTypes.INT), ("Price", ColumnTypes.FLOAT)],
+                            optional_columns=[("Note", ColumnTypes.STRING)],
+                            timestamp_column="Time", timestamp_format="%Y-%m-%d %H:%M", delimiter=";")
+        data_formatter = SchemaDataFormatter(schema, MetastockByTickerEventTypeClassifier())
+        payload = data_formatter.parse_event("A;2021-06-27 18:54;12;7\n")
+        assert payload == {"Name": "A", "Time": "2021-06-27 18:54", "Count": 12, "Price": 7.0}, \
+            "SchemaDataFormatter: incorrect payload"
+        assert type(payload["Price"]) == float, "SchemaDataFormatter: incorrect column type"
+        assert data_formatter.get_event_timestamp(payload) == datetime(2021, 6, 27, 18, 54), \
+            "SchemaDataFormatter: incorrect timestamp"
+        assert data_formatter.parse_event("A;2021-06-27 18:54;12;7;x")["Note"] == "x", \
+            "SchemaDataFormatter: incorrect optional column"
+        # records with missing or surplus columns are parsed as by a plain zip of the column names and the fields
+        assert data_formatter.parse_event("A;2021-06-27 18:54;12") == \
+            {"Name": "A", "Time": "2021-06-27 18:54", "Count": 12}, \
+            "SchemaDataFormatter: incorrect payload for a record with missing columns"
+        assert data_formatter.parse_event("A;2021-06-27 18:54;12;7;x;y") == \
+            {"Name": "A", "Time": "2021-06-27 18:54", "Count": 12, "Price": 7, "Note": "x"}, \
+            "SchemaDataFormatter: incorrect payload for a record with surplus columns"
+
+    def test_timestamp_parser(self):
+        parse_timestamp = compile_timestamp_parser("%m/%d/%Y %H:%M:%S")
+        assert parse_timestamp("06/27/2021 18:54:08") == datetime(2021, 6, 27, 18, 54, 8), \
+            "compile_timestamp_parser: incorrect timestamp"
+        # a timestamp which is not zero-padded is parsed by strptime
+        assert parse_timestamp("6/27/2021 18:54:08") == datetime(2021, 6, 27, 18, 54, 8), \
+            "compile_timestamp_parser: incorrect non-padded timestamp"
+        try:
+            parse_timestamp("06-27-2021 18:54:08")
+        except ValueError:
+            pass
+        else:
+            assert False, "compile_timestamp_parser: no failure for mismatching separators"
+        assert compile_timestamp_parser("%Y%m%d%H%M")(200802010900) == datetime(2008, 2, 1, 9, 0), \
+            "compile_timestamp_parser: incorrect integer timestamp"
+        assert compile_timestamp_parser("%d %b %Y")("01 Feb 2008") == datetime(2008, 2, 1), \
+            "compile_timestamp_parser: incorrect timestamp with a non-numeric field"
+
+    def test_memoized_timestamp_parser(self):
+        parsed_timestamps = []
+        parse_timestamp = memoize_timestamp_parser(lambda t: parsed_timestamps.append(t) or datetime(2021, 1, t),
+                                                   cache_size=2)
+        for timestamp in [1, 1, 2, 1, 3, 3, 1]:
+            assert parse_timestamp(timestamp) == datetime(2021, 1, timestamp), \
+                "memoize_timestamp_parser: incorrect timestamp"
+        assert parsed_timestamps == [1, 2, 3, 1], "memoize_timestamp_parser: incorrect memoization"
+        parse_timestamp = compile_timestamp_parser("%Y%m%d%H%M")
+        assert parse_timestamp("200802010900") is parse_timestamp("200802010900"), \
+            "compile_timestamp_parser: the timestamp is not memoized"
+
+    def test_plugin_formatters(self):
+        for data_formatter, file_path in [(MetastockDataFormatter(), SHORT_FILE_PATH),
+                                          (SensorsDataFormatter(), SENSORS_FILE_PATH)]:
+            with open(file_path) as f:
+                for line in f:
+                    payload = data_formatter.parse_event(line)
+                    expected_values = list(map(str_to_number, line.replace("\n", "").split(",")))
+                    assert list(payload.values()) == expected_values and \
+                        [type(v) for v in payload.values()] == [type(v) for v in expected_values], \
+                        "%s: incorrect payload for %s" % (type(data_formatter).__name__, line)
+        metastock_data_formatter = MetastockDataFormatter()
+        payload = metastock_data_formatter.parse_event("AAPL,200802010900,136.2,136.2,136,136,6700,0.5")
+        assert metastock_data_formatter.get_probability(payload) == 0.5, "MetastockDataFormatter: incorrect probability"
+        sensors_payload = SensorsDataFormatter(SensorsEventTypeClassifier(), use_schema_payload=True).parse_event(
+            "PressTemp,06/27/2021 18:54:08,0.002,24.413,949.917")
+        assert isinstance(sensors_payload, SchemaPayload) and sensors_payload["Temperature"] == 949.917, \
+            "SensorsDataFormatter: incorrect schema-backed payload"
+        payload = metastock_data_formatter.parse_event("AAPL,201802230101,1,2")
+        assert payload == {"Stock Ticker": "AAPL", "Date": 201802230101, "Opening Price": 1, "Peak Price": 2}, \
+            "MetastockDataFormatter: incorrect payload for a short record"
+        assert metastock_data_formatter.get_event_timestamp(payload) == datetime(2018, 2, 23, 1, 1), \
+            "MetastockDataFormatter: incorrect timestamp for a short record"
+        payload = metastock_data_formatter.parse_event("AAPL,200802010900,136.2,136.2,136,136,6700,0.5,x")
+        assert list(payload.values()) == ["AAPL", 200802010900, 136.2, 136.2, 136, 136, 6700, 0.5], \
+            "MetastockDataFormatter: incorrect payload for a long record"
+        try:
+            SensorsDataFormatter().parse_event("Unknown,06/27/2021 18:54:08,1")
+        except Exception:
+            pass
+        else:
+            assert False, "SensorsDataFormatter: no failure for a record of an unknown sensor"
+
+    def test_invalid_schemas(self):
+        for columns, timestamp_column in [([("A", ColumnTypes.STRING), ("A", ColumnTypes.INT)], "A"),
+                                          ([("A", ColumnTypes.STRING)], "B")]:
+            try:
+                DataSchema(columns, timestamp_column, "%Y")
+            except Exception:
+                continue
+            assert False, "DataSchema: no failure for an invalid schema"
+
+    def test_raw_event_type(self):
+        for data_formatter, file_path in [(MetastockDataFormatter(), SHORT_FILE_PATH),
+                                          (SensorsDataFormatter(), SENSORS_FILE_PATH)]:
+            assert data_formatter.can_extract_raw_event_type(), \
+                "%s: the raw event type cannot be extracted" % (type(data_formatter).__name__,)
+            with open(file_path) as f:
+                for line in f:
+                    assert data_formatter.get_raw_event_type(line) == \
+                        data_formatter.get_event_type(data_formatter.parse_event(line)), \
+                        "%s: incorrect raw event type for %s" % (type(data_formatter).__name__, line)
+        assert not MetastockDataFormatter(UnknownAttributeEventTypeClassifier()).can_extract_raw_event_type(), \
+            "MetastockDataFormatter: the raw event type is extracted with an unknown event type attribute"
+        schema = DataSchema(columns=[("Time", ColumnTypes.STRING), ("Stock Ticker", ColumnTypes.STRING)],
+                            timestamp_column="Time", timestamp_format="%Y")
+        data_formatter = SchemaDataFormatter(schema, MetastockByTickerEventTypeClassifier())
+        assert data_formatter.get_raw_event_type("2021,AAPL\r\n") == "AAPL", \
+            "SchemaDataFormatter: incorrect raw event type in a non-first column"
+        schema = DataSchema(columns=[("Stock Ticker", ColumnTypes.INT), ("Time", ColumnTypes.STRING)],
+                            timestamp_column="Time", timestamp_format="%Y")
+        assert not SchemaDataFormatter(schema, MetastockByTickerEventTypeClassifier()).can_extract_raw_event_type(), \
+            "SchemaDataFormatter: the raw event type is extracted from a non-string column"
+
+    def test_raw_event_timestamp(self):
+        for data_formatter, file_path in [(MetastockDataFormatter(), SHORT_FILE_PATH),
+                                          (SensorsDataFormatter(), SENSORS_FILE_PATH)]:
+            with open(file_path) as f:
+                for line in f:
+                    assert data_formatter.get_raw_event_timestamp(line) == \
+                        data_formatter.get_event_timestamp(data_formatter.parse_event(line)), \
+                        "%s: incorrect raw event timestamp for %s" % (type(data_formatter).__name__, line)
+        # the timestamp column is at different positions, hence the records are parsed
+        schemas = {"A": DataSchema(columns=[("Type", ColumnTypes.STRING), ("Time", ColumnTypes.STRING)],
+                                   timestamp_column="Time", timestamp_format="%Y%m%d"),
+                   "B": DataSchema(columns=[("Type", ColumnTypes.STRING), ("Value", ColumnTypes.INT),
+                                            ("Time", ColumnTypes.STRING)],
+                                   timestamp_column="Time", timestamp_format="%Y%m%d")}
+        data_formatter = SchemaDataFormatter(schemas, MetastockByTickerEventTypeClassifier())
+        assert [data_formatter.get_raw_event_timestamp(line) for line in ["A,20210627\n", "B,7,20210628"]] == \
+            [datetime(2021, 6, 27), datetime(2021, 6, 28)], "SchemaDataFormatter: incorrect raw event timestamp"
+
+    def test_prefiltering(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b")),
+            GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("b", lambda x: x["Opening Price"])),
+            timedelta(minutes=5),
+            ConsumptionPolicy(contiguous=["a", "b"])
+        )
+        with open(SHORT_FILE_PATH) as f:
+            lines = f.readlines()
+        results = []
+        skipped_events_counts = []
+        for data_formatter in [MetastockDataFormatter(), MetastockDataFormatter(UnknownAttributeEventTypeClassifier())]:
+            events = Stream()
+            for line in lines:
+                events.add_item(line)
+            events.close()
+            matches = Stream()
+            cep = CEP([pattern])
+            cep.run(events, matches, data_formatter)
+            # the skipped events must not affect the serial numbers of the subsequent events
+            results.append([[(event.index, event.type, event.timestamp) for event in match.events]
+                            for match in matches])
+            skipped_events_counts.append(cep.get_skipped_events_count())
+        irrelevant_events_count = sum(1 for line in lines if not line.startswith(("AAPL,", "AMZN,")))
+        assert skipped_events_counts == [irrelevant_events_count, 0], \
+            "SchemaDataFormatter: incorrect number of skipped events"
+        assert len(results[0]) > 0, "SchemaDataFormatter: no matches found"
+        assert results[0] == results[1], "SchemaDataFormatter: skipping irrelevant events changes the matches"
+
+    def test_referenced_attributes(self):
+        assert get_accessed_attribute_names(lambda x: x["Peak Price"] - x.get("Lowest Price")) == \
+            {"Peak Price", "Lowest Price"}, "get_accessed_attribute_names: incorrect attributes"
+        assert get_accessed_attribute_names(lambda x: x["Peak Price"] if x["Volume"] > 0 else x["Lowest Price"]) is None, \
+            "get_accessed_attribute_names: the attributes of a conditional function are not unknown"
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"),
+                        PrimitiveEventStructure("AAPL", "c")),
+            GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("b", lambda x: x["Opening Price"] if x["Volume"] > 0 else 0)),
+            timedelta(minutes=5)
+        )
+        assert pattern.get_referenced_attributes() == {"AAPL": {"Opening Price"}, "AMZN": None}, \
+            "Pattern: incorrect referenced attributes"
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b")),
+            GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("b", lambda x: x["Opening Price"] if x["Volume"] > 0 else 0,
+                                          attribute_names={"Opening Price", "Volume"})),
+            timedelta(minutes=5)
+        )
+        assert pattern.get_referenced_attributes() == {"AAPL": {"Opening Price"}, "AMZN": {"Opening Price", "Volume"}}, \
+            "Pattern: incorrect declared referenced attributes"
+
+    def test_projection(self):
+        data_formatter = MetastockDataFormatter(use_schema_payload=True)
+        projected_formatter = data_formatter.get_projected_formatter({"AAPL": {"Opening Price"}, "AMZN": set()})
+        line = "AAPL,200802010900,136.2,136.2,136,136,6700"
+        payload = projected_formatter.parse_event(line)
+        assert set(payload.keys()) == {"Stock Ticker", "Date", "Opening Price"}, \
+            "MetastockDataFormatter: incorrect projected payload"
+        assert projected_formatter.get_event_timestamp(payload) == data_formatter.get_event_timestamp(
+            data_formatter.parse_event(line)), "MetastockDataFormatter: incorrect projected timestamp"
+        assert len(data_formatter.parse_event(line)) == 7, "MetastockDataFormatter: the original formatter is modified"
+        assert data_formatter.get_projected_formatter({"AAPL": None}) is data_formatter, \
+            "MetastockDataFormatter: projection with unknown attributes"
+        tweet = {"id": 1, "created_at": "Wed Oct 10 20:19:24 +0000 2018", "text": "text", "truncated": False,
+                 "in_reply_to_status_id": None, "in_reply_to_user_id": None, "in_reply_to_screen_name": None,
+                 "user": {}, "is_quote_status": False, "retweet_count": 0, "favorite_count": 0, "favorited": False,
+                 "retweeted": False, "filter_level": "low", "lang": "en", "retweeted_status": {"id": 2}}
+        projected_formatter = TweetDataFormatter().get_projected_formatter({"Tweet": {"retweeted_status"}})
+        assert projected_formatter.parse_event(json.dumps(tweet)) == \
+            {"created_at": tweet["created_at"], "retweeted_status": 2}, "TweetDataFormatter: incorrect projected payload"
+
+    def test_attribute_projection_evaluation(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b")),
+            GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("b", lambda x: x["Peak Price"])),
+            timedelta(minutes=5),
+            ConsumptionPolicy(contiguous=["a", "b"])
+        )
+        with open(SHORT_FILE_PATH) as f:
+            lines = f.readlines()
+        results = []
+        for attribute_projection in [False, True]:
+            events = Stream()
+            for line in lines:
+                events.add_item(line)
+            events.close()
+            matches = Stream()
+            CEP([pattern], TreeBasedEvaluationMechanismParameters(attribute_projection=attribute_projection)).run(
+                events, matches, MetastockDataFormatter())
+            results.append([[(event.index, event.payload) for event in match.events] for match in matches])
+        assert len(results[0]) > 0, "SchemaDataFormatter: no matches found"
+        # the projection is not applied separately for each event type
+        projected_attribute_names = ["Stock Ticker", "Date", "Opening Price", "Peak Price", Event.INDEX_ATTRIBUTE_NAME]
+        expected_results = [[(index, {key: payload[key] for key in projected_attribute_names})
+                             for index, payload in match] for match in results[0]]
+        assert results[1] == expected_results, "SchemaDataFormatter: projection changes the matches"
+
+    def run_tests(self):
+        self.test_parse_number()
+        self.test_typed_columns()
+        self.test_timestamp_parser()
+        self.test_memoized_timestamp_parser()
+        self.test_plugin_formatters()
+        self.test_invalid_schemas()
+        self.test_raw_event_type()
+        self.test_raw_event_timestamp()
+        self.test_prefiltering()
+        self.test_referenced_attributes()
+        self.test_projection()
+        self.test_attribute_projection_evaluation()
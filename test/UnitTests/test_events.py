@@ -0,0 +1,302 @@
+import os
+import pathlib
+import pickle
+import sys
+from datetime import datetime, timedelta, timezone
+
+from CEP import CEP
+from adaptive.optimizer.OptimizerFactory import StatisticsDeviationAwareOptimizerParameters
+from base.EpochTimestampDataFormatter import convert_time_window, convert_timestamp, convert_to_datetime, \
+    EpochTimestampDataFormatter
+from base.Event import Event, AggregatedEvent
+from base.EventSchema import EventSchema, SchemaPayload
+from base.Pattern import Pattern
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure, NegationOperator
+from base.TimestampTypes import TimestampTypes
+from condition.BaseRelationCondition import GreaterThanCondition, SmallerThanCondition
+from condition.Condition import Variable, TrueCondition
+from evaluation.EvaluationMechanismFactory import TreeBasedEvaluationMechanismParameters
+from misc.ConsumptionPolicy import ConsumptionPolicy
+from parallel.ParallelEventParser import ParallelEventParser
+from tree.evaluation.TreeEvaluationMechanismUpdateTypes import TreeEvaluationMechanismUpdateTypes
+from plugin.stocks.Stocks import MetastockDataFormatter
+from stream.Stream import Stream
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+SHORT_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_SHORT.txt")
+
+
+def run_event_tests():
+    event_schema_test = TestEventSchema()
+    event_schema_test.run_tests()
+    event_test = TestEvent()
+    event_test.run_tests()
+    parallel_event_parser_test = TestParallelEventParser()
+    parallel_event_parser_test.run_tests()
+    epoch_timestamps_test = TestEpochTimestamps()
+    epoch_timestamps_test.run_tests()
+    print("Event unit tests executed successfully.")
+
+
+"""
+EVENT SCHEMA
+"""
+
+
+class TestEventSchema:
+    def __init__(self):
+        self.schema = EventSchema.get(["Name", "Price", "Volume"])
+
+    def test_payload_access(self):
+        payload = self.schema.create_payload(("AAPL", 135.5, 6700))
+        assert payload["Price"] == 135.5, "SchemaPayload: incorrect attribute value"
+        assert payload.get("Missing") is None and payload.get("Missing", 0) == 0, \
+            "SchemaPayload: incorrect default value"
+        assert "Volume" in payload and "Missing" not in payload, "SchemaPayload: incorrect containment"
+        assert list(payload) == ["Name", "Price", "Volume"], "SchemaPayload: incorrect keys"
+        assert payload == {"Name": "AAPL", "Price": 135.5, "Volume": 6700}, "SchemaPayload: not equal to a dict"
+        try:
+            _ = payload["Missing"]
+        except KeyError:
+            pass
+        else:
+            assert False, "SchemaPayload: no failure for a missing attribute"
+
+    def test_index(self):
+        payload = self.schema.create_payload(("AAPL", 135.5, 6700))
+        assert Event.INDEX_ATTRIBUTE_NAME not in payload, "SchemaPayload: unexpected serial number"
+        indexed_payload = payload.with_index(17)
+        assert indexed_payload[Event.INDEX_ATTRIBUTE_NAME] == 17, "SchemaPayload: incorrect serial number"
+        assert len(indexed_payload) == 4 and len(payload) == 3, "SchemaPayload: incorrect length"
+        assert payload.get(Event.INDEX_ATTRIBUTE_NAME, -1) == -1, "SchemaPayload: the original payload was modified"
+        try:
+            _ = payload[Event.INDEX_ATTRIBUTE_NAME]
+        except KeyError:
+            pass
+        else:
+            assert False, "SchemaPayload: no failure for a serial number which was not assigned"
+
+    def test_pickle(self):
+        payload = self.schema.create_payload(("AAPL", 135.5, 6700)).with_index(3)
+        restored_payload = pickle.loads(pickle.dumps(payload))
+        assert isinstance(restored_payload, SchemaPayload), "SchemaPayload: incorrect type after unpickling"
+        assert restored_payload == payload and restored_payload[Event.INDEX_ATTRIBUTE_NAME] == 3, \
+            "SchemaPayload: incorrect payload after unpickling"
+
+    def test_invalid_schemas(self):
+        for attribute_names in [["Name", "Name"], ["Name", Event.INDEX_ATTRIBUTE_NAME]]:
+            try:
+                EventSchema(attribute_names)
+            except Exception:
+                continue
+            assert False, "EventSchema: no failure for invalid attribute names %s" % (attribute_names,)
+
+    def run_tests(self):
+        self.test_payload_access()
+        self.test_index()
+        self.test_pickle()
+        self.test_invalid_schemas()
+
+
+"""
+EVENT
+"""
+
+
+class TestEvent:
+    def __init__(self):
+        with open(SHORT_FILE_PATH) as f:
+            self.lines = f.readlines()
+
+    def test_compact_representation(self):
+        for data_formatter in [MetastockDataFormatter(), MetastockDataFormatter(use_schema_payload=True)]:
+            first_event = Event(self.lines[0], data_formatter, 0)
+            second_event = Event(self.lines[0], data_formatter, 1)
+            assert not hasattr(first_event, "__dict__"), "Event: unexpected instance dict"
+            assert second_event.index == first_event.index + 1, "Event: incorrect serial number"
+            assert first_event.payload[Event.INDEX_ATTRIBUTE_NAME] == first_event.index, \
+                "Event: the serial number is not accessible via the payload"
+            assert first_event.type is second_event.type and first_event.type is sys.intern("".join(first_event.type)), \
+                "Event: the event type is not interned"
+            assert first_event != second_event, "Event: events with different serial numbers are equal"
+            third_event, fourth_event = Event(self.lines[0], data_formatter), Event(self.lines[0], data_formatter)
+            assert fourth_event.index == third_event.index + 1, "Event: incorrect default serial number"
+        aggregated_event = AggregatedEvent([first_event, second_event], None)
+        assert not hasattr(aggregated_event, "__dict__"), "AggregatedEvent: unexpected instance dict"
+        assert aggregated_event.primitive_events == [first_event, second_event], \
+            "AggregatedEvent: incorrect primitive events"
+
+    def test_schema_payload_evaluation(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b")),
+            GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("b", lambda x: x["Opening Price"])),
+            timedelta(minutes=5),
+            ConsumptionPolicy(contiguous=["a", "b"])
+        )
+        results = []
+        for data_formatter in [MetastockDataFormatter(), MetastockDataFormatter(use_schema_payload=True)]:
+            events = Stream()
+            for line in self.lines:
+                events.add_item(line)
+            events.close()
+            matches = Stream()
+            CEP([pattern]).run(events, matches, data_formatter)
+            results.append([str(match) for match in matches])
+        assert len(results[0]) > 0, "Event: no matches found"
+        assert results[0] == results[1], "Event: schema-backed payloads yield different matches"
+
+    def run_tests(self):
+        self.test_compact_representation()
+        self.test_schema_payload_evaluation()
+
+
+class TestParallelEventParser:
+    def __init__(self):
+        with open(SHORT_FILE_PATH) as f:
+            self.lines = f.readlines()
+
+    def test_parsing(self):
+        event_types = {"AAPL", "AMZN"}
+        for data_formatter in [MetastockDataFormatter(), MetastockDataFormatter(use_schema_payload=True)]:
+            expected_events = [Event(line, data_formatter, index) for index, line in enumerate(self.lines, 10)]
+            expected_events = [event for event in expected_events if event.type in event_types]
+            parser = ParallelEventParser(data_formatter, event_types, processes_number=3, chunk_size=7)
+            events = list(parser.parse(iter(self.lines), first_index=10))
+            assert [(event.index, event.type, event.timestamp, event.probability, dict(event.payload.items()))
+                    for event in events] == \
+                   [(event.index, event.type, event.timestamp, event.probability, dict(event.payload.items()))
+                    for event in expected_events], "ParallelEventParser: incorrect events"
+            assert type(events[0].payload) == type(expected_events[0].payload), \
+                "ParallelEventParser: incorrect payload type"
+            assert parser.get_skipped_events_count() == len(self.lines) - len(expected_events), \
+                "ParallelEventParser: incorrect number of skipped events"
+            assert events[0].type is sys.intern("".join(events[0].type)), \
+                "ParallelEventParser: the event type is not interned"
+
+    def test_evaluation(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b")),
+            GreaterThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("b", lambda x: x["Opening Price"])),
+            timedelta(minutes=5),
+            ConsumptionPolicy(contiguous=["a", "b"])
+        )
+        results = []
+        skipped_events_counts = []
+        for parsing_processes_number in [0, 2]:
+            events = Stream()
+            for line in self.lines:
+                events.add_item(line)
+            events.close()
+            matches = Stream()
+            cep = CEP([pattern], TreeBasedEvaluationMechanismParameters(parsing_processes_number=parsing_processes_number,
+                                                                        parsing_chunk_size=5))
+            cep.run(events, matches, MetastockDataFormatter())
+            results.append([[(event.index, str(event)) for event in match.events] for match in matches])
+            skipped_events_counts.append(cep.get_skipped_events_count())
+        assert len(results[0]) > 0, "ParallelEventParser: no matches found"
+        assert results[0] == results[1], "ParallelEventParser: parallel parsing yields different matches"
+        assert skipped_events_counts[0] == skipped_events_counts[1] > 0, \
+            "ParallelEventParser: incorrect number of skipped events"
+
+    def run_tests(self):
+        self.test_parsing()
+        self.test_evaluation()
+
+
+class TestEpochTimestamps:
+    def __init__(self):
+        with open(SHORT_FILE_PATH) as f:
+            self.lines = f.readlines()
+
+    @staticmethod
+    def test_conversions():
+        timestamp = datetime(2020, 3, 1, 12, 30, 15, 250001)
+        assert convert_timestamp(timestamp, TimestampTypes.DATETIME) is timestamp, \
+            "EpochTimestamps: a datetime timestamp was converted"
+        milliseconds = convert_timestamp(timestamp, TimestampTypes.EPOCH_MILLISECONDS)
+        nanoseconds = convert_timestamp(timestamp, TimestampTypes.EPOCH_NANOSECONDS)
+        assert milliseconds == 1583065815250 and nanoseconds == 1583065815250001000, \
+            "EpochTimestamps: incorrect epoch timestamp"
+        assert convert_timestamp(timestamp.replace(tzinfo=timezone(timedelta(hours=2))),
+                                 TimestampTypes.EPOCH_MILLISECONDS) == milliseconds - 2 * 3600 * 1000, \
+            "EpochTimestamps: incorrect epoch timestamp of an aware datetime"
+        assert convert_timestamp(milliseconds, TimestampTypes.EPOCH_MILLISECONDS) == milliseconds, \
+            "EpochTimestamps: an integer timestamp was converted"
+        assert convert_to_datetime(nanoseconds, TimestampTypes.EPOCH_NANOSECONDS) == timestamp and \
+            convert_to_datetime(milliseconds, TimestampTypes.EPOCH_MILLISECONDS) == timestamp.replace(microsecond=250000), \
+            "EpochTimestamps: incorrect datetime"
+        window = timedelta(minutes=5, microseconds=1500)
+        assert convert_time_window(window, TimestampTypes.DATETIME) == window and \
+            convert_time_window(window, TimestampTypes.EPOCH_MILLISECONDS) == 300001 and \
+            convert_time_window(window, TimestampTypes.EPOCH_NANOSECONDS) == 300001500000, \
+            "EpochTimestamps: incorrect time window"
+
+    def test_data_formatter(self):
+        data_formatter = EpochTimestampDataFormatter(MetastockDataFormatter(), TimestampTypes.EPOCH_MILLISECONDS)
+        event = Event(self.lines[0], data_formatter, 0)
+        expected_event = Event(self.lines[0], MetastockDataFormatter(), 0)
+        assert event.timestamp == convert_timestamp(expected_event.timestamp, TimestampTypes.EPOCH_MILLISECONDS), \
+            "EpochTimestamps: incorrect event timestamp"
+        assert dict(event.payload.items()) == dict(expected_event.payload.items()) and event.type == expected_event.type, \
+            "EpochTimestamps: incorrect event"
+        assert data_formatter.get_raw_event_timestamp(self.lines[0]) == event.timestamp, \
+            "EpochTimestamps: incorrect raw event timestamp"
+        assert pickle.loads(pickle.dumps(data_formatter)).get_event_timestamp(event.payload) == event.timestamp, \
+            "EpochTimestamps: incorrect timestamp after pickling"
+
+    @staticmethod
+    def __create_patterns():
+        sequence_pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), PrimitiveEventStructure("AMZN", "b"),
+                        PrimitiveEventStructure("GOOG", "c")),
+            SmallerThanCondition(Variable("a", lambda x: x["Opening Price"]),
+                                 Variable("c", lambda x: x["Opening Price"])),
+            timedelta(minutes=3)
+        )
+        negation_pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AAPL", "a"), NegationOperator(PrimitiveEventStructure("AMZN", "b")),
+                        PrimitiveEventStructure("GOOG", "c")),
+            TrueCondition(),
+            timedelta(minutes=2)
+        )
+        return [sequence_pattern, negation_pattern]
+
+    def __get_matches(self, patterns, eval_mechanism_params):
+        events = Stream()
+        for line in self.lines:
+            events.add_item(line)
+        events.close()
+        matches = Stream()
+        CEP(patterns, eval_mechanism_params).run(events, matches, MetastockDataFormatter())
+        return sorted([(tuple(match.pattern_ids), tuple(event.index for event in match.events)) for match in matches])
+
+    def test_evaluation(self):
+        for tree_update_type in [TreeEvaluationMechanismUpdateTypes.TRIVIAL_TREE_EVALUATION,
+                                 TreeEvaluationMechanismUpdateTypes.SIMULTANEOUS_TREE_EVALUATION]:
+            for pattern_index in range(2):
+                results = []
+                for timestamp_type in TimestampTypes:
+                    optimizer_params = StatisticsDeviationAwareOptimizerParameters(
+                        statistics_updates_wait_time=timedelta(minutes=1))
+                    eval_mechanism_params = TreeBasedEvaluationMechanismParameters(optimizer_params=optimizer_params,
+                                                                                   tree_update_type=tree_update_type,
+                                                                                   timestamp_type=timestamp_type)
+                    results.append(self.__get_matches([self.__create_patterns()[pattern_index]],
+                                                      eval_mechanism_params))
+                assert len(results[0]) > 0, "EpochTimestamps: no matches found"
+                assert results[0] == results[1] == results[2], \
+                    "EpochTimestamps: epoch timestamps yield different matches"
+        results = [self.__get_matches(self.__create_patterns(),
+                                      TreeBasedEvaluationMechanismParameters(timestamp_type=timestamp_type))
+                   for timestamp_type in TimestampTypes]
+        assert len(results[0]) > 0, "EpochTimestamps: no multi-pattern matches found"
+        assert results[0] == results[1] == results[2], \
+            "EpochTimestamps: epoch timestamps yield different multi-pattern matches"
+
+    def run_tests(self):
+        self.test_conversions()
+        self.test_data_formatter()
+        self.test_evaluation()
@@ -0,0 +1,938 @@
+import asyncio
+import bz2
+import csv
+import gzip
+import json
+import lzma
+import os
+import pathlib
+import socket
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from CEP import CEP
+from base.Event import Event
+from base.Pattern import Pattern
+from base.PatternStructure import SeqOperator, PrimitiveEventStructure
+from base.PatternMatch import PatternMatch
+from condition.Condition import TrueCondition
+from plugin.sensors.Sensors import SensorsDataFormatter
+from plugin.stocks.Stocks import MetastockDataFormatter
+from stream.AsyncStream import AsyncStream
+from stream.BinaryFileStream import BinaryEventFileWriter, BinaryFileInputStream, ParsedEventDataFormatter, \
+    TimestampedPayload, convert_to_binary_event_file
+from stream.BoundedStream import BoundedStream
+from stream.CompressedFileStream import CompressedFileInputStream
+from stream.CompressionTypes import CompressionTypes
+from stream.EventLog import FileEventLog, ListEventLog
+from stream.FollowedFileStream import FollowedFileInputStream
+from stream.FileStream import FileInputStream, FileOutputStream
+from stream.MergedStream import MergedFileInputStream
+from stream.MatchSerializer import JSONLinesMatchSerializer, CSVMatchSerializer
+from stream.ReorderedStream import ReorderedInputStream
+from stream.SocketStream import SocketInputStream, SocketReplayServer
+from stream.Stream import Stream
+from stream.StreamOverflowPolicies import StreamOverflowPolicies
+
+currentPath = pathlib.Path(os.path.dirname(__file__))
+absolutePath = str(currentPath.parent.parent)
+TINY_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_TINY.txt")
+SENSORS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/Sensors_short.dat")
+THREE_TICKERS_FILE_PATH = os.path.join(absolutePath, "test/EventFiles/NASDAQ_AAPL_AMZN_GOOG.txt")
+
+
+def run_stream_tests():
+    stream_test = TestStream()
+    stream_test.run_tests()
+    bounded_stream_test = TestBoundedStream()
+    bounded_stream_test.run_tests()
+    file_input_stream_test = TestFileInputStream()
+    file_input_stream_test.run_tests()
+    file_output_stream_test = TestFileOutputStream()
+    file_output_stream_test.run_tests()
+    binary_file_input_stream_test = TestBinaryFileInputStream()
+    binary_file_input_stream_test.run_tests()
+    compressed_file_input_stream_test = TestCompressedFileInputStream()
+    compressed_file_input_stream_test.run_tests()
+    merged_file_input_stream_test = TestMergedFileInputStream()
+    merged_file_input_stream_test.run_tests()
+    async_stream_test = TestAsyncStream()
+    async_stream_test.run_tests()
+    socket_input_stream_test = TestSocketInputStream()
+    socket_input_stream_test.run_tests()
+    reordered_input_stream_test = TestReorderedInputStream()
+    reordered_input_stream_test.run_tests()
+    followed_file_input_stream_test = TestFollowedFileInputStream()
+    followed_file_input_stream_test.run_tests()
+    event_log_test = TestEventLog()
+    event_log_test.run_tests()
+    print("Stream unit tests executed successfully.")
+
+
+"""
+STREAM
+"""
+
+
+class TestStream:
+    def __init__(self):
+        self.items = [7, 7, 8, 9, 1, 7, 3]
+
+    def test_add_and_read(self, is_thread_safe: bool):
+        s = Stream(is_thread_safe)
+        for item in self.items:
+            s.add_item(item)
+        s.close()
+        assert s.is_thread_safe() == is_thread_safe, "Stream: incorrect thread safety mode"
+        assert s.count() == len(self.items) + 1, "Stream: incorrect count"
+        assert s.first() == self.items[0], "Stream: incorrect first item"
+        assert s.last() == self.items[-1], "Stream: incorrect last item"
+        duplicate = s.duplicate()
+        assert list(s) == self.items, "Stream: incorrect items"
+        assert list(duplicate) == self.items, "Stream: duplicate returned incorrect items"
+        assert duplicate.is_thread_safe() == is_thread_safe, "Stream: duplicate has incorrect thread safety mode"
+
+    def test_read_from_empty_unsynchronized_stream(self):
+        s = Stream(is_thread_safe=False)
+        try:
+            s.get_item()
+        except StopIteration:
+            assert False, "Stream: reading an empty unsynchronized stream was treated as the end of the stream"
+        except Exception:
+            return
+        assert False, "Stream: reading an empty unsynchronized stream did not fail"
+
+    def run_tests(self):
+        self.test_add_and_read(is_thread_safe=True)
+        self.test_add_and_read(is_thread_safe=False)
+        self.test_read_from_empty_unsynchronized_stream()
+
+
+"""
+BOUNDED STREAM
+"""
+
+
+class TestBoundedStream:
+    def __init__(self):
+        self.items = list(range(10))
+        self.capacity = 3
+
+    def test_block(self):
+        s = BoundedStream(self.capacity, StreamOverflowPolicies.BLOCK)
+        consumed_items = []
+
+        def consume():
+            # let the producer fill the stream before starting to read
+            time.sleep(0.1)
+            consumed_items.extend(s)
+
+        consumer = threading.Thread(target=consume)
+        consumer.start()
+        for item in self.items:
+            s.add_item(item)
+            assert s.count() <= self.capacity, "BoundedStream: capacity exceeded under BLOCK policy"
+        s.close()
+        consumer.join()
+        assert consumed_items == self.items, "BoundedStream: incorrect items under BLOCK policy"
+        assert s.get_blocked_count() > 0, "BoundedStream: the producer was never blocked"
+        assert s.get_blocked_time() > 0, "BoundedStream: no blocked time recorded"
+        assert s.get_dropped_items_count() == 0, "BoundedStream: items dropped under BLOCK policy"
+
+    def test_drop(self, policy: StreamOverflowPolicies, expected_items: list):
+        s = BoundedStream(self.capacity, policy)
+        for item in self.items:
+            s.add_item(item)
+        # the end-of-stream marker is never dropped
+        s.close()
+        assert list(s) == expected_items, "BoundedStream: incorrect items under %s policy" % (policy,)
+        assert s.get_dropped_items_count() == len(self.items) - self.capacity, \
+            "BoundedStream: incorrect dropped items count under %s policy" % (policy,)
+        assert s.get_blocked_count() == 0, "BoundedStream: the producer was blocked under %s policy" % (policy,)
+
+    def test_spill(self):
+        s = BoundedStream(self.capacity, StreamOverflowPolicies.SPILL)
+        for item in self.items:
+            s.add_item(item)
+        assert s.count() == len(self.items), "BoundedStream: incorrect count under SPILL policy"
+        assert s.get_spilled_items_count() == len(self.items) - self.capacity, \
+            "BoundedStream: incorrect spilled items count"
+        # interleave reads and writes to make sure the order is preserved across the memory and the disk
+        read_items = [s.get_item() for _ in range(5)]
+        s.add_item(10)
+        s.close()
+        read_items.extend(s)
+        assert read_items == self.items + [10], "BoundedStream: incorrect items under SPILL policy"
+        assert s.get_dropped_items_count() == 0, "BoundedStream: items dropped under SPILL policy"
+
+    def run_tests(self):
+        self.test_block()
+        self.test_drop(StreamOverflowPolicies.DROP_OLDEST, self.items[-self.capacity:])
+        self.test_drop(StreamOverflowPolicies.DROP_NEWEST, self.items[:self.capacity])
+        self.test_spill()
+
+
+"""
+FILE INPUT STREAM
+"""
+
+
+class TestFileInputStream:
+    def __init__(self):
+        with open(TINY_FILE_PATH, "r") as f:
+            self.lines = f.readlines()
+
+    def test_read(self):
+        lazy_stream = FileInputStream(TINY_FILE_PATH)
+        eager_stream = FileInputStream(TINY_FILE_PATH, is_lazy=False)
+        assert list(lazy_stream) == self.lines, "FileInputStream: lazy stream returned incorrect lines"
+        assert list(eager_stream) == self.lines, "FileInputStream: eager stream returned incorrect lines"
+        assert list(lazy_stream) == [], "FileInputStream: exhausted lazy stream returned lines"
+
+    def test_first_last_count(self):
+        s = FileInputStream(TINY_FILE_PATH)
+        assert s.first() == self.lines[0], "FileInputStream: incorrect first line"
+        assert s.last() == self.lines[-1], "FileInputStream: incorrect last line"
+        assert s.count() == len(self.lines), "FileInputStream: incorrect count"
+        s.get_item()
+        s.get_item()
+        # first(), last() and count() are relative to the current position and do not consume the stream
+        assert s.first() == self.lines[2], "FileInputStream: incorrect first line after reading"
+        assert s.count() == len(self.lines) - 2, "FileInputStream: incorrect count after reading"
+        assert s.get_item() == self.lines[2], "FileInputStream: first() consumed the stream"
+
+    def test_duplicate(self):
+        s = FileInputStream(TINY_FILE_PATH)
+        for _ in range(3):
+            s.get_item()
+        duplicate = s.duplicate()
+        assert list(duplicate) == self.lines[3:], "FileInputStream: duplicate did not replay the remaining lines"
+        assert list(s) == self.lines[3:], "FileInputStream: reading the duplicate affected the original stream"
+        assert list(s.duplicate()) == [], "FileInputStream: duplicate of an exhausted stream returned lines"
+
+    def test_close(self):
+        s = FileInputStream(TINY_FILE_PATH)
+        s.get_item()
+        s.close()
+        assert list(s) == [], "FileInputStream: closed stream returned lines"
+
+    def run_tests(self):
+        self.test_read()
+        self.test_first_last_count()
+        self.test_duplicate()
+        self.test_close()
+
+
+"""
+FILE OUTPUT STREAM
+"""
+
+
+class TestFileOutputStream:
+    def __init__(self):
+        data_formatter = MetastockDataFormatter()
+        with open(TINY_FILE_PATH, "r") as f:
+            events = [Event(line, data_formatter, index) for index, line in enumerate(f.readlines())]
+        self.matches = [PatternMatch(events[i:i + 2]) for i in range(0, len(events) - 1, 2)]
+        self.matches[0].add_pattern_id(1)
+        self.matches[0].add_pattern_id(2)
+        self.expected_output = "".join(str(match) for match in self.matches)
+
+    @staticmethod
+    def __read_output(directory: str, file_name: str):
+        with open(os.path.join(directory, file_name), "r") as f:
+            return f.read()
+
+    def test_write_modes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for file_name, kwargs in [("deferred.txt", {}),
+                                      ("async.txt", {"is_async": True}),
+                                      ("buffered.txt", {"flush_size": 3})]:
+                s = FileOutputStream(directory, file_name, **kwargs)
+                for match in self.matches:
+                    s.add_item(match)
+                s.close()
+                assert self.__read_output(directory, file_name) == self.expected_output, \
+                    "FileOutputStream: incorrect output in %s" % (file_name,)
+
+    def test_buffered_flush(self):
+        with tempfile.TemporaryDirectory() as directory:
+            flush_size = 3
+            s = FileOutputStream(directory, "buffered.txt", flush_size=flush_size)
+            for match in self.matches[:flush_size - 1]:
+                s.add_item(match)
+            assert self.__read_output(directory, "buffered.txt") == "", \
+                "FileOutputStream: buffer flushed before reaching the flush size"
+            s.add_item(self.matches[flush_size - 1])
+            assert self.__read_output(directory, "buffered.txt") == \
+                "".join(str(match) for match in self.matches[:flush_size]), \
+                "FileOutputStream: buffer not flushed upon reaching the flush size"
+            s.close()
+
+            s = FileOutputStream(directory, "interval.txt", flush_interval=0)
+            s.add_item(self.matches[0])
+            assert self.__read_output(directory, "interval.txt") == str(self.matches[0]), \
+                "FileOutputStream: buffer not flushed upon expiration of the flush interval"
+            s.close()
+
+    def test_serializers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            s = FileOutputStream(directory, "matches.jsonl", serializer=JSONLinesMatchSerializer(), flush_size=2)
+            for match in self.matches:
+                s.add_item(match)
+            s.close()
+            with open(os.path.join(directory, "matches.jsonl"), "r") as f:
+                lines = f.readlines()
+            assert len(lines) == len(self.matches), "JSONLinesMatchSerializer: incorrect number of lines"
+            first_match = json.loads(lines[0])
+            assert first_match["pattern_ids"] == [1, 2], "JSONLinesMatchSerializer: incorrect pattern IDs"
+            assert [event["index"] for event in first_match["events"]] == \
+                [event.payload[Event.INDEX_ATTRIBUTE_NAME] for event in self.matches[0].events], \
+                "JSONLinesMatchSerializer: incorrect event indices"
+            assert first_match["events"][0]["payload"]["Stock Ticker"] == "AAPL", \
+                "JSONLinesMatchSerializer: incorrect payload"
+            assert Event.INDEX_ATTRIBUTE_NAME not in first_match["events"][0]["payload"], \
+                "JSONLinesMatchSerializer: internal attribute written"
+
+            s = FileOutputStream(directory, "matches.csv", serializer=CSVMatchSerializer())
+            for match in self.matches:
+                s.add_item(match)
+            s.close()
+            with open(os.path.join(directory, "matches.csv"), "r") as f:
+                rows = list(csv.reader(f))
+            assert len(rows) == sum(len(match.events) for match in self.matches), \
+                "CSVMatchSerializer: incorrect number of rows"
+            assert rows[0][:4] == ["0", "1 2", str(self.matches[0].events[0].payload[Event.INDEX_ATTRIBUTE_NAME]),
+                                   "AAPL"], "CSVMatchSerializer: incorrect row"
+            assert rows[-1][0] == str(len(self.matches) - 1), "CSVMatchSerializer: incorrect match numbering"
+
+    def run_tests(self):
+        self.test_write_modes()
+        self.test_buffered_flush()
+        self.test_serializers()
+
+
+"""
+BINARY FILE INPUT STREAM
+"""
+
+
+class TestBinaryFileInputStream:
+    @staticmethod
+    def __parse_file(file_path: str, data_formatter):
+        with open(file_path, "r") as f:
+            return [data_formatter.parse_event(line) for line in f]
+
+    def test_convert_and_read(self, file_path: str, data_formatter):
+        expected_payloads = self.__parse_file(file_path, data_formatter)
+        with tempfile.TemporaryDirectory() as directory:
+            binary_file_path = os.path.join(directory, "events.bin")
+            convert_to_binary_event_file(file_path, binary_file_path, data_formatter)
+            s = BinaryFileInputStream(binary_file_path)
+            assert s.count() == len(expected_payloads), "BinaryFileInputStream: incorrect count"
+            assert s.first() == expected_payloads[0], "BinaryFileInputStream: incorrect first payload"
+            assert s.last() == expected_payloads[-1], "BinaryFileInputStream: incorrect last payload"
+            payloads = list(s)
+            assert payloads == expected_payloads, "BinaryFileInputStream: incorrect payloads"
+            for payload, expected_payload in zip(payloads, expected_payloads):
+                assert [type(value) for value in payload.values()] == \
+                    [type(value) for value in expected_payload.values()], "BinaryFileInputStream: incorrect types"
+
+            parsed_event_data_formatter = ParsedEventDataFormatter(data_formatter)
+            event = Event(BinaryFileInputStream(binary_file_path).first(), parsed_event_data_formatter, 0)
+            assert event.type == data_formatter.get_event_type(expected_payloads[0]), \
+                "ParsedEventDataFormatter: incorrect event type"
+            assert event.timestamp == data_formatter.get_event_timestamp(expected_payloads[0]), \
+                "ParsedEventDataFormatter: incorrect event timestamp"
+            # the stored timestamps are returned without consulting the source formatter
+            stored_timestamps = [parsed_event_data_formatter.get_event_timestamp(payload) for payload in payloads]
+            assert stored_timestamps == [data_formatter.get_event_timestamp(payload) for payload in expected_payloads] \
+                and all(isinstance(payload, TimestampedPayload) for payload in payloads), \
+                "BinaryFileInputStream: incorrect stored timestamps"
+
+    def test_without_timestamps(self):
+        data_formatter = MetastockDataFormatter()
+        expected_payloads = self.__parse_file(TINY_FILE_PATH, data_formatter)
+        with tempfile.TemporaryDirectory() as directory:
+            binary_file_path = os.path.join(directory, "events.bin")
+            writer = BinaryEventFileWriter(binary_file_path)
+            for payload in expected_payloads:
+                writer.write(payload)
+            writer.close()
+            s = BinaryFileInputStream(binary_file_path)
+            assert s.last() == expected_payloads[-1], "BinaryFileInputStream: incorrect last payload"
+            payloads = list(s)
+            assert payloads == expected_payloads and all(type(payload) is dict for payload in payloads), \
+                "BinaryFileInputStream: incorrect payloads without timestamps"
+            assert ParsedEventDataFormatter(data_formatter).get_event_timestamp(payloads[0]) == \
+                data_formatter.get_event_timestamp(expected_payloads[0]), \
+                "ParsedEventDataFormatter: incorrect event timestamp without a stored timestamp"
+
+    def test_duplicate(self):
+        data_formatter = MetastockDataFormatter()
+        expected_payloads = self.__parse_file(TINY_FILE_PATH, data_formatter)
+        with tempfile.TemporaryDirectory() as directory:
+            binary_file_path = os.path.join(directory, "events.bin")
+            convert_to_binary_event_file(TINY_FILE_PATH, binary_file_path, data_formatter)
+            s = BinaryFileInputStream(binary_file_path)
+            for _ in range(3):
+                s.get_item()
+            duplicate = s.duplicate()
+            assert duplicate.count() == len(expected_payloads) - 3, "BinaryFileInputStream: incorrect duplicate count"
+            assert list(duplicate) == expected_payloads[3:], \
+                "BinaryFileInputStream: duplicate did not replay the remaining payloads"
+            assert list(s) == expected_payloads[3:], \
+                "BinaryFileInputStream: reading the duplicate affected the original stream"
+            s.close()
+            assert list(s.duplicate()) == [], "BinaryFileInputStream: duplicate of a closed stream returned payloads"
+
+    def run_tests(self):
+        self.test_convert_and_read(TINY_FILE_PATH, MetastockDataFormatter())
+        self.test_convert_and_read(SENSORS_FILE_PATH, SensorsDataFormatter())
+        self.test_duplicate()
+        self.test_without_timestamps()
+
+
+"""
+COMPRESSED FILE INPUT STREAM
+"""
+
+
+class TestCompressedFileInputStream:
+    def __init__(self):
+        with open(TINY_FILE_PATH, "r") as f:
+            self.lines = f.readlines()
+
+    def __create_compressed_file(self, directory: str, file_name: str, open_function):
+        file_path = os.path.join(directory, file_name)
+        with open_function(file_path, "wt") as f:
+            f.writelines(self.lines)
+        return file_path
+
+    def test_read(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for file_name, open_function in [("events.gz", gzip.open), ("events.bz2", bz2.open),
+                                             ("events.xz", lzma.open)]:
+                file_path = self.__create_compressed_file(directory, file_name, open_function)
+                # a small chunk size makes sure that the lines are passed in multiple chunks
+                s = CompressedFileInputStream(file_path, chunk_size=4, prefetched_chunks_number=2)
+                assert list(s) == self.lines, "CompressedFileInputStream: incorrect lines in %s" % (file_name,)
+                assert list(s) == [], "CompressedFileInputStream: exhausted stream returned lines"
+            file_path = self.__create_compressed_file(directory, "events.dat", gzip.open)
+            s = CompressedFileInputStream(file_path, CompressionTypes.GZIP)
+            assert list(s) == self.lines, "CompressedFileInputStream: incorrect lines with explicit compression type"
+
+    def test_first_last_count_duplicate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = self.__create_compressed_file(directory, "events.gz", gzip.open)
+            s = CompressedFileInputStream(file_path, chunk_size=4, prefetched_chunks_number=1)
+            assert s.first() == self.lines[0], "CompressedFileInputStream: incorrect first line"
+            assert s.last() == self.lines[-1], "CompressedFileInputStream: incorrect last line"
+            assert s.count() == len(self.lines), "CompressedFileInputStream: incorrect count"
+            for _ in range(5):
+                s.get_item()
+            assert s.first() == self.lines[5], "CompressedFileInputStream: incorrect first line after reading"
+            assert s.count() == len(self.lines) - 5, "CompressedFileInputStream: incorrect count after reading"
+            duplicate = s.duplicate()
+            assert list(duplicate) == self.lines[5:], \
+                "CompressedFileInputStream: duplicate did not replay the remaining lines"
+            assert s.get_item() == self.lines[5], "CompressedFileInputStream: reading the duplicate affected the stream"
+            s.close()
+            assert list(s) == [], "CompressedFileInputStream: closed stream returned lines"
+            assert list(s.duplicate()) == [], "CompressedFileInputStream: duplicate of a closed stream returned lines"
+
+    def run_tests(self):
+        self.test_read()
+        self.test_first_last_count_duplicate()
+
+
+"""
+MERGED FILE INPUT STREAM
+"""
+
+
+class TestMergedFileInputStream:
+    def __init__(self):
+        # the events in this file are sorted by timestamp, and the events with equal timestamps are sorted by ticker
+        with open(THREE_TICKERS_FILE_PATH, "r") as f:
+            self.lines = f.readlines()
+        self.tickers = ["AAPL", "AMZN", "GOOG"]
+
+    def __split_by_ticker(self, directory: str, compress_last: bool = False):
+        """
+        Creates a separate file for each ticker and returns the list of the created files.
+        """
+        file_paths = []
+        for ticker in self.tickers:
+            ticker_lines = [line for line in self.lines if line.startswith(ticker + ",")]
+            if compress_last and ticker == self.tickers[-1]:
+                file_path = os.path.join(directory, "NASDAQ_%s.txt.gz" % (ticker,))
+                with gzip.open(file_path, "wt") as f:
+                    f.writelines(ticker_lines)
+            else:
+                file_path = os.path.join(directory, "NASDAQ_%s.txt" % (ticker,))
+                with open(file_path, "w") as f:
+                    f.writelines(ticker_lines)
+            file_paths.append(file_path)
+        return file_paths
+
+    def test_merge(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_paths = self.__split_by_ticker(directory)
+            # the files are deliberately given in the wrong order to make sure the events are merged by timestamp
+            s = MergedFileInputStream(list(reversed(file_paths)), MetastockDataFormatter())
+            merged_lines = list(s)
+            assert sorted(merged_lines) == sorted(self.lines), "MergedFileInputStream: incorrect lines"
+            data_formatter = MetastockDataFormatter()
+            timestamps = [data_formatter.get_event_timestamp(data_formatter.parse_event(line))
+                          for line in merged_lines]
+            assert timestamps == sorted(timestamps), "MergedFileInputStream: lines are not sorted by timestamp"
+
+            s = MergedFileInputStream(os.path.join(directory, "NASDAQ_*.txt"), MetastockDataFormatter())
+            assert list(s) == self.lines, "MergedFileInputStream: incorrect lines for a glob pattern"
+
+    def test_compressed_file_merge(self):
+        with tempfile.TemporaryDirectory() as directory:
+            s = MergedFileInputStream(self.__split_by_ticker(directory, compress_last=True), MetastockDataFormatter())
+            assert list(s) == self.lines, "MergedFileInputStream: incorrect lines with a compressed file"
+
+    def test_first_last_count_duplicate(self):
+        with tempfile.TemporaryDirectory() as directory:
+            s = MergedFileInputStream(self.__split_by_ticker(directory), MetastockDataFormatter())
+            assert s.count() == len(self.lines), "MergedFileInputStream: incorrect count"
+            assert s.first() == self.lines[0], "MergedFileInputStream: incorrect first line"
+            assert s.last() == self.lines[-1], "MergedFileInputStream: incorrect last line"
+            for _ in range(10):
+                s.get_item()
+            assert s.count() == len(self.lines) - 10, "MergedFileInputStream: incorrect count after reading"
+            assert s.first() == self.lines[10], "MergedFileInputStream: incorrect first line after reading"
+            duplicate = s.duplicate()
+            assert list(duplicate) == self.lines[10:], \
+                "MergedFileInputStream: duplicate did not replay the remaining lines"
+            assert list(s) == self.lines[10:], "MergedFileInputStream: reading the duplicate affected the stream"
+
+    def test_no_matching_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                MergedFileInputStream(os.path.join(directory, "*.txt"), MetastockDataFormatter())
+            except FileNotFoundError:
+                return
+            assert False, "MergedFileInputStream: no failure for a pattern matching no files"
+
+    def run_tests(self):
+        self.test_merge()
+        self.test_compressed_file_merge()
+        self.test_first_last_count_duplicate()
+        self.test_no_matching_files()
+
+
+"""
+ASYNC STREAM
+"""
+
+
+class TestAsyncStream:
+    def __init__(self):
+        self.items = [7, 7, 8, 9, 1, 7, 3]
+
+    @staticmethod
+    async def __produce(stream: AsyncStream, items: list, delay: float = 0):
+        for item in items:
+            stream.add_item(item)
+            await asyncio.sleep(delay)
+        stream.close()
+
+    @staticmethod
+    async def __consume(stream: AsyncStream):
+        return [item async for item in stream]
+
+    def test_add_and_read(self):
+        async def add_and_read():
+            s = AsyncStream()
+            consumer = asyncio.ensure_future(self.__consume(s))
+            await self.__produce(s, self.items, delay=0.001)
+            return await consumer
+        assert asyncio.run(add_and_read()) == self.items, "AsyncStream: incorrect items"
+
+    def test_yield_interval(self):
+        async def read_while_counting():
+            s = AsyncStream(yield_interval=2)
+            for item in self.items:
+                s.add_item(item)
+            s.close()
+            ticks = 0
+
+            async def count_ticks():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+            ticker = asyncio.ensure_future(count_ticks())
+            await asyncio.sleep(0)
+            items = await self.__consume(s)
+            ticker.cancel()
+            return items, ticks
+        items, ticks = asyncio.run(read_while_counting())
+        assert items == self.items, "AsyncStream: incorrect items"
+        assert ticks > 1, "AsyncStream: the consumer never yielded control to the event loop"
+
+    def test_run_async(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AMZN", "a"), PrimitiveEventStructure("AMZN", "b"),
+                        PrimitiveEventStructure("AMZN", "c")),
+            TrueCondition(),
+            timedelta(minutes=10)
+        )
+        with open(TINY_FILE_PATH) as f:
+            lines = f.readlines()
+
+        events = Stream()
+        for line in lines:
+            events.add_item(line)
+        events.close()
+        expected_matches = Stream()
+        CEP([pattern]).run(events, expected_matches, MetastockDataFormatter())
+
+        async def run_async():
+            async_events = AsyncStream()
+            async_matches = AsyncStream()
+            consumer = asyncio.ensure_future(self.__consume(async_matches))
+            producer = asyncio.ensure_future(self.__produce(async_events, lines, delay=0.0001))
+            await CEP([pattern]).run_async(async_events, async_matches, MetastockDataFormatter())
+            await producer
+            return await consumer
+        actual_matches = asyncio.run(run_async())
+        assert len(actual_matches) > 0, "CEP.run_async: no matches found"
+        assert [str(match) for match in actual_matches] == [str(match) for match in expected_matches], \
+            "CEP.run_async: matches differ from the synchronous evaluation"
+
+    def run_tests(self):
+        self.test_add_and_read()
+        self.test_yield_interval()
+        self.test_run_async()
+
+
+"""
+SOCKET INPUT STREAM
+"""
+
+
+class TestSocketInputStream:
+    def __init__(self):
+        with open(TINY_FILE_PATH) as f:
+            # the replay server terminates every record, including the last line of the file
+            self.lines = [line if line.endswith("\n") else line + "\n" for line in f]
+
+    def test_tcp_replay(self):
+        server = SocketReplayServer(TINY_FILE_PATH, connections_number=1)
+        server.start()
+        # a small receive buffer makes sure that records split between blocks are handled correctly
+        s = SocketInputStream(server.get_address(), receive_buffer_size=7)
+        assert list(s) == self.lines, "SocketInputStream: incorrect records over TCP"
+        server.join()
+        assert server.get_sent_lines_count() == len(self.lines), "SocketReplayServer: incorrect sent lines count"
+
+    def test_unix_replay(self):
+        if not hasattr(socket, "AF_UNIX"):
+            return
+        with tempfile.TemporaryDirectory() as directory:
+            address = os.path.join(directory, "replay.sock")
+            server = SocketReplayServer(TINY_FILE_PATH, address, rate=1000, connections_number=1)
+            server.start()
+            start_time = time.monotonic()
+            assert list(SocketInputStream(address)) == self.lines, \
+                "SocketInputStream: incorrect records over a Unix domain socket"
+            assert time.monotonic() - start_time >= (len(self.lines) - 1) / 1000, \
+                "SocketReplayServer: the replay rate was exceeded"
+            server.stop()
+            assert not os.path.exists(address), "SocketReplayServer: the socket file was not removed"
+
+    def test_reconnect(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+        middle = len(self.lines) // 2
+        # the first connection is closed right away, and the last record of the second one is incomplete and must be
+        # discarded upon reconnection
+        connections_data = [b"", "".join(self.lines[:middle]).encode() + b"partial",
+                            "".join(self.lines[middle:]).encode()]
+
+        def serve():
+            for i, data in enumerate(connections_data):
+                connection, _ = listener.accept()
+                connection.sendall(data)
+                if i == len(connections_data) - 1:
+                    # no further connection can be established once the last one is closed
+                    listener.close()
+                connection.close()
+        server_thread = threading.Thread(target=serve)
+        server_thread.start()
+        s = SocketInputStream(listener.getsockname(), reconnect_interval=0.01, reconnect_attempts=3,
+                              reconnect_on_close=True)
+        assert list(s) == self.lines, "SocketInputStream: incorrect records after reconnection"
+        assert s.get_reconnections_count() == 2, "SocketInputStream: incorrect reconnections count"
+        server_thread.join()
+
+    def test_invalid_reconnect_attempts(self):
+        try:
+            SocketInputStream(("127.0.0.1", 0), reconnect_attempts=-1)
+        except Exception:
+            return
+        assert False, "SocketInputStream: no failure for a negative number of reconnect attempts"
+
+    def test_last_record_without_separator(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        listener.listen()
+
+        def serve():
+            connection, _ = listener.accept()
+            connection.sendall(b"first\nsecond\nthird")
+            connection.close()
+            listener.close()
+        server_thread = threading.Thread(target=serve)
+        server_thread.start()
+        s = SocketInputStream(listener.getsockname())
+        assert list(s) == ["first\n", "second\n", "third"], "SocketInputStream: incorrect unterminated last record"
+        server_thread.join()
+
+    def test_connection_failure(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        listener.bind(("127.0.0.1", 0))
+        address = listener.getsockname()
+        # nobody listens on the address
+        listener.close()
+        s = SocketInputStream(address, reconnect_attempts=1, reconnect_interval=0.01)
+        try:
+            s.get_item()
+        except OSError:
+            return
+        assert False, "SocketInputStream: no failure for an unreachable source"
+
+    def run_tests(self):
+        self.test_tcp_replay()
+        self.test_unix_replay()
+        self.test_reconnect()
+        self.test_invalid_reconnect_attempts()
+        self.test_last_record_without_separator()
+        self.test_connection_failure()
+
+
+"""
+REORDERED INPUT STREAM
+"""
+
+
+class TestReorderedInputStream:
+    def __init__(self):
+        self.data_formatter = MetastockDataFormatter()
+        with open(THREE_TICKERS_FILE_PATH) as f:
+            self.lines = f.readlines()
+        # reversing each block of three consecutive lines delays some of the events by a few minutes at most
+        self.shuffled_lines = []
+        for i in range(0, len(self.lines), 3):
+            self.shuffled_lines.extend(reversed(self.lines[i:i + 3]))
+        self.max_delay = timedelta(0)
+        max_timestamp = None
+        for line in self.shuffled_lines:
+            timestamp = self.__get_timestamp(line)
+            if max_timestamp is not None and max_timestamp - timestamp > self.max_delay:
+                self.max_delay = max_timestamp - timestamp
+            if max_timestamp is None or timestamp > max_timestamp:
+                max_timestamp = timestamp
+        # a stable sort keeps the arrival order of the events with equal timestamps
+        self.sorted_lines = sorted(self.shuffled_lines, key=self.__get_timestamp)
+
+    def __get_timestamp(self, line: str):
+        return self.data_formatter.get_event_timestamp(self.data_formatter.parse_event(line))
+
+    def __create_input_stream(self, lines: list):
+        s = Stream()
+        for line in lines:
+            s.add_item(line)
+        s.close()
+        return s
+
+    def test_reorder(self):
+        assert self.max_delay > timedelta(0), "ReorderedInputStream: the test input is not shuffled"
+        s = ReorderedInputStream(self.__create_input_stream(self.shuffled_lines), self.data_formatter, self.max_delay)
+        assert list(s) == self.sorted_lines, "ReorderedInputStream: incorrect order of events"
+        assert s.get_late_events_count() == 0, "ReorderedInputStream: unexpected late events"
+
+    def test_late_events(self):
+        lines = list(self.lines)
+        # move an early event far ahead
+        late_line = lines.pop(1)
+        lines.insert(len(lines) // 2, late_line)
+        s = ReorderedInputStream(self.__create_input_stream(lines), self.data_formatter, timedelta(minutes=1))
+        released_lines = list(s)
+        assert s.get_late_events_count() == 1, "ReorderedInputStream: incorrect late events count"
+        assert late_line not in released_lines, "ReorderedInputStream: a late event was released"
+        assert released_lines == sorted(released_lines, key=self.__get_timestamp), \
+            "ReorderedInputStream: the events are not sorted"
+
+    def test_duplicate(self):
+        s = ReorderedInputStream(self.__create_input_stream(self.shuffled_lines), self.data_formatter, self.max_delay)
+        for _ in range(10):
+            s.get_item()
+        assert s.first() == self.sorted_lines[10], "ReorderedInputStream: incorrect first event"
+        assert s.last() == self.sorted_lines[-1], "ReorderedInputStream: incorrect last event"
+        assert s.count() == len(self.sorted_lines) - 10, "ReorderedInputStream: incorrect count"
+        assert list(s.duplicate()) == self.sorted_lines[10:], "ReorderedInputStream: incorrect duplicate"
+        assert list(s) == self.sorted_lines[10:], "ReorderedInputStream: reading the duplicate affected the stream"
+
+    def test_evaluation(self):
+        pattern = Pattern(
+            SeqOperator(PrimitiveEventStructure("AMZN", "a"), PrimitiveEventStructure("GOOG", "b")),
+            TrueCondition(),
+            timedelta(minutes=3)
+        )
+        expected_matches = Stream()
+        CEP([pattern]).run(self.__create_input_stream(self.sorted_lines), expected_matches, self.data_formatter)
+        actual_matches = Stream()
+        events = ReorderedInputStream(self.__create_input_stream(self.shuffled_lines), self.data_formatter,
+                                      self.max_delay)
+        CEP([pattern]).run(events, actual_matches, self.data_formatter)
+        expected_matches = [str(match) for match in expected_matches]
+        assert len(expected_matches) > 0, "ReorderedInputStream: no matches found"
+        assert [str(match) for match in actual_matches] == expected_matches, \
+            "ReorderedInputStream: the matches differ from the ones found on the sorted input"
+
+    def run_tests(self):
+        self.test_reorder()
+        self.test_late_events()
+        self.test_duplicate()
+        self.test_evaluation()
+
+
+"""
+FOLLOWED FILE INPUT STREAM
+"""
+
+
+class TestFollowedFileInputStream:
+    def __init__(self):
+        with open(TINY_FILE_PATH) as f:
+            self.lines = [line if line.endswith("\n") else line + "\n" for line in f]
+
+    @staticmethod
+    def __append(file_path: str, lines: list):
+        with open(file_path, "a") as f:
+            f.writelines(lines)
+
+    def __write_in_background(self, file_path: str, operations: list, delay: float = 0.02):
+        """
+        Performs the given operations on the followed file one by one in a separate thread.
+        """
+        def write():
+            for operation in operations:
+                time.sleep(delay)
+                operation()
+        writer = threading.Thread(target=write)
+        writer.start()
+        return writer
+
+    def test_follow(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "events.txt")
+            self.__append(file_path, self.lines[:3])
+            s = FollowedFileInputStream(file_path, idle_timeout=0.2)
+            middle_line = self.lines[3]
+            writer = self.__write_in_background(file_path, [
+                # a line written in two parts must be returned as a whole
+                lambda: self.__append(file_path, [middle_line[:5]]),
+                lambda: self.__append(file_path, [middle_line[5:]] + self.lines[4:]),
+            ])
+            assert list(s) == self.lines, "FollowedFileInputStream: incorrect lines"
+            writer.join()
+
+    def test_stop_and_start_at_end(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "events.txt")
+            self.__append(file_path, self.lines[:3])
+            s = FollowedFileInputStream(file_path, start_at_end=True)
+            writer = self.__write_in_background(file_path, [
+                lambda: self.__append(file_path, self.lines[3:] + ["unterminated"]),
+                s.stop
+            ])
+            assert list(s) == self.lines[3:] + ["unterminated"], \
+                "FollowedFileInputStream: incorrect lines after stop"
+            writer.join()
+
+    def test_rotation(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, "events.txt")
+            self.__append(file_path, self.lines[:3])
+            # frequent polling makes sure that each change of the file is noticed before the next one
+            s = FollowedFileInputStream(file_path, idle_timeout=0.5, min_poll_interval=0.005, max_poll_interval=0.005)
+            writer = self.__write_in_background(file_path, [
+                lambda: self.__append(file_path, self.lines[3:5]),
+                lambda: os.rename(file_path, file_path + ".1"),
+                lambda: self.__append(file_path, self.lines[5:7]),
+                # truncating the file to a smaller size than the current position
+                lambda: open(file_path, "w").close(),
+                lambda: self.__append(file_path, self.lines[7:8]),
+            ], delay=0.1)
+            assert list(s) == self.lines[:8], "FollowedFileInputStream: incorrect lines after rotation"
+            assert s.get_rotations_count() == 2, "FollowedFileInputStream: incorrect rotations count"
+            writer.join()
+
+    def run_tests(self):
+        self.test_follow()
+        self.test_stop_and_start_at_end()
+        self.test_rotation()
+
+
+"""
+EVENT LOG
+"""
+
+
+class TestEventLog:
+    def __init__(self):
+        with open(SENSORS_FILE_PATH) as f:
+            self.lines = f.readlines()
+
+    def test_cursors(self, event_log):
+        assert len(event_log) == len(self.lines), "EventLog: incorrect length"
+        first_cursor = event_log.create_cursor()
+        second_cursor = event_log.create_cursor()
+        for _ in range(10):
+            first_cursor.get_item()
+        assert second_cursor.first() == self.lines[0], "EventLog: cursors are not independent"
+        assert first_cursor.first() == self.lines[10], "EventLog: incorrect first item"
+        assert first_cursor.last() == self.lines[-1], "EventLog: incorrect last item"
+        assert first_cursor.count() == len(self.lines) - 10, "EventLog: incorrect count"
+        duplicate = first_cursor.duplicate()
+        assert list(duplicate) == self.lines[10:], "EventLog: incorrect duplicate"
+        assert list(first_cursor) == self.lines[10:], "EventLog: reading the duplicate affected the cursor"
+        assert list(second_cursor) == self.lines, "EventLog: incorrect items"
+        assert first_cursor.first() is None and first_cursor.count() == 0, "EventLog: exhausted cursor is not empty"
+        assert list(event_log.create_cursor(len(self.lines) - 2)) == self.lines[-2:], \
+            "EventLog: incorrect items from a start index"
+
+    def test_file_event_log_edge_cases(self):
+        with tempfile.TemporaryDirectory() as directory:
+            empty_file_path = os.path.join(directory, "empty.txt")
+            open(empty_file_path, "w").close()
+            event_log = FileEventLog(empty_file_path)
+            assert list(event_log.create_cursor()) == [], "FileEventLog: incorrect items of an empty file"
+            event_log.close()
+
+            file_path = os.path.join(directory, "events.txt")
+            with open(file_path, "wb") as f:
+                f.write(b"first\r\nsecond\nthird")
+            event_log = FileEventLog(file_path)
+            with open(file_path) as f:
+                assert list(event_log.create_cursor()) == f.readlines(), \
+                    "FileEventLog: lines differ from the ones read in text mode"
+            event_log.close()
+
+    def run_tests(self):
+        self.test_cursors(ListEventLog(self.lines))
+        file_event_log = FileEventLog(SENSORS_FILE_PATH)
+        self.test_cursors(file_event_log)
+        file_event_log.close()
+        self.test_file_event_log_edge_cases()
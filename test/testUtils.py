@@ -1,3 +1,4 @@
+import atexit
 import os
 import pathlib
 import sys
@@ -6,6 +7,7 @@ from CEP import CEP
 from evaluation.EvaluationMechanismFactory import TreeBasedEvaluationMechanismParameters
 from adaptive.optimizer.OptimizerFactory import StatisticsDeviationAwareOptimizerParameters
 from stream.Stream import OutputStream
+from stream.EventLog import FileEventLog
 from stream.FileStream import FileInputStream, FileOutputStream
 from misc.Utils import generate_matches
 from plan.TreeCostModels import TreeCostModels
@@ -30,7 +32,10 @@ nasdaqEventStreamShort = FileInputStream(os.path.join(absolutePath, "test/EventF
 nasdaqEventStreamMedium = FileInputStream(os.path.join(absolutePath, "test/EventFiles/NASDAQ_MEDIUM.txt"))
 nasdaqEventStreamFrequencyTailored = FileInputStream(os.path.join(absolutePath, "test/EventFiles/NASDAQ_FREQUENCY_TAILORED.txt"))
 nasdaqEventStream_AAPL_AMZN_GOOG = FileInputStream(os.path.join(absolutePath, "test/EventFiles/NASDAQ_AAPL_AMZN_GOOG.txt"))
-nasdaqEventStream = FileInputStream(os.path.join(absolutePath, "test/EventFiles/NASDAQ_LONG.txt"))
+# the default input of the tests is replayed by most of them, hence it is indexed once and read by cursors
+nasdaqEventLog = FileEventLog(os.path.join(absolutePath, "test/EventFiles/NASDAQ_LONG.txt"))
+atexit.register(nasdaqEventLog.close)
+nasdaqEventStream = nasdaqEventLog.create_cursor()
 
 nasdaqEventStreamHalfShort = FileInputStream(os.path.join(absolutePath, "test/EventFiles/NASDAQ_HALF_SHORT.txt"))
 custom = FileInputStream(os.path.join(absolutePath, "test/EventFiles/custom.txt"))
@@ -381,7 +386,7 @@ class runParallelTest:
         unfiltered_matches_list: List[PatternMatch] = field(default_factory=list)
 
         def format(self, data_formatter):
-            events = [Event(e, data_formatter) for e in self.events_list]
+            events = [Event(e, data_formatter, index) for index, e in enumerate(self.events_list)]
             events.sort(key=lambda e: e.timestamp)
             self.filtered_matches_list.sort(key=lambda mat: (mat.first_timestamp, mat.last_timestamp))
             self.unfiltered_matches_list.sort(key=lambda mat: (mat.first_timestamp, mat.last_timestamp))
@@ -10,6 +10,10 @@ from test.StorageTests import *
 import test.EventProbabilityTests
 from test.NestedTests import *
 from test.UnitTests.test_storage import run_storage_tests
+from test.UnitTests.test_streams import run_stream_tests
+from test.UnitTests.test_events import run_event_tests
+from test.UnitTests.test_conditions import run_condition_tests
+from test.UnitTests.test_data_formatters import run_data_formatter_tests, run_timestamp_parsing_benchmark
 from test.UnitTests.RuleTransformationTests import ruleTransformationTests
 from test.ParallelTests import *
 
@@ -28,6 +32,7 @@ googleAmazonLowPatternSearchTest()
 nonsensePatternSearchTest()
 hierarchyPatternSearchTest()
 duplicateEventTypeTest()
+binaryFileDuplicateEventTypeTest()
 
 # tree plan generation algorithms
 arrivalRatesPatternSearchTest()
@@ -91,6 +96,7 @@ oneNotAtTheBeginningTest()
 multipleNotAtTheBeginningTest()
 oneNotAtTheEndTest()
 multipleNotAtTheEndTest()
+multipleNotAtTheEndBatchedTest()
 multipleNotBeginAndEndTest()
 testWithMultipleNotAtBeginningMiddleEnd()
 testWithMultipleNotAtBeginningMiddleEnd2()
@@ -134,6 +140,18 @@ freezePolicy2PatternSearchTest()
 sortedStorageTest()
 run_storage_tests()
 
+# stream tests
+run_stream_tests()
+
+# event tests
+run_event_tests()
+
+# condition tests
+run_condition_tests()
+
+# data formatter tests
+run_data_formatter_tests()
+
 # multi-pattern tests
 leafIsRoot()
 distinctPatterns()
@@ -274,11 +292,21 @@ googleIncreasePatternSearchTest_8()
 amazonSpecificPatternSearchTest_8()
 googleAmazonLowPatternSearchTest_8()
 
+# batched evaluation
+simple_9()
+googleAscendPatternSearchTest_9()
+amazonInstablePatternSearchTest_9()
+msftDrivRacePatternSearchTest_9()
+googleIncreasePatternSearchTest_9()
+amazonSpecificPatternSearchTest_9()
+googleAmazonLowPatternSearchTest_9()
+
 # parallel testing
 simpleGroupByKeyTest()
 SensorsDataHIRZELTest()
 GroupByKeyMultiPatternTest()
 simpleRIPTest()
+boundedStreamRIPTest()
 StocksDataRIPTest()
 SensorsDataRIPTestShort()
 SensorsDataRIPTest()
@@ -311,6 +339,7 @@ localSimulatedBushySearchAndOpposite()
 # benchmarks
 if INCLUDE_BENCHMARKS:
     sortedStorageBenchMarkTest()
+    run_timestamp_parsing_benchmark()
 
 
 # Twitter tests
@@ -1,6 +1,9 @@
 from typing import Dict
 
+from base.EpochTimestampDataFormatter import convert_time_window
 from base.Pattern import Pattern
+from base.TimestampTypes import TimestampTypes
+from misc import DefaultConfig
 from plan.TreePlan import TreePlan
 from tree.PatternMatchStorage import TreeStorageParameters
 from base.PatternMatch import PatternMatch
@@ -13,14 +16,16 @@ class MultiPatternTree:
     Represents a multi-pattern evaluation tree.
     """
     def __init__(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
-                 storage_params: TreeStorageParameters):
+                 storage_params: TreeStorageParameters,
+                 timestamp_type: TimestampTypes = DefaultConfig.DEFAULT_TIMESTAMP_TYPE):
         self.__id_to_output_node_map = {}
         self.__id_to_pattern_map = {}
+        self.__id_to_window_map = {}
         self.__output_nodes = []
-        self.__construct_multi_pattern_tree(pattern_to_tree_plan_map, storage_params)
+        self.__construct_multi_pattern_tree(pattern_to_tree_plan_map, storage_params, timestamp_type)
 
     def __construct_multi_pattern_tree(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
-                                       storage_params: TreeStorageParameters):
+                                       storage_params: TreeStorageParameters, timestamp_type: TimestampTypes):
         """
         Constructs a multi-pattern evaluation tree.
         It is assumed that each pattern appears only once in patterns (which is a legitimate assumption).
@@ -29,9 +34,10 @@ class MultiPatternTree:
         plan_nodes_to_nodes_map = {}  # a cache for already created subtrees
         for i, (pattern, plan) in enumerate(pattern_to_tree_plan_map.items(), 1):
             pattern.id = i
-            new_tree_root = Tree(plan, pattern, storage_params, plan_nodes_to_nodes_map).get_root()
+            new_tree_root = Tree(plan, pattern, storage_params, plan_nodes_to_nodes_map, timestamp_type).get_root()
             self.__id_to_output_node_map[pattern.id] = new_tree_root
             self.__id_to_pattern_map[pattern.id] = pattern
+            self.__id_to_window_map[pattern.id] = convert_time_window(pattern.window, timestamp_type)
             self.__output_nodes.append(new_tree_root)
 
     def get_leaves(self):
@@ -43,12 +49,13 @@ class MultiPatternTree:
             leaves |= set(output_node.get_leaves())
         return leaves
 
-    def __should_attach_match_to_pattern(self, match: PatternMatch, pattern: Pattern):
+    def __should_attach_match_to_pattern(self, match: PatternMatch, pattern_id: int):
         """
         Returns True if the given match satisfies the window/confidence constraints of the given pattern
         and False otherwise.
         """
-        if match.last_timestamp - match.first_timestamp > pattern.window:
+        pattern = self.__id_to_pattern_map[pattern_id]
+        if match.last_timestamp - match.first_timestamp > self.__id_to_window_map[pattern_id]:
             return False
         return pattern.confidence is None or match.probability is None or match.probability >= pattern.confidence
 
@@ -68,7 +75,7 @@ class MultiPatternTree:
                         continue
                     # check if timestamp is correct for this pattern id.
                     # the pattern indices start from 1.
-                    if self.__should_attach_match_to_pattern(match, self.__id_to_pattern_map[pattern_id]):
+                    if self.__should_attach_match_to_pattern(match, pattern_id):
                         match.add_pattern_id(pattern_id)
                 matches.append(match)
         return matches
@@ -1,9 +1,12 @@
 from copy import deepcopy
 from typing import List, Dict
 
+from base.EpochTimestampDataFormatter import convert_time_window
 from base.Pattern import Pattern
 from base.PatternStructure import PatternStructure, CompositeStructure, UnaryStructure, PrimitiveEventStructure, \
     NegationOperator
+from base.TimestampTypes import TimestampTypes
+from misc import DefaultConfig
 from misc.ConsumptionPolicy import ConsumptionPolicy
 from plan.TreePlan import TreePlan, TreePlanNode, TreePlanLeafNode, TreePlanNestedNode, TreePlanUnaryNode, \
     OperatorTypes, TreePlanInternalNode, TreePlanBinaryNode
@@ -21,11 +24,14 @@ class Tree:
     Represents an evaluation tree. Implements the functionality of constructing an actual tree from tree plan
     object returned by a tree builder. Other than that, merely acts as a proxy to the tree root node.
     The plan_nodes_to_nodes_map is used in multi-pattern mode.
+    The time window of the pattern is converted into the representation of the event timestamps of the given type.
     """
     def __init__(self, tree_plan: TreePlan, pattern: Pattern, storage_params: TreeStorageParameters,
-                 plan_nodes_to_nodes_map: Dict[TreePlanNode, Node] = None):
+                 plan_nodes_to_nodes_map: Dict[TreePlanNode, Node] = None,
+                 timestamp_type: TimestampTypes = DefaultConfig.DEFAULT_TIMESTAMP_TYPE):
         self.__plan_nodes_to_nodes_map = plan_nodes_to_nodes_map
-        pattern_parameters = PatternParameters(pattern.window, pattern.confidence)
+        pattern_parameters = PatternParameters(convert_time_window(pattern.window, timestamp_type),
+                                               pattern.confidence)
         # Maps between the event to its order in the original pattern
         self.__event_to_index_mapping = {event: index for index, event in enumerate(pattern.get_primitive_event_names())}
         self.__root = self.__construct_tree(tree_plan.modified_pattern.full_structure, tree_plan.root,
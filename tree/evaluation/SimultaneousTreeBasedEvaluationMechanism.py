@@ -2,6 +2,8 @@ from datetime import timedelta, datetime
 from typing import Dict
 from base.Event import Event
 from base.Pattern import Pattern
+from base.TimestampTypes import TimestampTypes
+from misc import DefaultConfig
 from adaptive.optimizer.Optimizer import Optimizer
 from plan.TreePlan import TreePlan
 from adaptive.statistics.StatisticsCollector import StatisticsCollector
@@ -21,11 +23,21 @@ class SimultaneousTreeBasedEvaluationMechanism(TreeBasedEvaluationMechanism):
                  storage_params: TreeStorageParameters,
                  statistics_collector: StatisticsCollector = None,
                  optimizer: Optimizer = None,
-                 statistics_update_time_window: timedelta = None):
+                 statistics_update_time_window: timedelta = None,
+                 batch_size: int = DefaultConfig.DEFAULT_EVENT_BATCH_SIZE,
+                 attribute_projection: bool = DefaultConfig.DEFAULT_ATTRIBUTE_PROJECTION,
+                 parsing_processes_number: int = DefaultConfig.DEFAULT_PARSING_PROCESSES_NUMBER,
+                 parsing_chunk_size: int = DefaultConfig.DEFAULT_PARSING_CHUNK_SIZE,
+                 timestamp_type: TimestampTypes = DefaultConfig.DEFAULT_TIMESTAMP_TYPE):
         super().__init__(pattern_to_tree_plan_map, storage_params,
                          statistics_collector,
                          optimizer,
-                         statistics_update_time_window)
+                         statistics_update_time_window,
+                         batch_size,
+                         attribute_projection,
+                         parsing_processes_number,
+                         parsing_chunk_size,
+                         timestamp_type)
         self.__new_tree = None
         self.__new_event_types_listeners = None
         self.__is_simultaneous_state = False
@@ -59,7 +71,7 @@ class SimultaneousTreeBasedEvaluationMechanism(TreeBasedEvaluationMechanism):
         if self.__is_simultaneous_state:
             # After this round we ask if we are in a simultaneous state.
             # If the pattern window is over then we want to return to single tree state.
-            if event.max_timestamp - self.__tree_update_time > self._pattern.window:
+            if event.max_timestamp - self.__tree_update_time > self._window:
                 # Passes pending matches from the old tree to the new tree if the root is a NegationNode
                 self.__last_matches_from_old_tree = self._tree.get_last_matches()
 
@@ -1,8 +1,12 @@
 from abc import ABC
 from typing import Dict
 from base.DataFormatter import DataFormatter
+from base.EpochTimestampDataFormatter import EpochTimestampDataFormatter, convert_time_window
 from base.Event import Event
+from base.TimestampTypes import TimestampTypes
+from condition.Condition import merge_referenced_attributes
 from plan.TreePlan import TreePlan
+from stream.AsyncStream import AsyncStream
 from stream.Stream import InputStream, OutputStream
 from misc.Utils import *
 from tree.nodes.LeafNode import LeafNode
@@ -14,37 +18,66 @@ from adaptive.statistics import StatisticsCollector
 from tree.Tree import Tree
 from datetime import timedelta
 from adaptive.optimizer import Optimizer
+from misc import DefaultConfig
+from parallel.ParallelEventParser import ParallelEventParser
 
 
 class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
     """
     An implementation of the tree-based evaluation mechanism.
+    The ready matches are collected from the tree once per batch_size events rather than after every event, thus
+    amortizing the collection overhead at the price of a slightly delayed delivery of the matches.
+    If attribute_projection is set, the events are parsed into payloads only containing the attributes used by the
+    patterns, provided that the data formatter supports it.
+    If parsing_processes_number is positive, the events are parsed by a pool of worker processes in chunks of
+    parsing_chunk_size events (see ParallelEventParser). Asynchronous evaluation always parses the events inline.
+    Unless timestamp_type is DATETIME, the event timestamps are converted into integer epoch timestamps upon parsing
+    and all time windows are converted accordingly upon construction (see EpochTimestampDataFormatter).
     """
     def __init__(self, pattern_to_tree_plan_map: Dict[Pattern, TreePlan],
                  storage_params: TreeStorageParameters,
                  statistics_collector: StatisticsCollector = None,
                  optimizer: Optimizer = None,
-                 statistics_update_time_window: timedelta = None):
+                 statistics_update_time_window: timedelta = None,
+                 batch_size: int = DefaultConfig.DEFAULT_EVENT_BATCH_SIZE,
+                 attribute_projection: bool = DefaultConfig.DEFAULT_ATTRIBUTE_PROJECTION,
+                 parsing_processes_number: int = DefaultConfig.DEFAULT_PARSING_PROCESSES_NUMBER,
+                 parsing_chunk_size: int = DefaultConfig.DEFAULT_PARSING_CHUNK_SIZE,
+                 timestamp_type: TimestampTypes = DefaultConfig.DEFAULT_TIMESTAMP_TYPE):
         self.__is_multi_pattern_mode = len(pattern_to_tree_plan_map) > 1
         if self.__is_multi_pattern_mode:
             # TODO: support statistic collection in the multi-pattern mode
-            self._tree = MultiPatternTree(pattern_to_tree_plan_map, storage_params)
+            self._tree = MultiPatternTree(pattern_to_tree_plan_map, storage_params, timestamp_type)
         else:
             pattern = list(pattern_to_tree_plan_map)[0]
             pattern.condition.set_statistics_collector(statistics_collector)
             self._tree = Tree(list(pattern_to_tree_plan_map.values())[0],
-                              list(pattern_to_tree_plan_map)[0], storage_params)
+                              list(pattern_to_tree_plan_map)[0], storage_params, timestamp_type=timestamp_type)
 
         self.__storage_params = storage_params
         self.__statistics_collector = statistics_collector
         self.__optimizer = optimizer
 
         self._event_types_listeners = {}
-        self.__statistics_update_time_window = statistics_update_time_window
+        self.__statistics_update_time_window = convert_time_window(statistics_update_time_window, timestamp_type)
+        self.__batch_size = batch_size
+        self.__last_statistics_refresh_time = None
+        self.__is_reoptimization_enabled = False
+        self.__actual_batch_size = batch_size
+        self.__unreported_events_count = 0
+        self.__is_prefiltering_enabled = False
+        self.__skipped_events_count = 0
+        self.__next_event_index = 0
+        self.__parsing_processes_number = parsing_processes_number
+        self.__parsing_chunk_size = parsing_chunk_size
+        self._timestamp_type = timestamp_type
+        self.__referenced_attributes = self.__get_referenced_attributes(pattern_to_tree_plan_map) \
+            if attribute_projection else None
 
         # The remainder of the initialization process is only relevant for the freeze map feature. This feature can
         # only be enabled in single-pattern mode.
         self._pattern = list(pattern_to_tree_plan_map)[0] if not self.__is_multi_pattern_mode else None
+        self._window = convert_time_window(self._pattern.window, timestamp_type) if self._pattern is not None else None
         self.__freeze_map = {}
         self.__active_freezers = []
 
@@ -57,27 +90,104 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
         Activates the tree evaluation mechanism on the input event stream and reports all found pattern matches to the
         given output stream.
         """
+        data_formatter = self.__start_evaluation(data_formatter)
+        if self.__parsing_processes_number > 0:
+            parser = ParallelEventParser(data_formatter, set(self._event_types_listeners.keys()),
+                                         self.__parsing_processes_number, self.__parsing_chunk_size)
+            for event in parser.parse(events):
+                self.__handle_event(event, matches)
+            self.__skipped_events_count = parser.get_skipped_events_count()
+        else:
+            for raw_event in events:
+                self.__handle_raw_event(raw_event, matches, data_formatter)
+        self.__finish_evaluation(matches)
+
+    async def eval_async(self, events: AsyncStream, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        An asynchronous version of eval(). While waiting for the next input event, the event loop is free to run other
+        coroutines.
+        """
+        data_formatter = self.__start_evaluation(data_formatter)
+        async for raw_event in events:
+            self.__handle_raw_event(raw_event, matches, data_formatter)
+        self.__finish_evaluation(matches)
+
+    def __start_evaluation(self, data_formatter: DataFormatter):
+        """
+        Initializes the state of the evaluation mechanism before processing the first event and returns the data
+        formatter to be used for parsing the events.
+        """
         self._event_types_listeners = self._register_event_listeners(self._tree)
-        last_statistics_refresh_time = None
+        self.__last_statistics_refresh_time = None
+        self.__is_reoptimization_enabled = not self.__is_multi_pattern_mode and self.__statistics_collector is not None
+        self.__actual_batch_size = self.__get_actual_batch_size(self.__is_reoptimization_enabled)
+        self.__unreported_events_count = 0
+        if self.__referenced_attributes is not None:
+            data_formatter = data_formatter.get_projected_formatter(self.__referenced_attributes)
+        if self._timestamp_type != TimestampTypes.DATETIME:
+            data_formatter = EpochTimestampDataFormatter(data_formatter, self._timestamp_type)
+        self.__is_prefiltering_enabled = data_formatter.can_extract_raw_event_type()
+        self.__skipped_events_count = 0
+        self.__next_event_index = 0
+        return data_formatter
 
-        for raw_event in events:
-            event = Event(raw_event, data_formatter)
-            if event.type not in self._event_types_listeners:
-                continue
-            self.__remove_expired_freezers(event)
+    def __handle_raw_event(self, raw_event, matches: OutputStream, data_formatter: DataFormatter):
+        """
+        Parses a single input event and handles it unless it is irrelevant.
+        """
+        if self.__is_prefiltering_enabled and \
+                data_formatter.get_raw_event_type(raw_event) not in self._event_types_listeners:
+            # the event is irrelevant and is not parsed, but its serial number is still consumed to keep the semantics
+            # of the contiguity constraints
+            self.__next_event_index += 1
+            self.__skipped_events_count += 1
+            return
+        event = Event(raw_event, data_formatter, self.__next_event_index)
+        self.__next_event_index += 1
+        if event.type not in self._event_types_listeners:
+            return
+        self.__handle_event(event, matches)
+
+    def __handle_event(self, event: Event, matches: OutputStream):
+        """
+        Plays a single relevant event on the tree and collects the resulting matches once the current batch is complete.
+        """
+        self.__remove_expired_freezers(event)
 
-            if not self.__is_multi_pattern_mode and self.__statistics_collector is not None:
-                # TODO: support multi-pattern mode
-                last_statistics_refresh_time = self.__perform_reoptimization(last_statistics_refresh_time, event)
+        if self.__is_reoptimization_enabled:
+            # TODO: support multi-pattern mode
+            self.__last_statistics_refresh_time = self.__perform_reoptimization(self.__last_statistics_refresh_time,
+                                                                                event)
 
-            self._play_new_event_on_tree(event, matches)
+        self._play_new_event_on_tree(event, matches)
+        self.__unreported_events_count += 1
+        if self.__unreported_events_count >= self.__actual_batch_size:
             self._get_matches(matches)
+            self.__unreported_events_count = 0
+
+    def __finish_evaluation(self, matches: OutputStream):
+        """
+        Reports the remaining matches after the input stream was exhausted.
+        """
+        # collect the matches of the last (possibly partial) batch
+        self._get_matches(matches)
 
         # Now that we finished the input stream, if there were some pending matches somewhere in the tree, we will
         # collect them now
         self._get_last_pending_matches(matches)
         matches.close()
 
+    def __get_actual_batch_size(self, is_reoptimization_enabled: bool):
+        """
+        Returns the number of events to be processed between subsequent collections of the ready matches.
+        Batching is only possible when delaying the collection cannot affect the detected matches. This is not the
+        case if the tree might be replaced during evaluation, or if the freeze consumption policy is enabled, as the
+        freezers are only released upon match collection.
+        """
+        if is_reoptimization_enabled or len(self.__freeze_map) > 0:
+            return 1
+        return self.__batch_size
+
     def __perform_reoptimization(self, last_statistics_refresh_time: timedelta, last_event: Event):
         """
         If needed, reoptimizes the evaluation mechanism to reflect the current statistical properties of the
@@ -90,7 +200,7 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
         new_statistics = self.__statistics_collector.get_statistics()
         if self.__optimizer.should_optimize(new_statistics, self._pattern):
             new_tree_plan = self.__optimizer.build_new_plan(new_statistics, self._pattern)
-            new_tree = Tree(new_tree_plan, self._pattern, self.__storage_params)
+            new_tree = Tree(new_tree_plan, self._pattern, self.__storage_params, timestamp_type=self._timestamp_type)
             self._tree_update(new_tree, last_event.max_timestamp)
         # this is the new last statistic refresh time
         return last_event.max_timestamp
@@ -201,11 +311,27 @@ class TreeBasedEvaluationMechanism(EvaluationMechanism, ABC):
             # freeze option disabled
             return False
         self.__active_freezers = [freezer for freezer in self.__active_freezers
-                                  if event.max_timestamp - freezer.min_timestamp <= self._pattern.window]
+                                  if event.max_timestamp - freezer.min_timestamp <= self._window]
 
     def get_structure_summary(self):
         return self._tree.get_structure_summary()
 
+    @staticmethod
+    def __get_referenced_attributes(pattern_to_tree_plan_map: Dict[Pattern, TreePlan]):
+        """
+        Returns the payload attributes used by the given patterns for each event type.
+        """
+        referenced_attributes = {}
+        for pattern in pattern_to_tree_plan_map:
+            merge_referenced_attributes(referenced_attributes, pattern.get_referenced_attributes())
+        return referenced_attributes
+
+    def get_skipped_events_count(self):
+        """
+        Returns the number of events discarded as irrelevant before being parsed.
+        """
+        return self.__skipped_events_count
+
     def __repr__(self):
         return self.get_structure_summary()
 
@@ -1,4 +1,5 @@
 from abc import ABC
+from collections.abc import Hashable
 from datetime import timedelta
 from typing import List, Set
 
@@ -6,6 +7,7 @@ from base.Event import Event
 from misc.Utils import calculate_joint_probability
 from condition.Condition import Condition, Variable, EquationSides
 from condition.BaseRelationCondition import BaseRelationCondition
+from condition.ConditionCompiler import compile_join_filter
 from base.PatternMatch import PatternMatch
 from tree.nodes.InternalNode import InternalNode
 from tree.nodes.Node import Node, PrimitiveEventDefinition, PatternParameters
@@ -21,6 +23,11 @@ class BinaryNode(InternalNode, ABC):
         super().__init__(pattern_params, parents, pattern_ids, event_defs)
         self._left_subtree = left
         self._right_subtree = right
+        # the pairs of positions in the event list of a new partial match that may hold the same event
+        self.__colliding_event_positions = []
+        # the filters selecting the partial matches of the opposite subtree that may be joined with a new partial match
+        # arriving from the left and the right subtree, respectively
+        self.__left_join_filter = self.__right_join_filter = compile_join_filter(self._condition, [], [])
 
     def create_parent_to_info_dict(self):
         if self._left_subtree is not None:
@@ -71,8 +78,50 @@ class BinaryNode(InternalNode, ABC):
         self._left_subtree = left
         self._right_subtree = right
         # only the positive children definitions should be applied on this node
-        self._set_event_definitions(self._left_subtree.get_positive_event_definitions(),
-                                    self._right_subtree.get_positive_event_definitions())
+        left_event_defs = self._left_subtree.get_positive_event_definitions()
+        right_event_defs = self._right_subtree.get_positive_event_definitions()
+        self._set_event_definitions(left_event_defs, right_event_defs)
+        self.__colliding_event_positions = self.__get_colliding_event_positions(left_event_defs, right_event_defs)
+        self._compile_condition()
+
+    def __get_colliding_event_positions(self, left_event_defs: List[PrimitiveEventDefinition],
+                                        right_event_defs: List[PrimitiveEventDefinition]):
+        """
+        Returns the pairs of positions in the event list of a new partial match that may contain the same event.
+        The partial matches of each subtree contain no duplicates, hence an event can only appear twice if it was
+        accepted by two leaves of the same event type located in the opposite subtrees. As the serial number of an
+        aggregated event is derived from its primitive events, aggregated events are compared to all events of the
+        opposite subtree.
+        """
+        positions = {event_def.index: i for i, event_def in enumerate(self._event_defs)}
+        return [(positions[left_event_def.index], positions[right_event_def.index])
+                for left_event_def in left_event_defs for right_event_def in right_event_defs
+                if left_event_def.type == right_event_def.type or
+                left_event_def.is_aggregated or right_event_def.is_aggregated]
+
+    def _compile_condition(self):
+        """
+        In addition to the default behavior, compiles the join filters of this node.
+        """
+        super()._compile_condition()
+        if self._left_subtree is None or self._right_subtree is None:
+            return
+        left_event_defs = self._left_subtree.get_positive_event_definitions()
+        right_event_defs = self._right_subtree.get_positive_event_definitions()
+        left_event_names = [event_def.name for event_def in left_event_defs]
+        right_event_names = [event_def.name for event_def in right_event_defs]
+        aggregated_event_names = {event_def.name for event_def in left_event_defs + right_event_defs
+                                  if event_def.is_aggregated}
+        self.__left_join_filter = compile_join_filter(self._condition, left_event_names, right_event_names,
+                                                      aggregated_event_names)
+        self.__right_join_filter = compile_join_filter(self._condition, right_event_names, left_event_names,
+                                                       aggregated_event_names)
+
+    def _contains_duplicate_events(self, events_for_new_match: List[Event]):
+        for first_position, second_position in self.__colliding_event_positions:
+            if events_for_new_match[first_position] == events_for_new_match[second_position]:
+                return True
+        return False
 
     def _propagate_pattern_parameters(self, pattern_params: PatternParameters):
         self._left_subtree.set_and_propagate_pattern_parameters(pattern_params)
@@ -103,8 +152,10 @@ class BinaryNode(InternalNode, ABC):
         """
         if partial_match_source == self._left_subtree:
             other_subtree = self._right_subtree
+            join_filter = self.__left_join_filter
         elif partial_match_source == self._right_subtree:
             other_subtree = self._left_subtree
+            join_filter = self.__right_join_filter
         else:
             raise Exception()  # should never happen
 
@@ -113,6 +164,8 @@ class BinaryNode(InternalNode, ABC):
         first_event_defs = partial_match_source.get_event_definitions_by_parent(self)
         other_subtree.clean_expired_partial_matches(new_partial_match.last_timestamp)
         partial_matches_to_compare = other_subtree.get_partial_matches(new_pm_key(new_partial_match))
+        # the candidates violating the time window or the basic relation conditions are discarded at once
+        partial_matches_to_compare = join_filter(new_partial_match, partial_matches_to_compare, self._sliding_window)
         second_event_defs = other_subtree.get_event_definitions_by_parent(self)
 
         self.clean_expired_partial_matches(new_partial_match.last_timestamp)
@@ -219,6 +272,20 @@ class BinaryNode(InternalNode, ABC):
                 raise Exception("Internal error")
         return left_term, left_rel_op, left_equation_size, right_term, right_rel_op, right_equation_size
 
+    def __create_sorting_key(self, term: Variable, event_defs: List[PrimitiveEventDefinition]):
+        """
+        Creates a sorting key fetching the value of the given variable from a partial match whose events are ordered
+        according to the given event definitions. Whenever possible, the memoized attribute value of the event is used.
+        """
+        positions = [i for i, event_def in enumerate(event_defs) if event_def.name == term.name]
+        if len(positions) == 1 and not event_defs[positions[0]].is_aggregated and \
+                type(term).eval is Variable.eval and isinstance(term.getattr_func, Hashable):
+            position, getattr_func = positions[0], term.getattr_func
+            return lambda pm: pm.events[position].attribute_values[getattr_func]
+        return lambda pm: term.eval(
+            {event_defs[i].name: self._get_event_content(pm.events[i]) for i in range(len(pm.events))}
+        )
+
     def _get_condition_based_sorting_keys(self, attributes_priorities: dict):
         """
         Calculates the sorting keys according to the conditions in the pattern and the user-provided priorities.
@@ -245,12 +312,8 @@ class BinaryNode(InternalNode, ABC):
 
         # convert terms into sorting key fetching callbacks
         if left_term is not None:
-            left_sorting_key = lambda pm: left_term.eval(
-                {left_event_defs[i].name: self._get_event_content(pm.events[i]) for i in range(len(pm.events))}
-            )
+            left_sorting_key = self.__create_sorting_key(left_term, left_event_defs)
         if right_term is not None:
-            right_sorting_key = lambda pm: right_term.eval(
-                {right_event_defs[i].name: self._get_event_content(pm.events[i]) for i in range(len(pm.events))}
-            )
+            right_sorting_key = self.__create_sorting_key(right_term, right_event_defs)
 
         return left_sorting_key, left_rel_op, left_equation_size, right_sorting_key, right_rel_op, right_equation_size
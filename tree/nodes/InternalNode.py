@@ -25,14 +25,16 @@ class InternalNode(Node, ABC):
         """
         if not super()._validate_new_match(events_for_new_match):
             return False
-        if len(events_for_new_match) != len(set(events_for_new_match)):
+        if self._contains_duplicate_events(events_for_new_match):
             # the list contains duplicate events which is not allowed
             return False
-        binding = {
-            self._event_defs[i].name: InternalNode._get_event_content(events_for_new_match[i])
-            for i in range(len(self._event_defs))
-        }
-        return self._condition.eval(binding)
+        return self._compiled_condition(events_for_new_match)
+
+    def _contains_duplicate_events(self, events_for_new_match: List[Event]):
+        """
+        Returns True if the same event appears more than once in the given list of events and False otherwise.
+        """
+        return len(events_for_new_match) != len(set(events_for_new_match))
 
     def create_parent_to_info_dict(self):
         """
@@ -6,7 +6,7 @@ from base.Event import Event, AggregatedEvent
 from condition.CompositeCondition import CompositeCondition
 from base.PatternMatch import PatternMatch
 from misc.Utils import powerset_generator
-from tree.nodes.Node import Node, PatternParameters
+from tree.nodes.Node import Node, PatternParameters, PrimitiveEventDefinition
 from tree.nodes.UnaryNode import UnaryNode
 
 
@@ -79,6 +79,14 @@ class KleeneClosureNode(UnaryNode):
         result_powerset = [item for item in result_powerset if self.__min_size <= len(item)]
         return result_powerset
 
+    def set_subtree(self, child: Node):
+        """
+        In addition to the default behavior, marks the events produced by this node as aggregated events.
+        """
+        super().set_subtree(child)
+        self._event_defs = [PrimitiveEventDefinition(event_def.type, event_def.name, event_def.index, True)
+                            for event_def in self._event_defs]
+
     def apply_condition(self, condition: CompositeCondition):
         """
         The default implementation is overridden to extract KC conditions from the given composite condition.
@@ -88,6 +96,12 @@ class KleeneClosureNode(UnaryNode):
         self._condition = condition.get_condition_of(names, get_kleene_closure_conditions=True,
                                                      consume_returned_conditions=True)
 
+    def _compile_condition(self):
+        """
+        The Kleene closure conditions operate on the list of the primitive event payloads and are evaluated directly.
+        """
+        pass
+
     def get_structure_summary(self):
         return "KC", self._child.get_structure_summary()
 
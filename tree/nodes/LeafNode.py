@@ -68,6 +68,7 @@ class LeafNode(Node):
         Inserts the given event to this leaf.
         """
         self.clean_expired_partial_matches(event.timestamp)
+        event.init_attribute_values()
         self._validate_and_propagate_partial_match([event], event.probability)
 
     def _validate_new_match(self, events_for_new_match: List[Event]):
@@ -76,8 +77,7 @@ class LeafNode(Node):
         """
         if not super()._validate_new_match(events_for_new_match):
             return False
-        binding = {self.__event_name: events_for_new_match[0].payload}
-        return self._condition.eval(binding)
+        return self._compiled_condition(events_for_new_match)
 
     def _propagate_condition(self, condition: Condition):
         pass
@@ -1,12 +1,13 @@
 from abc import ABC
 from datetime import timedelta, datetime
-from queue import Queue
+from collections import deque
 from typing import List, Set, Optional
 from dataclasses import dataclass
 
 from base.Event import Event
 from condition.Condition import RelopTypes, EquationSides
 from condition.CompositeCondition import CompositeCondition, AndCondition
+from condition.ConditionCompiler import compile_condition
 from base.PatternMatch import PatternMatch
 from tree.PatternMatchStorage import TreeStorageParameters
 
@@ -15,10 +16,12 @@ class PrimitiveEventDefinition:
     """
     An internal class for capturing the information regarding a single primitive event appearing in a pattern.
     """
-    def __init__(self, event_type: str, event_name: str, event_index: int):
+    def __init__(self, event_type: str, event_name: str, event_index: int, is_aggregated: bool = False):
         self.type = event_type
         self.name = event_name
         self.index = event_index
+        # indicates that the event is an aggregated event produced by a Kleene closure operator
+        self.is_aggregated = is_aggregated
 
 
 @dataclass(frozen=True)
@@ -62,10 +65,13 @@ class Node(ABC):
         self._confidence = pattern_params.confidence
         self._partial_matches = None
         self._condition = AndCondition()
+        # the condition compiled for the contents of the events ordered according to the event definitions
+        self._compiled_condition = compile_condition(self._condition, [])
 
         # Full pattern matches that were not yet reported. Only relevant for an output node, that is, for a node
         # corresponding to a full pattern definition.
-        self._unreported_matches = Queue()
+        # The tree is only ever accessed by a single thread, hence plain deques are used instead of synchronized queues.
+        self._unreported_matches = deque()
         self._is_output_node = False
 
         # set of event types that will only appear in a single full match
@@ -94,14 +100,13 @@ class Node(ABC):
         Removes and returns an unreported match buffered at this node.
         Used in an output node to collect full pattern matches.
         """
-        ret = self._unreported_matches.get()
-        return ret
+        return self._unreported_matches.popleft()
 
     def has_unreported_matches(self):
         """
         Returns True if this node contains any matches we did not report yet and False otherwise.
         """
-        return self._unreported_matches.qsize() > 0
+        return len(self._unreported_matches) > 0
 
     def clean_expired_partial_matches(self, last_timestamp: datetime):
         """
@@ -125,10 +130,10 @@ class Node(ABC):
         """
         self._partial_matches.add(pm)
         for parent in self._parents:
-            self._parent_to_unhandled_queue_dict[parent].put(pm)
+            self._parent_to_unhandled_queue_dict[parent].append(pm)
             parent.handle_new_partial_match(self)
         if self.is_output_node():
-            self._unreported_matches.put(pm)
+            self._unreported_matches.append(pm)
 
     def __can_add_partial_match(self, pm: PatternMatch) -> bool:
         """
@@ -197,7 +202,7 @@ class Node(ABC):
         """
         Returns the last partial match buffered at this node and not yet transferred to parent.
         """
-        return self._parent_to_unhandled_queue_dict[parent].get(block=False)
+        return self._parent_to_unhandled_queue_dict[parent].popleft()
 
     def set_parents(self, parents, on_init: bool = False):
         """
@@ -229,7 +234,7 @@ class Node(ABC):
         if parent in self._parents:
             return
         self._parents.append(parent)
-        self._parent_to_unhandled_queue_dict[parent] = Queue()
+        self._parent_to_unhandled_queue_dict[parent] = deque()
         if not on_init:
             self._parent_to_info_dict[parent] = self.get_positive_event_definitions()
 
@@ -317,6 +322,19 @@ class Node(ABC):
         names = {event_def.name for event_def in self.get_event_definitions()}
         self._condition = condition.get_condition_of(names, get_kleene_closure_conditions=False,
                                                      consume_returned_conditions=True)
+        self._compile_condition()
+
+    def _compile_condition(self):
+        """
+        Compiles the condition of this node into a function receiving the events ordered according to the event
+        definitions of this node. Must be invoked whenever the condition or the event definitions change, or the
+        sub-conditions are reordered by an adaptive condition.
+        """
+        event_defs = self.get_event_definitions() or []
+        self._compiled_condition = compile_condition(self._condition, [event_def.name for event_def in event_defs],
+                                                     {event_def.name for event_def in event_defs
+                                                      if event_def.is_aggregated},
+                                                     self._compile_condition)
 
     def get_first_unbounded_negative_node(self):
         """
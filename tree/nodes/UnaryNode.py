@@ -32,6 +32,7 @@ class UnaryNode(InternalNode, ABC):
         self._child = child
         # only the positive child definitions should be applied on this node
         self._event_defs = child.get_positive_event_definitions()
+        self._compile_condition()
 
     def _propagate_pattern_parameters(self, pattern_params: PatternParameters):
         self._child.set_and_propagate_pattern_parameters(pattern_params)